@@ -0,0 +1,10 @@
+import { NextRequest, NextResponse } from 'next/server'
+
+// Short links printed by the QR generators with --payload short
+// (scripts/qr_payload.py): /T/QR-101-T9U2V5W8X1Y4 -> /?token=qr_101_t9u2v5w8x1y4
+// The link is upper-case so the whole code fits QR alphanumeric mode.
+export async function GET(request: NextRequest, { params }: { params: Promise<{ code: string }> }) {
+  const { code } = await params
+  const token = code.toLowerCase().replace(/-/g, '_')
+  return NextResponse.redirect(new URL(`/?token=${encodeURIComponent(token)}`, request.url))
+}
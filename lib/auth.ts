@@ -1,4 +1,5 @@
-import { TokenData, RestaurantHours, SessionData } from "@/types/auth"
+import { TokenData, RestaurantHours, SessionData, LocationType } from "@/types/auth"
+import { isOpenAt, getOpeningWindows, formatOpeningHours, minutesSinceMidnight, REGULAR_MENU } from "@/lib/opening-hours"
 import tokensData from "@/data/tokens.json"
 
 // Convert the JSON data to a more efficient lookup structure
@@ -176,83 +177,43 @@ export function refreshSession(): boolean {
 
 /**
  * Checks if the restaurant is currently open
- * Restaurant hours: 12:00 PM - 12:00 AM (24:00) daily
- * Breakfast hours: 07:00 AM - 12:00 PM daily
+ * Hours come from data/opening-hours.json (see scripts/compile-opening-hours.py)
  */
-export function getRestaurantHours(): RestaurantHours {
-  const now = new Date()
-  const currentHour = now.getHours()
-  const currentMinute = now.getMinutes()
-  
-  // Convert current time to minutes since midnight
-  const currentTimeInMinutes = currentHour * 60 + currentMinute
-  
-  // Restaurant hours: 12:00 PM (720 minutes) to 12:00 AM (1440 minutes = 0 next day)
-  const openTimeInMinutes = 12 * 60 // 12:00 PM = 720 minutes
-  const closeTimeInMinutes = 24 * 60 // 12:00 AM = 1440 minutes (next day)
-  
-  // Breakfast hours: 07:00 AM (420 minutes) to 12:00 PM (720 minutes)
-  const breakfastStartInMinutes = 7 * 60 // 07:00 AM = 420 minutes
-  const breakfastEndInMinutes = 12 * 60 // 12:00 PM = 720 minutes
-  
-  // Check if current time is within operating hours (either breakfast or regular)
-  const isRegularHours = currentTimeInMinutes >= openTimeInMinutes
-  const isBreakfastHours = currentTimeInMinutes >= breakfastStartInMinutes && currentTimeInMinutes < breakfastEndInMinutes
-  const isOpen = isRegularHours || isBreakfastHours
-  
+export function getRestaurantHours(locationType?: LocationType): RestaurantHours {
+  const windows = getOpeningWindows(null, locationType)
+
   return {
-    isOpen,
-    openTime: "07:00", // Updated to show earliest opening time
-    closeTime: "00:00"
+    isOpen: isOpenAt(null, new Date(), locationType),
+    openTime: windows.length > 0 ? windows[0][0] : "00:00",
+    closeTime: windows.length > 0 ? windows[windows.length - 1][1] : "00:00"
   }
 }
 
 /**
  * Checks if a specific category is available at the current time
  */
-export function isCategoryAvailable(category: string): boolean {
-  const now = new Date()
-  const currentHour = now.getHours()
-  const currentMinute = now.getMinutes()
-  const currentTimeInMinutes = currentHour * 60 + currentMinute
-  
-  // Breakfast category: 07:00 - 00:00 (all day after 7 AM)
-  if (category === "breakfast") {
-    const breakfastStart = 7 * 60 // 07:00 AM
-    return currentTimeInMinutes >= breakfastStart
-  }
-  
-  // All other categories: 12:00 - 00:00 (next day)
-  const regularStart = 12 * 60 // 12:00 PM
-  return currentTimeInMinutes >= regularStart
+export function isCategoryAvailable(category: string, locationType?: LocationType): boolean {
+  return isOpenAt(category, new Date(), locationType)
 }
 
 /**
  * Gets detailed restaurant status with category-specific information
  */
-export function getDetailedRestaurantStatus() {
+export function getDetailedRestaurantStatus(locationType?: LocationType) {
   const now = new Date()
-  const currentHour = now.getHours()
-  const currentMinute = now.getMinutes()
-  const currentTimeInMinutes = currentHour * 60 + currentMinute
-  
-  const breakfastStart = 7 * 60 // 07:00 AM
-  const regularStart = 12 * 60 // 12:00 PM
-  const closeTime = 24 * 60 // 00:00 (next day)
-  
-  const isBreakfastTime = currentTimeInMinutes >= breakfastStart
-  const isRegularTime = currentTimeInMinutes >= regularStart
-  const isClosed = currentTimeInMinutes >= 0 && currentTimeInMinutes < breakfastStart
-  
+  const isBreakfastTime = isOpenAt("breakfast", now, locationType)
+  const isRegularTime = isOpenAt(REGULAR_MENU, now, locationType)
+  const isClosed = !isOpenAt(null, now, locationType)
+
   return {
     isBreakfastTime,
     isRegularTime,
     isClosed,
     isBreakfastAvailable: isBreakfastTime,
     isRegularMenuAvailable: isRegularTime,
-    currentTimeInMinutes,
-    breakfastHours: "07:00 - 00:00",
-    regularHours: "12:00 - 00:00"
+    currentTimeInMinutes: minutesSinceMidnight(now),
+    breakfastHours: formatOpeningHours("breakfast", locationType),
+    regularHours: formatOpeningHours(REGULAR_MENU, locationType)
   }
 }
 
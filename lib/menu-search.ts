@@ -0,0 +1,73 @@
+/**
+ * Client-side lookup over public/menu-data/search-index.json,
+ * built by scripts/build-menu-search-index.py
+ */
+
+type TrieNode = [number, number, Record<string, TrieNode>]
+
+export type MenuSearchIndex = {
+  version: number
+  items: [string, string][]
+  locales: Record<string, { postings: number[][]; trie: TrieNode }>
+}
+
+const TURKISH_FOLD: Record<string, string> = { ç: "c", ğ: "g", ı: "i", ö: "o", ş: "s", ü: "u" }
+
+/**
+ * Case and diacritic folding matching fold_text() in the index builder
+ */
+export function foldSearchText(text: string): string {
+  return text
+    .replace(/İ/g, "i")
+    .replace(/I/g, "ı")
+    .toLowerCase()
+    .replace(/[çğıöşü]/g, (char) => TURKISH_FOLD[char])
+    .normalize("NFKD")
+    .replace(/[\u0300-\u036f]/g, "")
+}
+
+function findPrefixNode(root: TrieNode, word: string): TrieNode | null {
+  let node = root
+  let rest = word
+  while (rest) {
+    let next: TrieNode | null = null
+    for (const [label, child] of Object.entries(node[2])) {
+      if (rest.startsWith(label)) {
+        next = child
+        rest = rest.slice(label.length)
+        break
+      }
+      if (label.startsWith(rest)) {
+        next = child
+        rest = ""
+        break
+      }
+    }
+    if (!next) return null
+    node = next
+  }
+  return node
+}
+
+/**
+ * Returns the ids of menu items matching every word of the query as a prefix
+ */
+export function searchMenu(index: MenuSearchIndex, locale: string, query: string): string[] {
+  const localeIndex = index.locales[locale] ?? index.locales.en
+  const words = foldSearchText(query).match(/[a-z0-9]+/g)
+  if (!localeIndex || !words) return []
+
+  let result: Set<number> | null = null
+  for (const word of words) {
+    const node = findPrefixNode(localeIndex.trie, word)
+    if (!node) return []
+
+    const matches = new Set<number>()
+    for (let term = node[0]; term < node[1]; term++) {
+      for (const position of localeIndex.postings[term]) matches.add(position)
+    }
+    result = result ? new Set([...result].filter((position) => matches.has(position))) : matches
+  }
+
+  return [...(result ?? [])].sort((a, b) => a - b).map((position) => index.items[position][0])
+}
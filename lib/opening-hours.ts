@@ -0,0 +1,113 @@
+import { LocationType } from "@/types/auth"
+import compiledHours from "@/data/opening-hours.compiled.json"
+
+// Constant-time lookups over data/opening-hours.compiled.json, built from
+// data/opening-hours.json by scripts/compile-opening-hours.py
+
+interface ScheduleIndices {
+  default: number
+  any: number
+  categories: Record<string, number>
+}
+
+interface TypeSchedules extends ScheduleIndices {
+  hours: {
+    default: string[][]
+    any: string[][]
+    categories: Record<string, string[][]>
+  }
+}
+
+interface CompiledHours {
+  version: number
+  weekly: string[]
+  days: string[]
+  types: Record<string, TypeSchedules>
+  dates: Record<string, Record<string, ScheduleIndices>>
+}
+
+// Category key for the regular menu: categories without their own hours
+export const REGULAR_MENU = "*"
+
+const MINUTES_PER_DAY = 24 * 60
+const hours = compiledHours as CompiledHours
+
+function decodeBitmap(encoded: string): Uint8Array {
+  const binary = atob(encoded)
+  const bytes = new Uint8Array(binary.length)
+  for (let i = 0; i < binary.length; i++) {
+    bytes[i] = binary.charCodeAt(i)
+  }
+  return bytes
+}
+
+// Decoded once; bit i is minute i, most significant bit first
+const weeklyBitmaps = hours.weekly.map(decodeBitmap)
+const dayBitmaps = hours.days.map(decodeBitmap)
+
+function testBit(bitmap: Uint8Array, index: number): boolean {
+  return (bitmap[index >> 3] & (0x80 >> (index & 7))) !== 0
+}
+
+function scheduleIndex(schedules: ScheduleIndices, category: string | null): number {
+  if (category === null) {
+    return schedules.any
+  }
+  return schedules.categories[category] ?? schedules.default
+}
+
+function dateKey(date: Date): string {
+  const month = String(date.getMonth() + 1).padStart(2, "0")
+  const day = String(date.getDate()).padStart(2, "0")
+  return `${date.getFullYear()}-${month}-${day}`
+}
+
+function typeSchedules(locationType?: LocationType): TypeSchedules {
+  return (locationType && hours.types[locationType]) || hours.types["*"]
+}
+
+/**
+ * Minutes since local midnight
+ */
+export function minutesSinceMidnight(date: Date = new Date()): number {
+  return date.getHours() * 60 + date.getMinutes()
+}
+
+/**
+ * Checks whether a category (or, with null, any category) is open at the given time
+ */
+export function isOpenAt(category: string | null, date: Date = new Date(), locationType?: LocationType): boolean {
+  const minute = minutesSinceMidnight(date)
+
+  // Dated exceptions and holidays replace the weekly schedule for the whole day
+  const exception = hours.dates[dateKey(date)]
+  if (exception) {
+    const schedules = (locationType && exception[locationType]) || exception["*"]
+    return testBit(dayBitmaps[scheduleIndex(schedules, category)], minute)
+  }
+
+  const schedules = typeSchedules(locationType)
+  return testBit(weeklyBitmaps[scheduleIndex(schedules, category)], date.getDay() * MINUTES_PER_DAY + minute)
+}
+
+/**
+ * Regular opening windows for a category (or, with null, the restaurant as a whole)
+ */
+export function getOpeningWindows(category: string | null, locationType?: LocationType): string[][] {
+  const { hours: windows } = typeSchedules(locationType)
+  if (category === null) {
+    return windows.any
+  }
+  return windows.categories[category] ?? windows.default
+}
+
+/**
+ * Opening windows as shown to guests, e.g. "07:00 - 00:00"
+ */
+export function formatOpeningHours(category: string | null, locationType?: LocationType): string {
+  const windows = getOpeningWindows(category, locationType)
+  if (windows.length === 0) {
+    return "Closed"
+  }
+  return windows.map(([start, end]) => `${start} - ${end}`).join(", ")
+}
@@ -1,5 +1,6 @@
 require('dotenv').config();
 const express = require('express');
+const crypto = require('crypto');
 const fs = require('fs');
 const path = require('path');
 const { ThermalPrinter, PrinterTypes, CharacterSet } = require('node-thermal-printer');
@@ -9,8 +10,29 @@ const cors = require('cors');
 // Import shared translation system
 const { getTranslations, t: translateKey } = require('../lib/translations');
 
-// Load translations from the existing files
-const translations = getTranslations();
+// Receipt bundles from scripts/compile-translation-bundles.py: only the keys
+// this service uses, plus Turkish already latinized for the printer
+const TRANSLATION_BUNDLE_DIR = process.env.TRANSLATION_BUNDLE_DIR || path.join(__dirname, '..', 'public', 'translations');
+const RECEIPT_LOCALES = ['en', 'tr', 'el', 'bg', 'tr-latin'];
+
+const loadReceiptBundles = () => {
+  try {
+    const bundles = {};
+    RECEIPT_LOCALES.forEach(locale => {
+      const bundlePath = path.join(TRANSLATION_BUNDLE_DIR, `receipt.${locale}.json`);
+      bundles[locale] = JSON.parse(fs.readFileSync(bundlePath, 'utf-8'));
+    });
+    console.log(`Receipt translation bundles loaded from ${TRANSLATION_BUNDLE_DIR}`);
+    return bundles;
+  } catch (error) {
+    console.log('Receipt translation bundles not built, parsing the full translations instead');
+    return null;
+  }
+};
+
+// Load translations from the bundles, or from the existing files
+const receiptBundles = loadReceiptBundles();
+const translations = receiptBundles || getTranslations();
 
 // Translation function
 const t = (key, language) => {
@@ -21,6 +43,52 @@ const app = express();
 const port = 3001;
 const PRINTER_PORT = 9100;
 
+// Bar, kitchen and reception printers as host or host:port. Override with
+// PRINTER_HOSTS (comma-separated) to print to scripts/fake-escpos-printer.py
+const PRINTER_HOSTS = process.env.PRINTER_HOSTS
+  ? process.env.PRINTER_HOSTS.split(',').map(host => host.trim()).filter(Boolean)
+  : [
+    '192.168.1.50', // Bar
+    '192.168.1.51', // Kitchen
+    '192.168.1.52'  // Reception
+  ];
+// host, host:port, [ipv6] or [ipv6]:port -> { host, ip, port }; throws on anything else
+const parsePrinterHost = (host) => {
+  let ip = host;
+  let hostPort = null;
+  const bracketed = /^\[([^\]]*)\](?::(.*))?$/.exec(host);
+  if (bracketed) {
+    [, ip, hostPort = null] = bracketed;
+  } else if (host.startsWith('[')) {
+    ip = '';
+  } else if (host.includes(':')) {
+    const lastColon = host.lastIndexOf(':');
+    ip = host.slice(0, lastColon);
+    hostPort = host.slice(lastColon + 1);
+    if (ip.includes(':')) {
+      throw new Error(`"${host}": put IPv6 addresses in brackets, e.g. [fe80::1]:9100`);
+    }
+  }
+  const printerPort = hostPort === null ? PRINTER_PORT : Number(hostPort);
+  if (!ip || (hostPort !== null && !/^\d+$/.test(hostPort)) || printerPort < 1 || printerPort > 65535) {
+    throw new Error(`"${host}": expected host, host:port or [ipv6]:port with a port from 1 to 65535`);
+  }
+  return { host, ip, port: printerPort };
+};
+
+let PRINTERS;
+try {
+  PRINTERS = PRINTER_HOSTS.map(parsePrinterHost);
+} catch (error) {
+  console.error(`Invalid PRINTER_HOSTS entry ${error.message}`);
+  process.exit(1);
+}
+
+const PRINTER_DELAY_MS = parseInt(process.env.PRINTER_DELAY_MS || '3000', 10);
+// The PRINTER_HOSTS entry that prints the guest's receipt (reception by default)
+const GUEST_RECEIPT_PRINTER = process.env.GUEST_RECEIPT_PRINTER || PRINTER_HOSTS[PRINTER_HOSTS.length - 1];
+const SEND_ORDER_EMAILS = process.env.SEND_ORDER_EMAILS !== 'false';
+
 // THIS SHOULD BE IN AN ENVIRONMENT VARIABLE IN PRODUCTION!
 const EXPECTED_AUTH_TOKEN = "LA_STRADA_PRINT_SUPER_SECRET_TOKEN_123!";
 
@@ -42,23 +110,102 @@ const latinizeText = (text) => {
     .replace(/İ/g, 'I'); // Note: Turkish 'İ' (dotted capital I) becomes Latin 'I'
 };
 
-// Load Turkish translations
+// Load Turkish translations (only needed when the bundles are not built)
 let translationsTR = {};
-try {
-  const trPath = path.join(__dirname, '..', 'locales', 'tr.json');
-  const trFileContent = fs.readFileSync(trPath, 'utf-8');
-  translationsTR = JSON.parse(trFileContent);
-  console.log('Turkish translations loaded successfully.');
-} catch (error) {
-  console.error('Error loading Turkish translations:', error);
-  // Service can still run, but printing will use nameKeys directly
+if (!receiptBundles) {
+  try {
+    const trPath = path.join(__dirname, '..', 'locales', 'tr.json');
+    const trFileContent = fs.readFileSync(trPath, 'utf-8');
+    translationsTR = JSON.parse(trFileContent);
+    console.log('Turkish translations loaded successfully.');
+  } catch (error) {
+    console.error('Error loading Turkish translations:', error);
+    // Service can still run, but printing will use nameKeys directly
+  }
 }
 
 const getTurkishTranslation = (nameKey) => {
+  const latinText = receiptBundles && receiptBundles['tr-latin'][nameKey];
+  if (latinText) {
+    return latinText; // Latinized at build time
+  }
   const translatedText = translationsTR[nameKey] || nameKey.split('.').pop().replace(/-/g, ' '); // Fallback
   return latinizeText(translatedText);
 };
 
+// Reorder QR codes pre-rendered as ESC/POS raster commands by
+// scripts/generate-all-qr-codes.py (<category>/qr-<id>.escpos, or
+// <category>/<xx>/qr-<id>.escpos with --layout sharded). Opt in with
+// PRINT_REORDER_QR=true; only the guest's receipt (GUEST_RECEIPT_PRINTER,
+// by default the last printer, reception) gets the code
+const PRINT_REORDER_QR = process.env.PRINT_REORDER_QR === 'true';
+const QR_ESCPOS_DIR = process.env.QR_ESCPOS_DIR || path.join(__dirname, '..', 'all-qr-codes');
+const QR_ESCPOS_FOLDERS = { room: 'rooms', restaurant: 'restaurant', garden: 'garden' };
+// How long a location without a blob waits before the files are looked for again
+const REORDER_QR_RECHECK_MS = 60 * 1000;
+
+// Same shard folder as qr_output.shard_of: first 2 hex digits of SHA-256(id)
+const shardOf = (locationId) => crypto.createHash('sha256').update(locationId).digest('hex').slice(0, 2);
+
+// Location name (what the menu sends as locationInfo) -> candidate blob paths
+let reorderQrPaths = {};
+if (PRINT_REORDER_QR) {
+  if (!PRINTER_HOSTS.includes(GUEST_RECEIPT_PRINTER)) {
+    console.error(`GUEST_RECEIPT_PRINTER ${GUEST_RECEIPT_PRINTER} is not in PRINTER_HOSTS; no receipt will get the reorder QR code`);
+  }
+  try {
+    const tokensPath = path.join(__dirname, '..', 'data', 'tokens.json');
+    const tokens = JSON.parse(fs.readFileSync(tokensPath, 'utf-8'));
+    for (const [locationId, location] of Object.entries(tokens)) {
+      const folder = QR_ESCPOS_FOLDERS[location.type];
+      if (folder) {
+        const filename = `qr-${locationId}.escpos`;
+        reorderQrPaths[location.name] = [
+          path.join(QR_ESCPOS_DIR, folder, filename),
+          path.join(QR_ESCPOS_DIR, folder, shardOf(locationId), filename),
+        ];
+      }
+    }
+  } catch (error) {
+    console.error('Error loading tokens for reorder QR codes:', error);
+  }
+}
+
+// locationInfo -> { blobPath, mtimeMs, blob } or { blob: null, checkedAt } for a missing blob
+const reorderQrCache = new Map();
+
+const findReorderQr = async (locationInfo) => {
+  for (const blobPath of reorderQrPaths[locationInfo]) {
+    try {
+      const { mtimeMs } = await fs.promises.stat(blobPath);
+      const blob = await fs.promises.readFile(blobPath);
+      return { blobPath, mtimeMs, blob };
+    } catch (error) {
+      // Try the other layout
+    }
+  }
+  return { blob: null, checkedAt: Date.now() }; // Not generated yet - receipt prints without the QR code
+};
+
+const getReorderQr = async (locationInfo) => {
+  if (!PRINT_REORDER_QR || !reorderQrPaths[locationInfo]) return null;
+  const cached = reorderQrCache.get(locationInfo);
+  if (cached && cached.blob) {
+    // Re-read when the code was regenerated; look again when it was removed
+    try {
+      const { mtimeMs } = await fs.promises.stat(cached.blobPath);
+      if (mtimeMs === cached.mtimeMs) return cached.blob;
+    } catch (error) {
+      // Gone: fall through and search both layouts
+    }
+  } else if (cached && Date.now() - cached.checkedAt < REORDER_QR_RECHECK_MS) {
+    return null;
+  }
+  const entry = await findReorderQr(locationInfo);
+  reorderQrCache.set(locationInfo, entry);
+  return entry.blob;
+};
+
 // Middleware to parse JSON bodies
 app.use(express.json());
 
@@ -471,10 +618,10 @@ const sendOrderNotificationEmails = async (orderData) => {
   }
 };
 
-async function printReceipt(printerIp, printerPort, orderData, locationInfo) {
+async function printReceipt(printerIp, printerPort, orderData, locationInfo, guestReceipt) {
   let printer = new ThermalPrinter({
     type: PrinterTypes.EPSON, // Assuming Palmx POS-80-IV is Epson compatible
-    interface: `tcp://${printerIp}:${printerPort}`,
+    interface: `tcp://${printerIp.includes(':') ? `[${printerIp}]` : printerIp}:${printerPort}`,
     characterSet: CharacterSet.PC850_MULTILINGUAL_LATIN1, // Changed character set
     removeSpecialCharacters: false,
     lineCharacter: '-',
@@ -515,6 +662,15 @@ async function printReceipt(printerIp, printerPort, orderData, locationInfo) {
     printer.newLine();
     printer.alignCenter();
     printer.println(latinizeText("Tesekkur Ederiz!"));
+
+    // Reorder QR code on the guest's receipt only: a ready-made raster command, appended as-is
+    const reorderQr = guestReceipt ? await getReorderQr(locationInfo) : null;
+    if (reorderQr) {
+      printer.newLine();
+      printer.println(latinizeText("Tekrar siparis icin okutun"));
+      printer.setBuffer(Buffer.concat([printer.getBuffer(), reorderQr]));
+      printer.newLine();
+    }
     
     // Single long beep (approximately 3 seconds)
     // Method 1: Built-in beep method
@@ -560,42 +716,39 @@ app.post('/print', authenticateToken, async (req, res) => {
 
   // TODO: Token validation logic
 
-  const printerIPs = [
-    '192.168.1.50', // Bar
-    '192.168.1.51', // Kitchen
-    '192.168.1.52'  // Reception
-  ];
-
   let allPrintsSuccessful = true;
   let printResults = [];
 
   // Helper function for a delay
   const delay = ms => new Promise(resolve => setTimeout(resolve, ms));
 
-  for (const ip of printerIPs) {
-    console.log(`Attempting to print to ${ip}:${PRINTER_PORT}`);
-    const success = await printReceipt(ip, PRINTER_PORT, orderData, locationInfo);
-    printResults.push({ printer: ip, success });
+  for (const [index, { host, ip, port: printerPort }] of PRINTERS.entries()) {
+    console.log(`Attempting to print to ${host}`);
+    const success = await printReceipt(ip, printerPort, orderData, locationInfo, host === GUEST_RECEIPT_PRINTER);
+    printResults.push({ printer: host, success });
     if (!success) {
       allPrintsSuccessful = false;
     }
-    if (printerIPs.indexOf(ip) < printerIPs.length - 1) { // Don't delay after the last printer
-      console.log(`Delaying for 3 seconds before next print attempt...`);
-      await delay(3000); // 3-second delay
+    if (index < PRINTERS.length - 1 && PRINTER_DELAY_MS > 0) { // Don't delay after the last printer
+      console.log(`Delaying for ${PRINTER_DELAY_MS / 1000} seconds before next print attempt...`);
+      await delay(PRINTER_DELAY_MS);
     }
   }
 
-  // Send email notifications (always send regardless of print success/failure)
-  console.log('Sending email notifications for order:', orderData.orderNumber);
-  try {
-    const emailResult = await sendOrderNotificationEmails(orderData);
-    if (emailResult.success) {
-      console.log('Email notifications sent successfully');
-    } else {
-      console.error('Failed to send email notifications:', emailResult.error);
+  // Send email notifications (always send regardless of print success/failure,
+  // unless SEND_ORDER_EMAILS=false, e.g. during load tests)
+  if (SEND_ORDER_EMAILS) {
+    console.log('Sending email notifications for order:', orderData.orderNumber);
+    try {
+      const emailResult = await sendOrderNotificationEmails(orderData);
+      if (emailResult.success) {
+        console.log('Email notifications sent successfully');
+      } else {
+        console.error('Failed to send email notifications:', emailResult.error);
+      }
+    } catch (emailError) {
+      console.error('Error sending email notifications:', emailError);
     }
-  } catch (emailError) {
-    console.error('Error sending email notifications:', emailError);
   }
 
   if (allPrintsSuccessful) {
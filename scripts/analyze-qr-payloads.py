@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+QR Payload Analyzer for La Strada Hotel
+Shows, for every location, the QR version and module count each --payload
+form needs, and what the batch as a whole would be encoded at.
+"""
+
+import argparse
+import json
+import sys
+
+try:
+    from qr_payload import PAYLOAD_FORMS, location_payload, segment_modes
+    from qr_render import ERROR_CORRECTION, ERROR_CORRECTION_LEVELS, fit_version
+except ImportError:
+    print("❌ Required library not installed!")
+    print("📦 Please install it with:")
+    print("   pip install qrcode[pil]")
+    sys.exit(1)
+
+# Configuration
+BASE_URL = "https://menu.theplazahoteledirne.com"
+TOKENS_FILE = "data/tokens.json"
+
+def load_tokens():
+    """Load tokens from JSON file"""
+    try:
+        with open(TOKENS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"❌ Error: {TOKENS_FILE} not found!")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"❌ Error: Invalid JSON in {TOKENS_FILE}")
+        sys.exit(1)
+
+def modules(version):
+    return version * 4 + 17
+
+def describe(version):
+    """'v4 33x33', or '-' for a form that cannot hold the token"""
+    return '-' if version is None else f"v{version} {modules(version)}x{modules(version)}"
+
+def analyze(tokens, error_correction, base_url=BASE_URL):
+    """Return [(location_id, {form: version or None})]; None when a form cannot hold the token"""
+    rows = []
+    for location_id, data in tokens.items():
+        versions = {}
+        for form in PAYLOAD_FORMS:
+            try:
+                versions[form] = fit_version(location_payload(data['token'], base_url, form), error_correction)
+            except ValueError:
+                versions[form] = None
+        rows.append((location_id, versions))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare QR versions for each --payload form")
+    parser.add_argument('--error-correction', choices=sorted(ERROR_CORRECTION_LEVELS), default=ERROR_CORRECTION,
+                        help=f"QR error correction level (default: {ERROR_CORRECTION})")
+    parser.add_argument('--base-url', default=BASE_URL, help=f"menu URL the codes point at (default: {BASE_URL})")
+    parser.add_argument('--summary', action='store_true', help="only print the batch totals")
+    args = parser.parse_args()
+
+    print("🔬 La Strada Hotel - QR Payload Analyzer")
+    print("=" * 60)
+
+    tokens = load_tokens()
+    rows = analyze(tokens, args.error_correction, args.base_url)
+    print(f"📖 {len(rows)} locations, error correction {args.error_correction}")
+
+    if not args.summary:
+        print(f"\n{'Location':<16}" + "".join(f"{form:>14}" for form in PAYLOAD_FORMS))
+        for location_id, versions in rows:
+            cells = "".join(f"{describe(version):>14}" for version in versions.values())
+            print(f"{location_id:<16}{cells}")
+
+    example = next(iter(tokens.values()))['token']
+    print("\n📐 Batch (every code at the version of the longest payload):")
+    baseline = max(versions['url'] for _, versions in rows)
+    for form in PAYLOAD_FORMS:
+        versions = [row[form] for _, row in rows]
+        if None in versions:
+            print(f"   {form:<9} ❌ not possible for every token")
+            continue
+        batch = max(versions)
+        smaller = sum(1 for _, row in rows if row[form] < row['url'])
+        area = 1 - modules(batch) ** 2 / modules(baseline) ** 2
+        segments = ", ".join(f"{mode} {length}" for mode, length in
+                             segment_modes(location_payload(example, args.base_url, form)))
+        print(f"   {form:<9} v{batch} {modules(batch)}x{modules(batch)} ({area:.0%} fewer modules per code, "
+              f"{smaller}/{len(rows)} codes smaller on their own) [{segments}]")
+
+if __name__ == "__main__":
+    main()
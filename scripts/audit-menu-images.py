@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Menu Image Auditor for La Strada Hotel
+Hashes every photo under public/images with a perceptual hash, groups the
+ones that look the same (the same dish saved twice at a different size,
+name or format), and checks them against the image paths data/menu-items.ts
+and the app's source files use. Reports duplicate groups, unused images,
+menu images that do not exist, and the bytes removing the extras would save.
+
+Two images are near-duplicates when their 64-bit DCT hashes differ in at
+most --threshold bits. Resized or recompressed copies stay within a couple of
+bits; different dishes are usually around 30 apart, and two similar-looking
+pastas come to 10.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+    from PIL import Image, ImageOps
+except ImportError:
+    print("❌ Required libraries not installed!")
+    print("📦 Please install them with:")
+    print("   pip install pillow numpy")
+    sys.exit(1)
+
+from menu_source import MENU_ITEMS_FILE, load_menu_items
+
+# Configuration
+IMAGES_DIR = "public/images"
+PUBLIC_DIR = "public"
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".gif")
+SOURCE_DIRS = ["app", "components", "lib", "data", "print-service"]
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".css")
+DEFAULT_THRESHOLD = 6
+
+HASH_SIZE = 8
+SAMPLE_SIZE = 32
+IMAGE_PATH_PATTERN = re.compile(r"""/images/[^"'`\s)]+\.(?:jpe?g|png|webp|gif)""", re.IGNORECASE)
+
+def dct_matrix(n):
+    """Orthonormal DCT-II matrix, so D @ x @ D.T is the 2-D DCT of x"""
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    matrix = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+DCT = dct_matrix(SAMPLE_SIZE)
+
+def perceptual_hash(image):
+    """64-bit pHash: which low-frequency DCT terms of a 32x32 grey copy are above their median"""
+    pixels = np.asarray(image.convert('L').resize((SAMPLE_SIZE, SAMPLE_SIZE), Image.LANCZOS), dtype=np.float64)
+    low = (DCT @ pixels @ DCT.T)[:HASH_SIZE, :HASH_SIZE].flatten()
+    # The DC term is just the average brightness, so it is left out of the median
+    bits = low > np.median(low[1:])
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+def hash_file(path):
+    """Hash one image (runs in a worker); returns a dict, with 'error' if it could not be read"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    result = {'path': path, 'bytes': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+    try:
+        with Image.open(path) as image:
+            result['width'], result['height'] = image.size
+            # Let the JPEG decoder scale down while decoding; the hash only needs 32x32
+            image.draft('RGB', (SAMPLE_SIZE * 4, SAMPLE_SIZE * 4))
+            result['phash'] = perceptual_hash(ImageOps.exif_transpose(image))
+    except (OSError, ValueError) as e:
+        result['error'] = str(e)
+    return result
+
+def find_images(directory):
+    """Every image file under directory, in sorted order"""
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for filename in sorted(files):
+            if filename.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.join(root, filename)
+
+def url_path(path):
+    """public/images/x.jpg -> /images/x.jpg, the form the app uses"""
+    return "/" + os.path.relpath(path, PUBLIC_DIR).replace(os.sep, "/")
+
+def menu_references():
+    """{image url: [menu item ids]} from data/menu-items.ts"""
+    references = {}
+    for item in load_menu_items():
+        if item.get('image'):
+            references.setdefault(item['image'], []).append(item['id'])
+    return references
+
+def source_references():
+    """{image url: [source files]} for /images/ paths written anywhere else in the app"""
+    references = {}
+    for directory in SOURCE_DIRS:
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = sorted(d for d in dirs if d != "node_modules")
+            for filename in sorted(files):
+                path = os.path.join(root, filename)
+                if not filename.endswith(SOURCE_EXTENSIONS) or os.path.normpath(path) == os.path.normpath(MENU_ITEMS_FILE):
+                    continue
+                with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                    for url in set(IMAGE_PATH_PATTERN.findall(f.read())):
+                        references.setdefault(url, []).append(path)
+    return references
+
+def hamming_distances(hashes):
+    """n x n matrix of differing bits between every pair of 64-bit hashes"""
+    values = np.array(hashes, dtype=np.uint64)
+    xor = values[:, None] ^ values[None, :]
+    return np.unpackbits(xor.view(np.uint8), axis=-1).reshape(len(values), len(values), -1).sum(axis=-1)
+
+def cluster(images, threshold):
+    """Groups (lists of indices) of images within threshold bits of each other, linked transitively"""
+    parent = list(range(len(images)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    distances = hamming_distances([image['phash'] for image in images])
+    for i, j in zip(*np.nonzero(np.triu(distances <= threshold, k=1))):
+        parent[find(i)] = find(j)
+
+    groups = {}
+    for i in range(len(images)):
+        groups.setdefault(find(i), []).append(i)
+    return [sorted(group) for group in groups.values() if len(group) > 1], distances
+
+def keeper(group, images):
+    """The copy to keep: most used by the menu, then the most pixels, then the smallest file"""
+    return min(group, key=lambda i: (-len(images[i]['menu']), -images[i]['width'] * images[i]['height'],
+                                     images[i]['bytes'], images[i]['path']))
+
+def format_bytes(size):
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f} MB"
+    return f"{size / 1024:.0f} KB"
+
+def describe(image):
+    uses = []
+    if image['menu']:
+        uses.append(f"{len(image['menu'])} menu item(s)")
+    if image['sources']:
+        uses.append(", ".join(image['sources']))
+    return (f"{image['url']} ({image['width']}x{image['height']}, {format_bytes(image['bytes'])}"
+            f"{', ' + '; '.join(uses) if uses else ', unused'})")
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Find duplicate, unused and missing menu images")
+    parser.add_argument('directory', nargs='?', default=IMAGES_DIR, help=f"images folder (default: {IMAGES_DIR})")
+    parser.add_argument('--threshold', type=int, default=DEFAULT_THRESHOLD, metavar='BITS',
+                        help=f"largest hash difference that counts as a duplicate, 0-64 (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: CPU count)")
+    parser.add_argument('--json', metavar='FILE', help="also write the full report as JSON")
+    parser.add_argument('--check', action='store_true',
+                        help="exit with status 1 if there are duplicate, unused, missing or unreadable images")
+    args = parser.parse_args()
+    if not 0 <= args.threshold <= 64:
+        parser.error("--threshold must be between 0 and 64")
+    return args
+
+def main():
+    args = parse_args()
+    print("🖼️  La Strada Hotel - Menu Image Audit")
+    print("=" * 60)
+
+    if not os.path.isdir(args.directory):
+        print(f"❌ Error: {args.directory}/ not found!")
+        sys.exit(1)
+    try:
+        menu = menu_references()
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: Could not read {MENU_ITEMS_FILE}: {e}")
+        sys.exit(1)
+    sources = source_references()
+
+    paths = list(find_images(args.directory))
+    if not paths:
+        print(f"❌ No images found in {args.directory}/")
+        sys.exit(1)
+    print(f"📖 Hashing {len(paths)} images with {args.jobs} workers...")
+    start = time.perf_counter()
+    chunksize = max(1, len(paths) // (args.jobs * 4))
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(hash_file, paths, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+    total_bytes = sum(result['bytes'] for result in results)
+    print(f"⏱️  Hashed {format_bytes(total_bytes)} in {elapsed:.2f}s")
+
+    for result in results:
+        result['url'] = url_path(result['path'])
+        if 'error' in result:
+            print(f"  ⚠️  Could not read {result['path']}: {result['error']}")
+    unreadable = [result['url'] for result in results if 'error' in result]
+    images = [result for result in results if 'error' not in result]
+    for image in images:
+        image['menu'] = menu.get(image['url'], [])
+        image['sources'] = sources.get(image['url'], [])
+
+    groups, distances = cluster(images, args.threshold)
+    removable = {}
+    repoint = []
+    print(f"\n👯 Near-duplicate groups (within {args.threshold} bits): {len(groups)}")
+    for group in groups:
+        keep = keeper(group, images)
+        print(f"  ✅ keep   {describe(images[keep])}")
+        for i in group:
+            if i == keep:
+                continue
+            image = images[i]
+            same = "identical file" if image['sha256'] == images[keep]['sha256'] else f"{distances[keep][i]} bits apart"
+            print(f"     ➖ drop {describe(image)} - {same}")
+            removable[image['path']] = image['bytes']
+            if image['menu'] or image['sources']:
+                repoint.append((image['url'], images[keep]['url'], image['menu'] + image['sources']))
+
+    unused = [image for image in images
+              if not image['menu'] and not image['sources'] and image['path'] not in removable]
+    print(f"\n🗑️  Unused images (not in {MENU_ITEMS_FILE} or the app source): {len(unused)}")
+    for image in unused:
+        print(f"  ➖ {describe(image)}")
+        removable[image['path']] = image['bytes']
+
+    existing = {image['url'] for image in results}
+    missing = sorted(url for url in set(menu) | set(sources) if url not in existing)
+    print(f"\n❓ Referenced but not in {args.directory}/: {len(missing)}")
+    for url in missing:
+        users = menu.get(url, []) + sources.get(url, [])
+        print(f"  ⚠️  {url} - {len(users)} use(s): {', '.join(users[:3])}{', ...' if len(users) > 3 else ''}")
+
+    if repoint:
+        print("\n🔁 Point these at the kept copy before deleting the duplicates:")
+        for old, new, users in repoint:
+            print(f"  {old} -> {new} ({', '.join(users)})")
+
+    recoverable = sum(removable.values())
+    print("\n" + "=" * 60)
+    print(f"📊 {len(images)} images, {format_bytes(total_bytes)}; "
+          f"{len(images) - len(removable)} worth keeping")
+    if unreadable:
+        print(f"⚠️  {len(unreadable)} image(s) could not be read - re-export or remove them")
+    print(f"💾 Recoverable: {format_bytes(recoverable)} ({recoverable / total_bytes:.0%}) "
+          f"from {len(removable)} file(s)")
+
+    if args.json:
+        report = {
+            'threshold': args.threshold,
+            'images': [{key: image[key] for key in ('url', 'width', 'height', 'bytes', 'sha256', 'menu', 'sources')}
+                       | {'phash': f"{image['phash']:016x}"} for image in images],
+            'duplicates': [{'keep': images[keeper(group, images)]['url'],
+                            'members': [images[i]['url'] for i in group]} for group in groups],
+            'unused': [image['url'] for image in unused],
+            'missing': missing,
+            'unreadable': unreadable,
+            'recoverable_bytes': recoverable,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        print(f"📝 Report written to {args.json}")
+
+    if args.check and (groups or unused or missing or unreadable):
+        sys.exit(1)
+    print("🎉 Image audit complete!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Deploy Manifest Builder for La Strada Hotel
+Hashes a generated output folder (e.g. qr-codes-output/) and lists which
+files were added, changed or removed since the last deploy.
+"""
+
+import argparse
+import os
+import sys
+
+from qr_output import MANIFEST_FILE, print_manifest_summary, write_manifest
+
+# Configuration
+DEFAULT_DIR = "qr-codes-output"
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a content-hash manifest for a generated output folder")
+    parser.add_argument('directory', nargs='?', default=DEFAULT_DIR,
+                        help=f"folder to hash (default: {DEFAULT_DIR})")
+    parser.add_argument('--list', action='store_true',
+                        help="print every added, changed and removed path")
+    args = parser.parse_args()
+
+    print("🧾 La Strada Hotel - Deploy Manifest Builder")
+    print("=" * 50)
+
+    if not os.path.isdir(args.directory):
+        print(f"❌ Error: {args.directory}/ not found!")
+        sys.exit(1)
+
+    manifest, added, changed, removed = write_manifest(args.directory)
+    print_manifest_summary(args.directory, manifest, added, changed, removed)
+
+    if args.list:
+        for label, paths in (("➕", added), ("✏️ ", changed), ("➖", removed)):
+            for path in paths:
+                print(f"   {label} {path}")
+
+    print(f"\n📋 Upload only the added/changed files, then {MANIFEST_FILE} itself.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Menu Search Index Builder for La Strada Hotel
+Builds an inverted index and a compact prefix trie over item names and
+descriptions in English and Turkish, so the menu can search instantly.
+"""
+
+import json
+import os
+import re
+import sys
+import unicodedata
+
+from menu_source import MENU_ITEMS_FILE, load_menu_items
+from translation_source import load_translations
+
+# Configuration
+OUTPUT_DIR = "public/menu-data"
+OUTPUT_FILE = "search-index.json"
+SEARCH_LOCALES = ["en", "tr"]
+FORMAT_VERSION = 1
+
+# Turkish letters folded to their plain Latin form; dotted/dotless I are
+# handled before lowercasing because str.lower() gets them wrong for Turkish.
+TURKISH_FOLD = str.maketrans({
+    'ç': 'c', 'ğ': 'g', 'ı': 'i', 'ö': 'o', 'ş': 's', 'ü': 'u',
+})
+WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+def fold_text(text):
+    """Case and diacritic fold text the way Turkish readers expect"""
+    text = text.replace('İ', 'i').replace('I', 'ı').lower().translate(TURKISH_FOLD)
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+def tokenize(text):
+    """Split folded text into searchable words"""
+    return WORD_PATTERN.findall(fold_text(text))
+
+def item_text(item, translations, field):
+    """Resolve an item's name or description in one language"""
+    key = item.get(f'{field}Key')
+    if key and key in translations:
+        return translations[key]
+    return item.get(field, '')
+
+def build_inverted_index(items, translations):
+    """Map every word to the sorted list of item positions containing it"""
+    index = {}
+    for position, item in enumerate(items):
+        text = f"{item_text(item, translations, 'name')} {item_text(item, translations, 'description')}"
+        for word in set(tokenize(text)):
+            index.setdefault(word, []).append(position)
+    return index
+
+def build_trie(terms, start=0, end=None, depth=0):
+    """Build a path-compressed trie over sorted terms
+
+    Each node is [first_term, last_term_exclusive, {edge_label: child}], so a
+    prefix lookup ends on a node whose range covers every matching term.
+    """
+    if end is None:
+        end = len(terms)
+    children = {}
+    i = start
+    # A term equal to the current prefix sorts first and terminates here
+    while i < end and len(terms[i]) == depth:
+        i += 1
+    while i < end:
+        char = terms[i][depth]
+        j = i
+        while j < end and terms[j][depth] == char:
+            j += 1
+        # Extend the edge while every term in the range shares the next char
+        label_end = depth + 1
+        while all(len(term) > label_end for term in terms[i:j]) and len({term[label_end] for term in terms[i:j]}) == 1:
+            label_end += 1
+        children[terms[i][depth:label_end]] = build_trie(terms, i, j, label_end)
+        i = j
+    return [start, end, children]
+
+def build_locale_index(items, translations):
+    """Build the postings and trie for one language
+
+    Terms themselves are not stored: the trie edges spell them out and each
+    node's range points straight into the postings list.
+    """
+    inverted = build_inverted_index(items, translations)
+    terms = sorted(inverted)
+    return {
+        'postings': [inverted[term] for term in terms],
+        'trie': build_trie(terms),
+    }
+
+def search(index, locale, query):
+    """Reference lookup: item positions matching every query word as a prefix"""
+    locale_index = index['locales'][locale]
+    result = None
+    for word in tokenize(query):
+        node = locale_index['trie']
+        rest = word
+        while rest:
+            for label, child in node[2].items():
+                if rest.startswith(label):
+                    node, rest = child, rest[len(label):]
+                    break
+                if label.startswith(rest):
+                    node, rest = child, ''
+                    break
+            else:
+                return []
+        matches = set()
+        for postings in locale_index['postings'][node[0]:node[1]]:
+            matches.update(postings)
+        result = matches if result is None else result & matches
+    return sorted(result or [])
+
+def main():
+    print("🔍 La Strada Hotel - Menu Search Index Builder")
+    print("=" * 50)
+
+    print(f"📖 Reading {MENU_ITEMS_FILE} and translations...")
+    try:
+        items = load_menu_items()
+        translations = load_translations()
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
+
+    print(f"✅ Found {len(items)} items")
+
+    index = {
+        'version': FORMAT_VERSION,
+        'items': [[item['id'], item['category']] for item in items],
+        'locales': {},
+    }
+    for locale in SEARCH_LOCALES:
+        index['locales'][locale] = build_locale_index(items, translations[locale])
+        print(f"  ✅ {locale}: {len(index['locales'][locale]['postings'])} terms")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    output_path = os.path.join(OUTPUT_DIR, OUTPUT_FILE)
+    text = json.dumps(index, ensure_ascii=False, separators=(',', ':'))
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+    print("\n" + "=" * 50)
+    print("🎉 Search index built!")
+    print(f"📂 File saved: {output_path} ({len(text.encode('utf-8')):,} bytes)")
+
+    # Quick self-check against a couple of known dishes
+    for locale, query in (('tr', 'SIS'), ('en', 'omel')):
+        ids = [index['items'][position][0] for position in search(index, locale, query)]
+        print(f"   🔎 {locale} '{query}' -> {', '.join(ids[:5]) or 'no matches'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Menu Data Compiler for La Strada Hotel
+Splits data/menu-items.ts into per-category JSON shards plus a small index so
+pages only fetch the category being viewed.
+"""
+
+import hashlib
+import os
+import re
+import sys
+
+from menu_source import MENU_ITEMS_FILE, load_menu_items
+from qr_output import canonical_json, write_if_changed
+
+# Configuration
+OUTPUT_DIR = "public/menu-data"
+INDEX_FILE = "index.json"
+HASH_LENGTH = 10
+SHARD_PATTERN = re.compile(r"^[a-z0-9-]+\.[0-9a-f]{%d}\.json$" % HASH_LENGTH)
+
+def content_hash(text):
+    """Short content hash used in shard file names for cache-busting"""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()[:HASH_LENGTH]
+
+def group_by_category(items):
+    """Group menu items by their category, keeping source order"""
+    categories = {}
+    for item in items:
+        categories.setdefault(item['category'], []).append(item)
+    return categories
+
+def build_shards(categories):
+    """Return {category: (filename, hash, json_text)} for every category"""
+    shards = {}
+    for category, items in categories.items():
+        text = canonical_json(items)
+        digest = content_hash(text)
+        shards[category] = (f"{category}.{digest}.json", digest, text)
+    return shards
+
+def build_index(categories, shards):
+    """Build the small index loaded on first paint"""
+    return {
+        'categories': [
+            {
+                'id': category,
+                'file': shards[category][0],
+                'hash': shards[category][1],
+                'count': len(items),
+            }
+            for category, items in categories.items()
+        ],
+        'items': [
+            {
+                'id': item['id'],
+                'category': category,
+                'price': item['price'],
+                'image': item['image'],
+            }
+            for category, items in categories.items()
+            for item in items
+        ],
+    }
+
+def remove_stale_shards(output_dir, shards):
+    """Delete shard files left over from previous menu versions"""
+    current = {filename for filename, _, _ in shards.values()}
+    removed = []
+    for filename in sorted(os.listdir(output_dir)):
+        if not SHARD_PATTERN.match(filename):
+            continue
+        if filename not in current:
+            os.remove(os.path.join(output_dir, filename))
+            removed.append(filename)
+    return removed
+
+def main():
+    print("🍽️  La Strada Hotel - Menu Data Compiler")
+    print("=" * 50)
+
+    print(f"📖 Reading {MENU_ITEMS_FILE}...")
+    try:
+        items = load_menu_items()
+    except FileNotFoundError:
+        print(f"❌ Error: {MENU_ITEMS_FILE} not found!")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"❌ Error: Could not parse {MENU_ITEMS_FILE}: {e}")
+        sys.exit(1)
+
+    categories = group_by_category(items)
+    print(f"✅ Found {len(items)} items in {len(categories)} categories")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    shards = build_shards(categories)
+
+    print("\n📦 Writing category shards...")
+    for category, (filename, _, text) in shards.items():
+        changed = write_if_changed(os.path.join(OUTPUT_DIR, filename), text)
+        status = "updated" if changed else "unchanged"
+        print(f"  ✅ {category:<12} {len(categories[category]):3d} items -> {filename} ({len(text.encode('utf-8')):,} bytes, {status})")
+
+    index_text = canonical_json(build_index(categories, shards))
+    write_if_changed(os.path.join(OUTPUT_DIR, INDEX_FILE), index_text)
+
+    removed = remove_stale_shards(OUTPUT_DIR, shards)
+    for filename in removed:
+        print(f"  🗑️  Removed stale shard {filename}")
+
+    total_bytes = sum(len(text.encode('utf-8')) for _, _, text in shards.values())
+    print("\n" + "=" * 50)
+    print("🎉 Menu data compiled!")
+    print(f"📂 Files saved in: {OUTPUT_DIR}/")
+    print(f"📇 Index: {INDEX_FILE} ({len(index_text.encode('utf-8')):,} bytes)")
+    print(f"📦 Shards: {len(shards)} files, {total_bytes:,} bytes total")
+
+if __name__ == "__main__":
+    main()
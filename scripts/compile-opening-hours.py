@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Opening Hours Compiler for La Strada Hotel
+Turns the hours definition in data/opening-hours.json (per category, per
+location type, with dated exceptions and holidays) into minute bitmaps that
+lib/opening-hours.ts answers "is this open now?" from with one bit test.
+
+Definition:
+
+    {
+      "default":    {"daily": [["12:00", "24:00"]]},
+      "categories": {"breakfast": {"daily": [["07:00", "24:00"]]}},
+      "location_types": {
+        "garden": {"default": {"daily": [["12:00", "22:00"]], "sun": [["10:00", "22:00"]]}}
+      },
+      "exceptions": {
+        "2026-12-31": {"default": [["12:00", "24:00"]], "categories": {"breakfast": [["07:00", "11:00"]]}},
+        "2027-01-01": {"closed": true}
+      }
+    }
+
+A schedule has a "daily" window list and optional "sun".."sat" lists that
+replace it on that weekday; a window ending before it starts runs past
+midnight into the next day. Location types override the top-level default
+and categories. An exception replaces the windows of the categories it
+names (or all of them via "default", or "closed") for that whole date, for
+every location type.
+
+Compiled output (data/opening-hours.compiled.json):
+    weekly  base64 bitmaps of 7 x 1440 minutes, bit day * 1440 + minute
+            (day 0 is Sunday, like Date.getDay()), MSB first
+    days    base64 bitmaps of 1440 minutes for exception dates
+    types   "*" and each location type -> schedule indices for "default",
+            "any" (open for at least one category) and "categories", plus
+            the opening windows shown to guests
+    dates   "YYYY-MM-DD" -> location type -> day bitmap indices, same shape
+"""
+
+import base64
+import json
+import re
+import sys
+from datetime import date
+
+from qr_output import write_if_changed
+
+# Configuration
+SOURCE_FILE = "data/opening-hours.json"
+OUTPUT_FILE = "data/opening-hours.compiled.json"
+FORMAT_VERSION = 1
+
+DAYS = ['sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat']
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+# The weekday whose windows are shown as "the" opening hours
+LABEL_DAY = DAYS.index('mon')
+
+TIME_PATTERN = re.compile(r"^([01]\d|2[0-4]):([0-5]\d)$")
+
+def parse_time(text, where):
+    """'07:30' -> 450 minutes after midnight; '24:00' is allowed as an end"""
+    match = TIME_PATTERN.match(text) if isinstance(text, str) else None
+    minutes = int(match.group(1)) * 60 + int(match.group(2)) if match else None
+    if minutes is None or minutes > MINUTES_PER_DAY:
+        raise ValueError(f"{where}: not a time of day: {text!r}")
+    return minutes
+
+def format_time(minutes):
+    """Inverse of parse_time, with midnight shown as 00:00 like the menu does"""
+    minutes %= MINUTES_PER_DAY
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def parse_windows(windows, where):
+    """[["07:00", "24:00"], ...] -> [(start, end)] in minutes; end <= start wraps past midnight"""
+    if not isinstance(windows, list):
+        raise ValueError(f"{where}: expected a list of [start, end] windows")
+    parsed = []
+    for window in windows:
+        if not isinstance(window, list) or len(window) != 2:
+            raise ValueError(f"{where}: expected [start, end], got {window!r}")
+        start = parse_time(window[0], where)
+        end = parse_time(window[1], where)
+        if start == MINUTES_PER_DAY:
+            raise ValueError(f"{where}: a window cannot start at 24:00")
+        if end <= start:
+            end += MINUTES_PER_DAY
+        parsed.append((start, end))
+    return parsed
+
+def parse_schedule(schedule, where):
+    """A schedule dict -> seven window lists, Sunday first"""
+    if not isinstance(schedule, dict):
+        raise ValueError(f"{where}: expected an object with \"daily\" and/or weekday windows")
+    unknown = set(schedule) - set(DAYS) - {'daily'}
+    if unknown:
+        raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+    daily = parse_windows(schedule.get('daily', []), f"{where}.daily")
+    return [parse_windows(schedule[day], f"{where}.{day}") if day in schedule else daily for day in DAYS]
+
+def weekly_bits(days):
+    """Seven window lists -> one bool per minute of the week; windows wrap from Saturday into Sunday"""
+    bits = [False] * MINUTES_PER_WEEK
+    for day, windows in enumerate(days):
+        for start, end in windows:
+            for minute in range(day * MINUTES_PER_DAY + start, day * MINUTES_PER_DAY + end):
+                bits[minute % MINUTES_PER_WEEK] = True
+    return bits
+
+def day_bits(windows):
+    """One window list -> one bool per minute of a single date; windows stop at midnight"""
+    bits = [False] * MINUTES_PER_DAY
+    for start, end in windows:
+        for minute in range(start, min(end, MINUTES_PER_DAY)):
+            bits[minute] = True
+    return bits
+
+def pack_bits(bits):
+    """Bools -> base64 text, MSB first (the same bit order as qr_store's matrices)"""
+    packed = bytearray((len(bits) + 7) // 8)
+    for i, bit in enumerate(bits):
+        if bit:
+            packed[i >> 3] |= 0x80 >> (i & 7)
+    return base64.b64encode(bytes(packed)).decode('ascii')
+
+def union(bitmaps):
+    return [any(column) for column in zip(*bitmaps)]
+
+def opening_windows(bits, day):
+    """The [start, end] windows that begin on one weekday of a weekly bitmap, for display"""
+    windows = []
+    minute = day * MINUTES_PER_DAY
+    end_of_day = minute + MINUTES_PER_DAY
+    while minute < end_of_day:
+        if bits[minute % MINUTES_PER_WEEK] and not bits[(minute - 1) % MINUTES_PER_WEEK]:
+            end = minute
+            while bits[end % MINUTES_PER_WEEK] and end - minute < MINUTES_PER_WEEK:
+                end += 1
+            windows.append([format_time(minute), format_time(end)])
+            minute = end
+        minute += 1
+    if not windows and all(bits[day * MINUTES_PER_DAY:end_of_day]):
+        windows.append([format_time(0), format_time(0)])
+    return windows
+
+class BitmapTable:
+    """Deduplicated list of packed bitmaps; identical schedules share one entry"""
+
+    def __init__(self):
+        self.entries = []
+        self.index = {}
+
+    def add(self, bits):
+        packed = pack_bits(bits)
+        if packed not in self.index:
+            self.index[packed] = len(self.entries)
+            self.entries.append(packed)
+        return self.index[packed]
+
+def load_definition(path=SOURCE_FILE):
+    """Read and validate the hours definition; raises ValueError on a bad definition"""
+    with open(path, 'r', encoding='utf-8') as f:
+        definition = json.load(f)
+    unknown = set(definition) - {'default', 'categories', 'location_types', 'exceptions'}
+    if unknown:
+        raise ValueError(f"unknown top-level keys {sorted(unknown)}")
+    if 'default' not in definition:
+        raise ValueError("the definition needs a \"default\" schedule")
+    return definition
+
+def resolve_schedules(definition):
+    """{location type or '*': {category or '*': seven window lists}}"""
+    base = {'*': parse_schedule(definition['default'], 'default')}
+    for category, schedule in definition.get('categories', {}).items():
+        base[category] = parse_schedule(schedule, f"categories.{category}")
+
+    resolved = {'*': base}
+    for location_type, overrides in definition.get('location_types', {}).items():
+        where = f"location_types.{location_type}"
+        unknown = set(overrides) - {'default', 'categories'}
+        if unknown:
+            raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+        # Top-level categories still apply unless the type names them itself
+        schedules = dict(base)
+        if 'default' in overrides:
+            schedules['*'] = parse_schedule(overrides['default'], f"{where}.default")
+        for category, schedule in overrides.get('categories', {}).items():
+            schedules[category] = parse_schedule(schedule, f"{where}.categories.{category}")
+        resolved[location_type] = schedules
+    return resolved
+
+def compile_weekly(resolved, table):
+    """Weekly bitmaps per location type; returns (types, {type: {category: bits}})"""
+    types = {}
+    bitmaps = {}
+    for location_type, schedules in resolved.items():
+        bits = {category: weekly_bits(days) for category, days in schedules.items()}
+        any_bits = union(bits.values())
+        bitmaps[location_type] = bits
+        types[location_type] = {
+            'default': table.add(bits['*']),
+            'any': table.add(any_bits),
+            'categories': {category: table.add(b) for category, b in sorted(bits.items()) if category != '*'},
+            'hours': {
+                'default': opening_windows(bits['*'], LABEL_DAY),
+                'any': opening_windows(any_bits, LABEL_DAY),
+                'categories': {category: opening_windows(b, LABEL_DAY)
+                               for category, b in sorted(bits.items()) if category != '*'},
+            },
+        }
+    return types, bitmaps
+
+def compile_exceptions(definition, bitmaps, table):
+    """Day bitmaps per exception date and location type"""
+    dates = {}
+    for key, exception in sorted(definition.get('exceptions', {}).items()):
+        where = f"exceptions.{key}"
+        try:
+            weekday = (date.fromisoformat(key).weekday() + 1) % 7  # Monday 0 -> Sunday 0
+        except ValueError:
+            raise ValueError(f"{where}: not a YYYY-MM-DD date")
+        unknown = set(exception) - {'default', 'categories', 'closed'}
+        if unknown:
+            raise ValueError(f"{where}: unknown keys {sorted(unknown)}")
+        closed = exception.get('closed', False)
+        default = [] if closed else exception.get('default')
+        default = parse_windows(default, f"{where}.default") if default is not None else None
+        categories = {} if closed else {
+            category: parse_windows(windows, f"{where}.categories.{category}")
+            for category, windows in exception.get('categories', {}).items()
+        }
+
+        start = weekday * MINUTES_PER_DAY
+        dates[key] = {}
+        for location_type, weekly in bitmaps.items():
+            bits = {}
+            for category in set(weekly) | set(categories):
+                if category in categories:
+                    bits[category] = day_bits(categories[category])
+                elif default is not None:
+                    bits[category] = day_bits(default)
+                else:
+                    bits[category] = (weekly.get(category) or weekly['*'])[start:start + MINUTES_PER_DAY]
+            dates[key][location_type] = {
+                'default': table.add(bits['*']),
+                'any': table.add(union(bits.values())),
+                'categories': {category: table.add(b) for category, b in sorted(bits.items()) if category != '*'},
+            }
+    return dates
+
+def compile_hours(definition):
+    """The compiled document written to OUTPUT_FILE"""
+    weekly = BitmapTable()
+    days = BitmapTable()
+    types, bitmaps = compile_weekly(resolve_schedules(definition), weekly)
+    dates = compile_exceptions(definition, bitmaps, days)
+    return {
+        'version': FORMAT_VERSION,
+        'weekly': weekly.entries,
+        'days': days.entries,
+        'types': types,
+        'dates': dates,
+    }
+
+def main():
+    print("🕐 La Strada Hotel - Opening Hours Compiler")
+    print("=" * 50)
+
+    print(f"📖 Reading {SOURCE_FILE}...")
+    try:
+        compiled = compile_hours(load_definition())
+    except FileNotFoundError:
+        print(f"❌ Error: {SOURCE_FILE} not found!")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"❌ Error: Invalid JSON in {SOURCE_FILE}")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"❌ Error: Invalid hours in {SOURCE_FILE}: {e}")
+        sys.exit(1)
+
+    for location_type, entry in compiled['types'].items():
+        label = "all locations" if location_type == '*' else location_type
+        print(f"\n📍 {label}:")
+        hours = entry['hours']
+        for category, windows in [('(default)', hours['default'])] + sorted(hours['categories'].items()):
+            text = ", ".join(f"{start} - {end}" for start, end in windows) or "closed"
+            print(f"  🕐 {category:<12} {text}")
+    for key in compiled['dates']:
+        print(f"  📅 Exception on {key}")
+
+    text = json.dumps(compiled, indent=2) + "\n"
+    changed = write_if_changed(OUTPUT_FILE, text)
+
+    print("\n" + "=" * 50)
+    print("🎉 Opening hours compiled!")
+    print(f"📂 Saved to: {OUTPUT_FILE} ({len(text.encode('utf-8')):,} bytes, {'updated' if changed else 'unchanged'})")
+    print(f"🗂️  {len(compiled['weekly'])} weekly and {len(compiled['days'])} exception bitmaps "
+          f"for {len(compiled['types'])} location scopes and {len(compiled['dates'])} dates")
+
+if __name__ == "__main__":
+    main()
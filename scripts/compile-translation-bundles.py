@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Translation Bundle Compiler for La Strada Hotel
+Splits the app's translations into one small JSON bundle per surface and
+language, holding only the keys that surface's source files look up. The
+receipt surface also gets a 'tr-latin' bundle with Turkish already folded to
+the ASCII letters the thermal printer can print, so print-service/server.js
+does no latinizing per receipt.
+
+Only surfaces that load their bundles belong in SURFACES. The Next.js pages
+read contexts/language-context.tsx directly, so they have none.
+
+Keys are found by scanning each surface's files for t("key") calls; t(`prefix${...}`)
+pulls in every key under that prefix, and keys looked up through variables
+(item.nameKey, category.nameKey) are covered by the surface's key patterns.
+"""
+
+import fnmatch
+import json
+import os
+import re
+import sys
+
+from qr_output import canonical_json, write_if_changed
+from translation_source import CONTEXT_FILE, LANGUAGES, TR_LOCALE_FILE, load_translations
+
+# Configuration
+OUTPUT_DIR = "public/translations"
+INDEX_FILE = "index.json"
+LATIN_LOCALE = "tr-latin"
+
+SURFACES = {
+    'receipt': {
+        'files': ["print-service/server.js"],
+        # Receipts and order emails only show item names
+        'patterns': ["item.*.name"],
+        'latin': True,
+    },
+}
+
+KEY_PATTERN = re.compile(r"""\bt\(\s*(["'])([\w.-]+)\1""")
+TEMPLATE_PREFIX_PATTERN = re.compile(r"\bt\(\s*`([\w.-]+)\$\{")
+
+# The same letters print-service's latinizeText() replaces
+LATIN_FOLD = str.maketrans({
+    'ö': 'o', 'ü': 'u', 'ç': 'c', 'ğ': 'g', 'ş': 's', 'ı': 'i',
+    'Ö': 'O', 'Ü': 'U', 'Ç': 'C', 'Ğ': 'G', 'Ş': 'S', 'İ': 'I',
+})
+
+def latinize(text):
+    """Fold Turkish letters to plain Latin, like latinizeText() in print-service/server.js"""
+    return text.translate(LATIN_FOLD)
+
+def referenced_keys(files):
+    """Return (literal keys, template prefixes) looked up through t() in files"""
+    keys = set()
+    prefixes = set()
+    for path in files:
+        with open(path, 'r', encoding='utf-8') as f:
+            source = f.read()
+        keys.update(match.group(2) for match in KEY_PATTERN.finditer(source))
+        prefixes.update(TEMPLATE_PREFIX_PATTERN.findall(source))
+    return keys, prefixes
+
+def surface_keys(surface, all_keys):
+    """Sorted keys a surface needs, plus the literal keys no language defines"""
+    keys, prefixes = referenced_keys(surface['files'])
+    patterns = [prefix + '*' for prefix in prefixes] + surface['patterns']
+    wanted = {key for key in all_keys
+              if key in keys or any(fnmatch.fnmatchcase(key, pattern) for pattern in patterns)}
+    return sorted(wanted), sorted(keys - all_keys)
+
+def build_bundles(translations):
+    """{surface: {locale: {key: text}}} plus {surface: unresolved keys}"""
+    all_keys = set().union(*(texts.keys() for texts in translations.values()))
+    bundles = {}
+    unresolved = {}
+    for name, surface in SURFACES.items():
+        keys, unresolved[name] = surface_keys(surface, all_keys)
+        bundles[name] = {
+            language: {key: translations[language][key] for key in keys if key in translations[language]}
+            for language in LANGUAGES
+        }
+        if surface.get('latin'):
+            bundles[name][LATIN_LOCALE] = {key: latinize(text) for key, text in bundles[name]['tr'].items()}
+    return bundles, unresolved
+
+def bundle_file(surface, locale):
+    return f"{surface}.{locale}.json"
+
+def remove_stale_bundles(output_dir, index):
+    """Delete bundle files for surfaces or locales that are no longer built"""
+    current = {entry['file'] for locales in index.values() for entry in locales.values()} | {INDEX_FILE}
+    removed = []
+    for filename in sorted(os.listdir(output_dir)):
+        if filename.endswith(".json") and filename not in current:
+            os.remove(os.path.join(output_dir, filename))
+            removed.append(filename)
+    return removed
+
+def main():
+    print("🌍 La Strada Hotel - Translation Bundle Compiler")
+    print("=" * 50)
+
+    print(f"📖 Reading {TR_LOCALE_FILE} and {CONTEXT_FILE}...")
+    try:
+        translations = load_translations()
+        bundles, unresolved = build_bundles(translations)
+    except FileNotFoundError as e:
+        print(f"❌ Error: {e.filename} not found!")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"❌ Error: Invalid JSON in {TR_LOCALE_FILE}")
+        sys.exit(1)
+    full_bytes = {language: len(canonical_json(texts).encode('utf-8')) for language, texts in translations.items()}
+    print(f"✅ {len(LANGUAGES)} languages, {max(len(texts) for texts in translations.values())} keys")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    index = {}
+    for surface, locales in bundles.items():
+        print(f"\n📦 {surface}:")
+        index[surface] = {}
+        for locale, texts in locales.items():
+            filename = bundle_file(surface, locale)
+            text = canonical_json(texts)
+            changed = write_if_changed(os.path.join(OUTPUT_DIR, filename), text)
+            size = len(text.encode('utf-8'))
+            full = full_bytes.get(locale, full_bytes['tr'])
+            index[surface][locale] = {'file': filename, 'keys': len(texts), 'bytes': size}
+            print(f"  ✅ {locale:<9} {len(texts):3d} keys -> {filename} ({size:,} bytes, "
+                  f"{1 - size / full:.0%} smaller than the full set, {'updated' if changed else 'unchanged'})")
+        if unresolved[surface]:
+            print(f"  ⚠️  Not defined in any language (shown as the key): {', '.join(unresolved[surface])}")
+
+    write_if_changed(os.path.join(OUTPUT_DIR, INDEX_FILE), canonical_json(index))
+
+    for filename in remove_stale_bundles(OUTPUT_DIR, index):
+        print(f"  🗑️  Removed stale bundle {filename}")
+
+    print("\n" + "=" * 50)
+    print("🎉 Translation bundles compiled!")
+    print(f"📂 Files saved in: {OUTPUT_DIR}/")
+    print(f"📇 Index: {INDEX_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -4,11 +4,17 @@ Master QR Code Gallery Creator for La Strada Hotel
 Combines all QR codes from different sources into one comprehensive gallery.
 """
 
+import argparse
 import json
 import os
 import shutil
+import struct
 from pathlib import Path
 
+from qr_output import (THUMBNAIL_DENSITIES, add_layout_arg, find_layout_file, generated_suffix, layout_path,
+                       print_manifest_summary, thumbnail_file, write_if_changed, write_manifest, write_text)
+from qr_templates import Template, page_head, save_stylesheet, thumbnail_img
+
 # Configuration
 BASE_URL = "https://menu.theplazahoteledirne.com"
 TOKENS_FILE = "data/tokens.json"
@@ -16,6 +22,13 @@ ROOMS_DIR = "qr-codes-images"
 RESTAURANT_GARDEN_DIR = "all-qr-codes"
 OUTPUT_DIR = "master-qr-gallery"
 
+# Location type -> category folder used by the generators' sharded layout
+CATEGORY_FOLDERS = {
+    'room': 'rooms',
+    'restaurant': 'restaurant',
+    'garden': 'garden',
+}
+
 def load_tokens():
     """Load tokens from JSON file"""
     try:
@@ -63,7 +76,47 @@ def get_all_locations(tokens):
     
     return locations
 
-def copy_qr_files(locations, output_dir):
+def copy_file(src_file, dst_file, deterministic=False):
+    """Copy one QR file; in deterministic mode identical targets are left untouched"""
+    if deterministic:
+        with open(src_file, 'rb') as f:
+            write_if_changed(dst_file, f.read())
+    else:
+        shutil.copy2(src_file, dst_file)
+
+def master_file(location, layout='flat'):
+    """Relative path of a location's PNG inside the master gallery folder"""
+    folder = CATEGORY_FOLDERS[location['type']] if layout == 'sharded' else None
+    return layout_path(f"qr-{location['location_id']}.png", location['location_id'], folder, layout)
+
+def find_source_file(source_dir, location):
+    """A generated PNG in either the flat or the sharded layout, or None"""
+    return find_layout_file(source_dir, f"qr-{location['location_id']}.png", location['location_id'],
+                            CATEGORY_FOLDERS[location['type']])
+
+def png_size(path):
+    """(width, height) from a PNG's IHDR chunk"""
+    with open(path, 'rb') as f:
+        return struct.unpack('>II', f.read(24)[16:24])
+
+def copy_thumbnails(source_dir, src_file, location, output_dir, deterministic=False, layout='flat'):
+    """Copy the generator's gallery thumbnails of src_file, if it made them
+
+    Records their size on the location so the gallery can link them;
+    locations without thumbnails fall back to the full-size PNG.
+    """
+    relative_path = os.path.relpath(src_file, source_dir).replace(os.sep, '/')
+    sources = [os.path.join(source_dir, *thumbnail_file(relative_path, density).split('/'))
+               for density in THUMBNAIL_DENSITIES]
+    if not all(os.path.exists(path) for path in sources):
+        return
+    for density, path in zip(THUMBNAIL_DENSITIES, sources):
+        dst_file = os.path.join(output_dir, *thumbnail_file(master_file(location, layout), density).split('/'))
+        os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+        copy_file(path, dst_file, deterministic)
+    location['thumbnail_size'] = png_size(sources[0])
+
+def copy_qr_files(locations, output_dir, deterministic=False, layout='flat'):
     """Copy QR code files from source directories to master directory"""
     os.makedirs(output_dir, exist_ok=True)
     
@@ -76,97 +129,54 @@ def copy_qr_files(locations, output_dir):
     # Copy room QR codes
     if os.path.exists(ROOMS_DIR):
         for location in locations['room']:
-            src_file = os.path.join(ROOMS_DIR, f"qr-{location['location_id']}.png")
-            dst_file = os.path.join(output_dir, f"qr-{location['location_id']}.png")
+            src_file = find_source_file(ROOMS_DIR, location)
+            dst_file = os.path.join(output_dir, master_file(location, layout))
             
-            if os.path.exists(src_file):
-                shutil.copy2(src_file, dst_file)
+            if src_file:
+                os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+                copy_file(src_file, dst_file, deterministic)
+                copy_thumbnails(ROOMS_DIR, src_file, location, output_dir, deterministic, layout)
                 copied_files['room'] += 1
     
     # Copy restaurant and garden QR codes
     if os.path.exists(RESTAURANT_GARDEN_DIR):
         for category in ['restaurant', 'garden']:
             for location in locations[category]:
-                src_file = os.path.join(RESTAURANT_GARDEN_DIR, f"qr-{location['location_id']}.png")
-                dst_file = os.path.join(output_dir, f"qr-{location['location_id']}.png")
+                src_file = find_source_file(RESTAURANT_GARDEN_DIR, location)
+                dst_file = os.path.join(output_dir, master_file(location, layout))
                 
-                if os.path.exists(src_file):
-                    shutil.copy2(src_file, dst_file)
+                if src_file:
+                    os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+                    copy_file(src_file, dst_file, deterministic)
+                    copy_thumbnails(RESTAURANT_GARDEN_DIR, src_file, location, output_dir, deterministic, layout)
                     copied_files[category] += 1
     
     return copied_files
 
-def create_master_gallery(locations, output_dir):
-    """Create a comprehensive HTML gallery of all QR codes"""
-    total_locations = sum(len(locations[cat]) for cat in locations)
-    
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>La Strada Hotel - Master QR Codes Gallery</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
-        .header {{ text-align: center; margin-bottom: 30px; background: white; padding: 30px; border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }}
-        .header h1 {{ color: #2c3e50; margin-bottom: 10px; }}
-        .header p {{ color: #7f8c8d; margin: 5px 0; }}
-        .stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 25px; margin-bottom: 40px; }}
-        .stat-card {{ background: white; padding: 25px; border-radius: 15px; text-align: center; box-shadow: 0 4px 10px rgba(0,0,0,0.1); transition: transform 0.3s; }}
-        .stat-card:hover {{ transform: translateY(-5px); }}
-        .stat-number {{ font-size: 2.5em; font-weight: bold; margin-bottom: 10px; }}
-        .rooms .stat-number {{ color: #3498db; }}
-        .restaurant .stat-number {{ color: #27ae60; }}
-        .garden .stat-number {{ color: #9b59b6; }}
-        .total .stat-number {{ color: #e74c3c; }}
-        .section {{ margin-bottom: 50px; }}
-        .section-title {{ font-size: 28px; font-weight: bold; margin-bottom: 25px; padding: 20px; background: white; border-radius: 15px; text-align: center; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }}
-        .rooms .section-title {{ background: linear-gradient(135deg, #3498db, #2980b9); color: white; }}
-        .restaurant .section-title {{ background: linear-gradient(135deg, #27ae60, #229954); color: white; }}
-        .garden .section-title {{ background: linear-gradient(135deg, #9b59b6, #8e44ad); color: white; }}
-        .gallery {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 25px; }}
-        .qr-item {{ background: white; padding: 25px; border-radius: 15px; text-align: center; box-shadow: 0 4px 10px rgba(0,0,0,0.1); transition: transform 0.3s; }}
-        .qr-item:hover {{ transform: translateY(-5px); }}
-        .qr-item img {{ max-width: 220px; height: 220px; border: 2px solid #ecf0f1; border-radius: 10px; }}
-        .location-title {{ font-size: 20px; font-weight: bold; margin-bottom: 15px; color: #2c3e50; }}
-        .token-info {{ font-size: 12px; color: #7f8c8d; margin: 10px 0; font-family: 'Courier New', monospace; background: #f8f9fa; padding: 5px; border-radius: 5px; }}
-        .url-info {{ font-size: 10px; color: #95a5a6; margin: 10px 0; word-break: break-all; }}
-        .download-btn {{ display: inline-block; margin-top: 15px; padding: 12px 24px; background: #3498db; color: white; text-decoration: none; border-radius: 8px; transition: background 0.3s; }}
-        .download-btn:hover {{ background: #2980b9; }}
-        .instructions {{ background: linear-gradient(135deg, #74b9ff, #0984e3); color: white; padding: 25px; border-radius: 15px; margin-bottom: 40px; }}
-        .instructions h3 {{ margin-top: 0; }}
-        .footer {{ margin-top: 50px; text-align: center; color: #7f8c8d; background: white; padding: 25px; border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }}
-        @media print {{ 
-            .qr-item {{ page-break-inside: avoid; margin-bottom: 20px; }}
-            .download-btn, .instructions {{ display: none; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
+GALLERY_HEADER = Template("""    <div class="header">
         <h1>🏨 La Strada Hotel - Master QR Codes Gallery</h1>
         <p>Complete collection of QR codes for all hotel locations</p>
-        <p><strong>Total Locations: {total_locations}</strong> | Generated: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        <p><strong>Total Locations: {total}</strong>{generated}</p>
     </div>
     
     <div class="stats">
                  <div class="stat-card rooms">
-             <div class="stat-number">{len(locations['room'])}</div>
+             <div class="stat-number">{rooms}</div>
              <div><strong>Hotel Rooms</strong></div>
              <div style="font-size: 14px; color: #7f8c8d; margin-top: 5px;">Room Service Orders</div>
          </div>
          <div class="stat-card restaurant">
-             <div class="stat-number">{len(locations['restaurant'])}</div>
+             <div class="stat-number">{restaurant}</div>
              <div><strong>Restaurant Tables</strong></div>
              <div style="font-size: 14px; color: #7f8c8d; margin-top: 5px;">Dine-in Orders</div>
          </div>
          <div class="stat-card garden">
-             <div class="stat-number">{len(locations['garden'])}</div>
+             <div class="stat-number">{garden}</div>
              <div><strong>Garden Tables</strong></div>
              <div style="font-size: 14px; color: #7f8c8d; margin-top: 5px;">Outdoor Dining</div>
          </div>
         <div class="stat-card total">
-            <div class="stat-number">{total_locations}</div>
+            <div class="stat-number">{total}</div>
             <div><strong>Total QR Codes</strong></div>
             <div style="font-size: 14px; color: #7f8c8d; margin-top: 5px;">Complete Coverage</div>
         </div>
@@ -209,54 +219,43 @@ def create_master_gallery(locations, output_dir):
             </div>
         </div>
     </div>
-"""
+""")
 
-    # Generate sections for each location type
-    section_configs = [
-        ('room', '🏨 Hotel Rooms', 'rooms'),
-        ('restaurant', '🍽️ Restaurant Tables', 'restaurant'), 
-        ('garden', '🌿 Garden Tables', 'garden')
-    ]
-    
-    for section_key, section_title, css_class in section_configs:
-        if locations[section_key]:
-            html_content += f"""
+GALLERY_SECTION = Template("""
     <div class="section {css_class}">
-        <div class="section-title">{section_title} ({len(locations[section_key])} locations)</div>
+        <div class="section-title">{title} ({count} locations)</div>
         <div class="gallery">
-"""
-            for location in locations[section_key]:
-                filename = f"qr-{location['location_id']}.png"
-                html_content += f"""
+{items}
+        </div>
+    </div>
+""")
+
+GALLERY_ITEM = Template("""
             <div class="qr-item">
-                <div class="location-title">{location['location_name']}</div>
-                <img src="{filename}" alt="QR Code for {location['location_name']}" onerror="this.style.display='none'; this.nextElementSibling.style.display='block';">
+                <div class="location-title">{location_name}</div>
+                {image}
                 <div style="display:none; color:#e74c3c; padding:20px;">QR Code Image Not Found</div>
-                <div class="token-info">Token: {location['token']}</div>
-                <div class="url-info">{location['qr_url']}</div>
+                <div class="token-info">Token: {token}</div>
+                <div class="url-info">{qr_url}</div>
                 <a href="{filename}" download class="download-btn">Download PNG</a>
             </div>
-"""
-            html_content += """
-        </div>
-    </div>
-"""
-    
-    html_content += f"""
+""")
+
+GALLERY_FOOTER = Template("""
     <div class="footer">
         <h3>🏨 La Strada Hotel Digital Menu System</h3>
         <p>Complete QR code solution for seamless guest experience</p>
         <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-top: 20px;">
                          <div>
-                 <strong>🏨 Hotel Rooms ({len(locations['room'])})</strong><br>
+                 <strong>🏨 Hotel Rooms ({rooms})</strong><br>
                  <small>Room service ordering with automatic room detection</small>
              </div>
              <div>
-                 <strong>🍽️ Restaurant Tables ({len(locations['restaurant'])})</strong><br>
+                 <strong>🍽️ Restaurant Tables ({restaurant})</strong><br>
                  <small>Dine-in ordering system for indoor dining</small>
              </div>
              <div>
-                 <strong>🌿 Garden Tables ({len(locations['garden'])})</strong><br>
+                 <strong>🌿 Garden Tables ({garden})</strong><br>
                  <small>Outdoor dining experience with table service</small>
              </div>
         </div>
@@ -265,12 +264,69 @@ def create_master_gallery(locations, output_dir):
         </p>
     </div>
 </body>
-</html>"""
+</html>""")
+
+IMAGE_ERROR = "onerror=\"this.style.display='none'; this.nextElementSibling.style.display='block';\""
+
+def gallery_image(location, filename):
+    """The card's <img>: the copied thumbnails when there are any, else the full PNG"""
+    alt = f"QR Code for {location['location_name']}"
+    if 'thumbnail_size' in location:
+        # The 1x thumbnail is exactly the size the page shows it at
+        width, height = location['thumbnail_size']
+        return thumbnail_img(filename, width, height, alt, IMAGE_ERROR)
+    return f'<img src="{filename}" alt="{alt}" {IMAGE_ERROR}>'
+
+# Location types in the order their sections appear in the gallery
+SECTION_CONFIGS = [
+    ('room', '🏨 Hotel Rooms', 'rooms'),
+    ('restaurant', '🍽️ Restaurant Tables', 'restaurant'),
+    ('garden', '🌿 Garden Tables', 'garden')
+]
+
+def create_master_gallery(locations, output_dir, deterministic=False, layout='flat'):
+    """Create a comprehensive HTML gallery of all QR codes"""
+    total_locations = sum(len(locations[cat]) for cat in locations)
+    counts = {
+        'rooms': len(locations['room']),
+        'restaurant': len(locations['restaurant']),
+        'garden': len(locations['garden']),
+        'total': total_locations,
+    }
+    
+    stylesheet = save_stylesheet(output_dir, deterministic)
+    parts = [
+        page_head("La Strada Hotel - Master QR Codes Gallery", 'rounded master-gallery', stylesheet),
+        GALLERY_HEADER.render(counts, generated=generated_suffix(deterministic)),
+    ]
+    
+    # Generate sections for each location type
+    for section_key, section_title, css_class in SECTION_CONFIGS:
+        if locations[section_key]:
+            parts.append(GALLERY_SECTION.render(
+                css_class=css_class,
+                title=section_title,
+                count=len(locations[section_key]),
+                items=GALLERY_ITEM.render_all(dict(location, filename=master_file(location, layout),
+                                                   image=gallery_image(location, master_file(location, layout)))
+                                              for location in locations[section_key]),
+            ))
+    
+    parts.append(GALLERY_FOOTER.render(counts))
     
-    with open(os.path.join(output_dir, "master-qr-gallery.html"), 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    write_text(os.path.join(output_dir, "master-qr-gallery.html"), ''.join(parts), deterministic)
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Combine all generated QR codes into one master gallery")
+    parser.add_argument('--deterministic', action='store_true',
+                        help="byte-reproducible output: no build time (unless SOURCE_DATE_EPOCH is set), "
+                             "stable PNG encoding, unchanged files left untouched and a master-qr-gallery/manifest.json")
+    add_layout_arg(parser)
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
     print("🏨 La Strada Hotel - Master QR Gallery Creator")
     print("=" * 60)
     
@@ -292,7 +348,7 @@ def main():
     
     # Copy QR code files
     print("\n📋 Copying QR code files...")
-    copied_files = copy_qr_files(locations, OUTPUT_DIR)
+    copied_files = copy_qr_files(locations, OUTPUT_DIR, args.deterministic, args.layout)
     
     print(f"   ✅ Rooms: {copied_files['room']}/{len(locations['room'])} files copied")
     print(f"   ✅ Restaurant: {copied_files['restaurant']}/{len(locations['restaurant'])} files copied")
@@ -300,7 +356,7 @@ def main():
     
     # Create master HTML gallery
     print("\n🌐 Creating master HTML gallery...")
-    create_master_gallery(locations, OUTPUT_DIR)
+    create_master_gallery(locations, OUTPUT_DIR, args.deterministic, args.layout)
     
     # Summary
     total_copied = sum(copied_files.values())
@@ -309,6 +365,9 @@ def main():
     print(f"✅ Successfully copied: {total_copied}/{total_locations} QR code files")
     print(f"📂 Master gallery: {OUTPUT_DIR}/")
     print(f"🌐 View gallery: {OUTPUT_DIR}/master-qr-gallery.html")
+
+    if args.deterministic:
+        print_manifest_summary(OUTPUT_DIR, *write_manifest(OUTPUT_DIR))
     
     print("\n📋 What you now have:")
     print(f"   📂 {OUTPUT_DIR}/ - All QR code PNG files")
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Fake ESC/POS Printer for La Strada Hotel
+Listens on TCP like the bar, kitchen and reception printers (port 9100),
+decodes and records every ESC/POS job, and prints them one at a time with
+a configurable delay and failure rate, so the print path can be load-tested
+without hardware (see scripts/print-load-test.py).
+
+Point print-service/server.js at it with:
+
+    PRINTER_HOSTS=127.0.0.1:9100,127.0.0.1:9101,127.0.0.1:9102 node server.js
+    python scripts/fake-escpos-printer.py --ports 9100,9101,9102
+
+A ticket's wait is the time from the service connecting to the printer
+finishing it; when it keeps growing, tickets are backing up. The service
+hands a ticket over and moves on, so its response times cannot show this:
+each printer's queue and recent ticket waits are served as JSON on
+http://127.0.0.1:9199/stats for print-load-test.py to read.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import signal
+import statistics
+import time
+from collections import deque
+
+# Configuration
+HOST = "127.0.0.1"
+PORTS = "9100"
+LATENCY_MS = 800
+READ_TIMEOUT = 10
+STATS_PORT = 9199
+# Finished tickets per printer kept for the stats endpoint
+RECENT_TICKETS = 2000
+
+ESC = 0x1B
+GS = 0x1D
+# Argument byte counts of the ESC / GS commands node-thermal-printer sends
+ESC_ARGS = {ord('@'): 0, ord('a'): 1, ord('E'): 1, ord('t'): 1, ord('B'): 2, ord('!'): 1, ord('d'): 1,
+            ord('-'): 1, ord('M'): 1, ord('2'): 0, ord('3'): 1, ord('R'): 1, ord('G'): 1, ord('{'): 1}
+GS_ARGS = {ord('!'): 1, ord('B'): 1, ord('L'): 2, ord('W'): 2, ord('h'): 1, ord('w'): 1, ord('H'): 1,
+           ord('f'): 1}
+CUT_FULL = (0x00, 0x30)
+CUT_WITH_FEED = (0x41, 0x42)
+
+def parse_escpos(data):
+    """Decode a job into its printed lines and command counts"""
+    job = {'lines': [], 'cuts': 0, 'beeps': 0, 'rasters': 0, 'raster_bytes': 0, 'commands': 0, 'unknown': 0}
+    line = bytearray()
+    i = 0
+    while i < len(data):
+        byte = data[i]
+        if byte == 0x0A:
+            job['lines'].append(line.decode('cp850', errors='replace'))
+            line.clear()
+            i += 1
+        elif byte == ESC and i + 1 < len(data):
+            command = data[i + 1]
+            job['commands'] += 1
+            if command == ord('B'):
+                job['beeps'] += 1
+            if command not in ESC_ARGS:
+                job['unknown'] += 1
+            i += 2 + ESC_ARGS.get(command, 1)
+        elif byte == GS and i + 1 < len(data):
+            command = data[i + 1]
+            job['commands'] += 1
+            if command == ord('V'):
+                # GS V m, or GS V m n for the feed-and-cut forms
+                job['cuts'] += 1
+                mode = data[i + 2] if i + 2 < len(data) else 0
+                i += 4 if mode in CUT_WITH_FEED else 3
+            elif command == ord('v') and i + 7 < len(data):
+                # GS v 0 m xL xH yL yH, then (xL + xH * 256) * (yL + yH * 256) raster bytes
+                width = data[i + 4] + data[i + 5] * 256
+                height = data[i + 6] + data[i + 7] * 256
+                job['rasters'] += 1
+                job['raster_bytes'] += width * height
+                i += 8 + width * height
+            else:
+                if command not in GS_ARGS:
+                    job['unknown'] += 1
+                i += 2 + GS_ARGS.get(command, 1)
+        elif byte == 0x0D:
+            i += 1
+        else:
+            line.append(byte)
+            i += 1
+    if line:
+        job['lines'].append(line.decode('cp850', errors='replace'))
+    return job
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class FakePrinter:
+    """One printer on one port: jobs are read as they arrive and printed in order"""
+
+    def __init__(self, port, args):
+        self.port = port
+        self.args = args
+        self.lock = asyncio.Lock()
+        self.queued = 0
+        self.max_queued = 0
+        self.jobs = 0
+        self.failed = 0
+        self.bytes = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.recent = deque(maxlen=RECENT_TICKETS)
+
+    async def handle(self, reader, writer):
+        connected = time.monotonic()
+        if random.random() < self.args.failure_rate:
+            # Drop the connection like a printer that is offline or out of paper
+            self.failed += 1
+            writer.transport.abort()
+            return
+        try:
+            data = await asyncio.wait_for(reader.read(), READ_TIMEOUT)
+        except asyncio.TimeoutError:
+            self.failed += 1
+            writer.close()
+            return
+        writer.close()
+        if not data:
+            return
+
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            async with self.lock:
+                delay = self.args.latency + random.uniform(0, self.args.jitter)
+                if self.args.bytes_per_second:
+                    delay += len(data) * 1000 / self.args.bytes_per_second
+                await asyncio.sleep(delay / 1000)
+                self.print_job(data, connected)
+        except asyncio.CancelledError:
+            # Stopped with tickets still queued; the final summary counts them
+            return
+
+    def print_job(self, data, connected):
+        """Count a finished ticket and log it"""
+        self.queued -= 1
+        self.jobs += 1
+        self.bytes += len(data)
+        wait = time.monotonic() - connected
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+        self.recent.append((round(time.time(), 3), round(wait, 3)))
+        job = parse_escpos(data)
+        self.record(data, job)
+        title = next((text.strip() for text in job['lines'] if text.strip().startswith("Siparis No")), "")
+        if not self.args.quiet:
+            print(f"  🧾 :{self.port} job {self.jobs} {title} - {len(data):,} bytes, {len(job['lines'])} lines, "
+                  f"{job['rasters']} rasters, {job['cuts']} cuts, waited {wait:.2f}s, {self.queued} queued")
+
+    def record(self, data, job):
+        """Keep the raw job and its decoded text under --record"""
+        if not self.args.record:
+            return
+        stem = os.path.join(self.args.record, f"printer-{self.port}-job-{self.jobs:05d}")
+        with open(stem + ".bin", 'wb') as f:
+            f.write(data)
+        with open(stem + ".txt", 'w', encoding='utf-8') as f:
+            f.write("\n".join(job['lines']) + "\n")
+
+    def stats(self):
+        """Queue and recent tickets as (finished at, wait seconds) pairs, for the stats endpoint"""
+        return {'port': self.port, 'queued': self.queued, 'max_queued': self.max_queued, 'jobs': self.jobs,
+                'failed': self.failed, 'bytes': self.bytes, 'recent': list(self.recent)}
+
+    def summary(self, elapsed):
+        rate = self.jobs * 60 / elapsed if elapsed else 0
+        text = (f"  🖨️  :{self.port} {self.jobs} printed ({rate:.1f}/min), {self.failed} failed, "
+                f"{self.bytes:,} bytes, {self.queued} queued (max {self.max_queued})")
+        if self.jobs:
+            # Percentiles over the last RECENT_TICKETS tickets; mean and max over the whole run
+            waits = [wait for _, wait in self.recent]
+            text += (f", ticket wait p50 {statistics.median(waits):.2f}s p95 {percentile(waits, 0.95):.2f}s "
+                     f"(last {len(waits)}), mean {self.total_wait / self.jobs:.2f}s max {self.max_wait:.2f}s")
+        return text
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Stand-in ESC/POS network printers for load-testing the print service")
+    parser.add_argument('--host', default=HOST, help=f"address to listen on (default: {HOST})")
+    parser.add_argument('--ports', default=PORTS,
+                        help=f"comma-separated ports, one fake printer each (default: {PORTS})")
+    parser.add_argument('--latency', type=float, default=LATENCY_MS, metavar='MS',
+                        help=f"time to print one ticket (default: {LATENCY_MS})")
+    parser.add_argument('--jitter', type=float, default=0, metavar='MS', help="random extra time per ticket, up to MS")
+    parser.add_argument('--bytes-per-second', type=float, default=0, metavar='N',
+                        help="also take len(job)/N seconds per ticket (default: no limit)")
+    parser.add_argument('--failure-rate', type=float, default=0, metavar='P',
+                        help="fraction of connections dropped without printing, 0-1 (default: 0)")
+    parser.add_argument('--record', metavar='DIR', help="save every job's raw bytes and decoded text here")
+    parser.add_argument('--report', type=float, default=30, metavar='SECONDS',
+                        help="print a summary this often, 0 for only at exit (default: 30)")
+    parser.add_argument('--stats-port', type=int, default=STATS_PORT,
+                        help=f"serve queue depth and ticket waits as JSON on this port, 0 to turn off "
+                             f"(default: {STATS_PORT})")
+    parser.add_argument('--quiet', action='store_true', help="no line per ticket, summaries only")
+    args = parser.parse_args()
+    if not 0 <= args.failure_rate <= 1:
+        parser.error("--failure-rate must be between 0 and 1")
+    return args
+
+async def serve_stats(printers, reader, writer):
+    """Answer any HTTP request with every printer's stats as JSON"""
+    try:
+        while (await asyncio.wait_for(reader.readline(), READ_TIMEOUT)).strip():
+            pass
+    except (asyncio.TimeoutError, ConnectionError):
+        writer.close()
+        return
+    body = json.dumps({'time': time.time(), 'printers': [printer.stats() for printer in printers]}).encode('utf-8')
+    writer.write(b"HTTP/1.0 200 OK\r\nContent-Type: application/json\r\n"
+                 + f"Content-Length: {len(body)}\r\n\r\n".encode('ascii') + body)
+    await writer.drain()
+    writer.close()
+
+async def serve(args):
+    printers = [FakePrinter(int(port), args) for port in args.ports.split(',')]
+    servers = [await asyncio.start_server(printer.handle, args.host, printer.port) for printer in printers]
+    started = time.monotonic()
+    for printer in printers:
+        print(f"🖨️  Listening on {args.host}:{printer.port}")
+    if args.stats_port:
+        servers.append(await asyncio.start_server(lambda reader, writer: serve_stats(printers, reader, writer),
+                                                  args.host, args.stats_port))
+        print(f"📊 Stats on http://{args.host}:{args.stats_port}/stats")
+    print(f"⏱️  {args.latency:.0f} ms per ticket (+ up to {args.jitter:.0f} ms), failure rate {args.failure_rate:.0%}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), args.report or None)
+        except asyncio.TimeoutError:
+            print(f"\n📊 After {time.monotonic() - started:.0f}s:")
+            for printer in printers:
+                print(printer.summary(time.monotonic() - started))
+
+    for server in servers:
+        server.close()
+    print("\n" + "=" * 60)
+    print(f"🛑 Stopped after {time.monotonic() - started:.0f}s")
+    for printer in printers:
+        print(printer.summary(time.monotonic() - started))
+
+def main():
+    args = parse_args()
+    print("🏨 La Strada Hotel - Fake ESC/POS Printer")
+    print("=" * 60)
+    if args.record:
+        os.makedirs(args.record, exist_ok=True)
+        print(f"📁 Recording jobs in: {args.record}/")
+    asyncio.run(serve(args))
+
+if __name__ == "__main__":
+    main()
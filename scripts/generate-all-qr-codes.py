@@ -2,14 +2,22 @@
 """
 Complete QR Code Generator for La Strada Hotel
 Generates QR codes for ALL locations: hotel rooms, restaurant tables, and garden tables.
+
+Locations stream through load -> filter -> sort -> encode -> write one at a
+time, so --max-memory bounds memory use even for a very large registry.
+With --watch it then keeps running and re-renders only the locations that
+change in data/tokens.json.
 """
 
-import json
+import argparse
 import os
 import sys
+import time
+from itertools import chain
 
 try:
-    import qrcode
+    from qr_render import (ERROR_CORRECTION, ERROR_CORRECTION_LEVELS, fit_version, plan_version,
+                           render_escpos, render_png, use_matrix_store)
 except ImportError:
     print("❌ Required library not installed!")
     print("📦 Please install it with:")
@@ -18,128 +26,112 @@ except ImportError:
     print("   pip3 install qrcode[pil]")
     sys.exit(1)
 
+from qr_output import (THUMBNAIL_DENSITIES, add_layout_arg, generated_suffix, layout_path, open_output,
+                       print_manifest_summary, thumbnail_file, write_manifest)
+from qr_payload import add_payload_arg, location_payload, print_payload_savings, token_url
+from qr_pipeline import external_sort, iter_registry, peak_rss_mb, run_size_for_budget
+from qr_progress import Progress, add_progress_args
+from qr_store import add_matrix_store_args, close_matrix_store, open_matrix_store
+from qr_templates import STYLESHEET_NAME, Template, page_head, thumbnail_img, write_stylesheet
+from qr_variants import render_thumbnails
+from qr_watch import FileWatcher
+
 # Configuration
 BASE_URL = "https://menu.theplazahoteledirne.com"
 OUTPUT_DIR = "all-qr-codes"
 TOKENS_FILE = "data/tokens.json"
+GALLERY_FILE = "all-qr-codes-gallery.html"
+# Size the gallery shows each code at (.qr-item img in the shared stylesheet)
+THUMBNAIL_SIZE = 200
+
+# Token type -> output folder, in gallery order
+CATEGORIES = {
+    'room': 'rooms',
+    'restaurant': 'restaurant',
+    'garden': 'garden',
+}
+CATEGORY_ORDER = list(CATEGORIES.values())
+SECTION_TITLES = {
+    'rooms': '🏨 Hotel Rooms',
+    'restaurant': '🍽️ Restaurant Tables',
+    'garden': '🌿 Garden Tables',
+}
 
 def load_tokens():
-    """Load tokens from JSON file"""
+    """Stream (key, entry) pairs from the tokens file"""
     try:
-        with open(TOKENS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        yield from iter_registry(TOKENS_FILE)
     except FileNotFoundError:
         print(f"❌ Error: {TOKENS_FILE} not found!")
         sys.exit(1)
-    except json.JSONDecodeError:
+    except ValueError:
         print(f"❌ Error: Invalid JSON in {TOKENS_FILE}")
         sys.exit(1)
 
-def get_all_locations(tokens):
-    """Extract all location data from tokens"""
-    locations = {
-        'rooms': [],
-        'restaurant': [],
-        'garden': []
-    }
-    
-    for key, data in tokens.items():
-        location_type = data.get('type')
-        if location_type in locations:
-            locations[location_type].append({
+def iter_locations(tokens, payload='url'):
+    """Turn token entries into location records, skipping unknown types"""
+    for key, data in tokens:
+        category = CATEGORIES.get(data.get('type'))
+        if category:
+            yield {
                 'location_id': key,
                 'location_name': data['name'],
                 'token': data['token'],
-                'qr_url': f"{BASE_URL}?token={data['token']}",
-                'type': location_type
-            })
-    
-    # Sort each category
-    def sort_key(item):
-        location_id = item['location_id']
-        # Handle numeric IDs (like S1, S10, B1, B10)
-        if location_id[1:].isdigit():
-            return (0, int(location_id[1:]))
-        # Handle alphanumeric IDs
-        return (1, location_id)
-    
-    for category in locations:
-        locations[category] = sorted(locations[category], key=sort_key)
-    
-    return locations
-
-def create_qr_code(url, output_path):
-    """Create a QR code image"""
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(url)
-    qr.make(fit=True)
-    
-    qr_img = qr.make_image(fill_color="black", back_color="white")
-    qr_img.save(output_path, 'PNG')
-    return True
+                'qr_url': location_payload(data['token'], BASE_URL, payload),
+                'type': data['type'],
+                'category': category,
+            }
 
-def create_html_gallery(locations, output_dir):
-    """Create an HTML gallery of all QR codes"""
-    total_locations = sum(len(locations[cat]) for cat in locations)
-    
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>La Strada Hotel - Complete QR Codes Gallery</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
-        .header {{ text-align: center; margin-bottom: 30px; background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }}
-        .stats {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 30px; }}
-        .stat-card {{ background: white; padding: 20px; border-radius: 10px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }}
-        .stat-number {{ font-size: 2em; font-weight: bold; margin-bottom: 10px; }}
-        .rooms .stat-number {{ color: #007bff; }}
-        .restaurant .stat-number {{ color: #28a745; }}
-        .garden .stat-number {{ color: #6f42c1; }}
-        .section {{ margin-bottom: 40px; }}
-        .section-title {{ font-size: 24px; font-weight: bold; margin-bottom: 20px; padding: 15px; background: white; border-radius: 10px; text-align: center; }}
-        .rooms .section-title {{ background: #e3f2fd; color: #1976d2; }}
-        .restaurant .section-title {{ background: #e8f5e8; color: #388e3c; }}
-        .garden .section-title {{ background: #f3e5f5; color: #7b1fa2; }}
-        .gallery {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 20px; }}
-        .qr-item {{ background: white; padding: 20px; border-radius: 10px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }}
-        .qr-item img {{ max-width: 200px; height: 200px; border: 1px solid #ddd; }}
-        .location-title {{ font-size: 18px; font-weight: bold; margin-bottom: 15px; color: #333; }}
-        .token-info {{ font-size: 12px; color: #666; margin: 10px 0; font-family: monospace; }}
-        .url-info {{ font-size: 11px; color: #888; margin: 10px 0; word-break: break-all; }}
-        .download-btn {{ display: inline-block; margin-top: 15px; padding: 10px 20px; background: #007bff; color: white; text-decoration: none; border-radius: 5px; }}
-        .download-btn:hover {{ background: #0056b3; }}
-        .instructions {{ background: #e7f3ff; padding: 20px; border-radius: 10px; margin-bottom: 30px; }}
-        @media print {{ 
-            .qr-item {{ page-break-inside: avoid; margin-bottom: 20px; }}
-            .download-btn {{ display: none; }}
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
+def sort_key(location):
+    """Gallery order: category, then numeric IDs (101, S1, B10) by number"""
+    location_id = location['location_id']
+    if location_id.isdigit():
+        order = (0, int(location_id))
+    elif location_id[1:].isdigit():
+        order = (1, int(location_id[1:]))
+    else:
+        order = (2, 0)
+    return (CATEGORY_ORDER.index(location['category']),) + order + (location_id,)
+
+def plan_batch(error_correction, payload='url'):
+    """First pass over the registry: count each category and plan the QR version
+
+    Also returns the version the plain ?token= URLs would need, to report
+    what an optimized payload form saves.
+    """
+    counts = dict.fromkeys(CATEGORY_ORDER, 0)
+    version = baseline = 1
+    for location in iter_locations(load_tokens(), payload):
+        counts[location['category']] += 1
+        version = max(version, fit_version(location['qr_url'], error_correction))
+        baseline = max(baseline, fit_version(token_url(location['token'], BASE_URL), error_correction))
+    return counts, version, baseline
+
+def create_qr_code(url, version=None, error_correction=ERROR_CORRECTION):
+    """Create a QR code image and return it as PNG bytes"""
+    return render_png(url, version=version, error_correction=error_correction)
+
+def create_escpos_blob(url, version=None, error_correction=ERROR_CORRECTION):
+    """Create the ESC/POS raster command the receipt printer needs for a QR code"""
+    return render_escpos(url, version=version, error_correction=error_correction)
+
+GALLERY_HEADER = Template("""    <div class="header">
         <h1>🏨 La Strada Hotel - Complete QR Codes</h1>
         <p>All QR codes for hotel rooms, restaurant tables, and garden tables</p>
-        <p>Total Locations: {total_locations} | Generated: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        <p>Total Locations: {total}{generated}</p>
     </div>
     
     <div class="stats">
         <div class="stat-card rooms">
-            <div class="stat-number">{len(locations['rooms'])}</div>
+            <div class="stat-number">{rooms}</div>
             <div>Hotel Rooms</div>
         </div>
         <div class="stat-card restaurant">
-            <div class="stat-number">{len(locations['restaurant'])}</div>
+            <div class="stat-number">{restaurant}</div>
             <div>Restaurant Tables</div>
         </div>
         <div class="stat-card garden">
-            <div class="stat-number">{len(locations['garden'])}</div>
+            <div class="stat-number">{garden}</div>
             <div>Garden Tables</div>
         </div>
     </div>
@@ -155,39 +147,32 @@ def create_html_gallery(locations, output_dir):
         </ul>
         <p><strong>💡 Tip:</strong> Cut out each QR code and place it in the corresponding location. Consider laminating for durability!</p>
     </div>
-"""
+""")
 
-    # Generate sections for each location type
-    section_configs = [
-        ('rooms', '🏨 Hotel Rooms', 'rooms'),
-        ('restaurant', '🍽️ Restaurant Tables', 'restaurant'), 
-        ('garden', '🌿 Garden Tables', 'garden')
-    ]
-    
-    for section_key, section_title, css_class in section_configs:
-        if locations[section_key]:
-            html_content += f"""
-    <div class="section {css_class}">
-        <div class="section-title">{section_title} ({len(locations[section_key])} locations)</div>
+def gallery_header(counts, deterministic=False, stylesheet=STYLESHEET_NAME):
+    """HTML from the top of the gallery down to the first section"""
+    return page_head("La Strada Hotel - Complete QR Codes Gallery", 'complete-gallery', stylesheet) + GALLERY_HEADER.render(
+        counts,
+        total=sum(counts.values()),
+        generated=generated_suffix(deterministic),
+    )
+
+GALLERY_SECTION_START = Template("""
+    <div class="section {category}">
+        <div class="section-title">{title} ({count} locations)</div>
         <div class="gallery">
-"""
-            for location in locations[section_key]:
-                filename = f"qr-{location['location_id']}.png"
-                html_content += f"""
-            <div class="qr-item">
-                <div class="location-title">{location['location_name']}</div>
-                <img src="{filename}" alt="QR Code for {location['location_name']}">
-                <div class="token-info">Token: {location['token']}</div>
-                <div class="url-info">{location['qr_url']}</div>
-                <a href="{filename}" download class="download-btn">Download PNG</a>
-            </div>
-"""
-            html_content += """
+""")
+
+def gallery_section_start(category, count):
+    """Opening HTML of one category section"""
+    return GALLERY_SECTION_START.render(category=category, title=SECTION_TITLES[category], count=count)
+
+GALLERY_SECTION_END = """
         </div>
     </div>
 """
-    
-    html_content += """
+
+GALLERY_FOOTER = """
     <div style="margin-top: 40px; text-align: center; color: #666; background: white; padding: 20px; border-radius: 10px;">
         <h3>🏨 La Strada Hotel Digital Menu System</h3>
         <p>Each QR code links directly to the menu with automatic location detection</p>
@@ -197,97 +182,337 @@ def create_html_gallery(locations, output_dir):
     </div>
 </body>
 </html>"""
-    
-    with open(os.path.join(output_dir, "all-qr-codes-gallery.html"), 'w', encoding='utf-8') as f:
-        f.write(html_content)
+
+GALLERY_ITEM = Template("""
+            <div class="qr-item">
+                <div class="location-title">{location_name}</div>
+                {image}
+                <div class="token-info">Token: {token}</div>
+                <div class="url-info">{qr_url}</div>
+                <a href="{filename}" download class="download-btn">Download PNG</a>
+            </div>
+""")
+
+def category_file(location, extension, layout='flat'):
+    """A location's file in its category folder (and shard, in the sharded layout)"""
+    return layout_path(f"qr-{location['location_id']}.{extension}", location['location_id'],
+                       location['category'], layout)
+
+def gallery_file(location, category_paths=False, layout='flat'):
+    """The PNG the gallery links for a location
+
+    With category_paths it is the one in its category folder (rooms/,
+    restaurant/, garden/) instead of the top-level copy.
+    """
+    if category_paths:
+        return category_file(location, 'png', layout)
+    return f"qr-{location['location_id']}.png"
+
+def gallery_item(location, category_paths=False, layout='flat'):
+    """HTML card for one QR code: exact-size thumbnails, the full PNG behind the download button"""
+    filename = gallery_file(location, category_paths, layout)
+    image = thumbnail_img(filename, THUMBNAIL_SIZE, THUMBNAIL_SIZE, f"QR Code for {location['location_name']}")
+    return GALLERY_ITEM.render(location, filename=filename, image=image)
+
+def write_gallery(output, locations, counts, deterministic=False, category_paths=False, on_location=None,
+                  layout='flat'):
+    """Stream the gallery page for locations already in sort_key order
+
+    on_location(location, index, count) is called before each card is
+    written, with the location's 1-based index within its category.
+    """
+    stylesheet = write_stylesheet(output)
+    with output.open_text(GALLERY_FILE) as gallery:
+        gallery.write(gallery_header(counts, deterministic, stylesheet))
+        category = None
+        for location in locations:
+            if location['category'] != category:
+                if category:
+                    gallery.write(GALLERY_SECTION_END)
+                category = location['category']
+                i = 0
+                gallery.write(gallery_section_start(category, counts[category]))
+            i += 1
+            if on_location:
+                on_location(location, i, counts[category])
+            gallery.write(gallery_item(location, category_paths, layout))
+        if category:
+            gallery.write(GALLERY_SECTION_END)
+        gallery.write(GALLERY_FOOTER)
+
+def has_top_level_copies(args):
+    """Only a flat folder run keeps a second copy of each PNG next to the gallery"""
+    return not args.archive and args.layout == 'flat'
+
+def location_files(location, args):
+    """Relative paths a folder run writes for one location"""
+    paths = [category_file(location, 'png', args.layout)]
+    if has_top_level_copies(args):
+        paths.insert(0, f"qr-{location['location_id']}.png")
+    if not args.no_escpos:
+        paths.append(category_file(location, 'escpos', args.layout))
+    thumbnail_of = gallery_file(location, not has_top_level_copies(args), args.layout)
+    paths.extend(thumbnail_file(thumbnail_of, density) for density in THUMBNAIL_DENSITIES)
+    return paths
+
+def write_location(output, location, version, args):
+    """Render one location and write its PNG(s) and receipt printer blob"""
+    png = create_qr_code(location['qr_url'], version, args.error_correction)
+    if has_top_level_copies(args):
+        # Top-level copy used by the gallery
+        output.write(f"qr-{location['location_id']}.png", png)
+    # Category-specific folder
+    output.write(category_file(location, 'png', args.layout), png)
+    # Gallery thumbnails at the size the page shows them
+    thumbnail_of = gallery_file(location, not has_top_level_copies(args), args.layout)
+    for density, thumbnail in render_thumbnails(location['qr_url'], THUMBNAIL_SIZE, args.error_correction, version):
+        output.write(thumbnail_file(thumbnail_of, density), thumbnail)
+    if not args.no_escpos:
+        # Ready-to-send raster for print-service/server.js
+        blob = create_escpos_blob(location['qr_url'], version, args.error_correction)
+        output.write(category_file(location, 'escpos', args.layout), blob)
+
+def read_snapshot(payload='url'):
+    """Return {location_id: location} for the whole registry (used by --watch)"""
+    return {location['location_id']: location
+            for location in iter_locations(iter_registry(TOKENS_FILE), payload)}
+
+def diff_snapshots(previous, current):
+    """Return sorted (added, changed, removed) location IDs between two snapshots"""
+    added = sorted(current.keys() - previous.keys())
+    removed = sorted(previous.keys() - current.keys())
+    changed = sorted(key for key in current.keys() & previous.keys() if current[key] != previous[key])
+    return added, changed, removed
+
+def category_counts(snapshot):
+    counts = dict.fromkeys(CATEGORY_ORDER, 0)
+    for location in snapshot.values():
+        counts[location['category']] += 1
+    return counts
+
+def sync_changes(output, snapshot, current, version, args, progress):
+    """Bring the folder from snapshot to current; returns the (possibly new) QR version"""
+    added, changed, removed = diff_snapshots(snapshot, current)
+    if not (added or changed or removed):
+        return version
+    started = time.monotonic()
+
+    # A longer URL can need a bigger version; then every code is redone so they stay one size
+    new_version = plan_version((location['qr_url'] for location in current.values()), args.error_correction)
+    if new_version != version:
+        print(f"📐 QR version {version} -> {new_version}: re-rendering all {len(current)} codes")
+        render_ids = sorted(current)
+    else:
+        render_ids = added + changed
+
+    # Delete files that no longer belong to any location (removed, or moved category)
+    deleted = 0
+    for location_id in removed + changed:
+        keep = set(location_files(current[location_id], args)) if location_id in current else set()
+        for path in location_files(snapshot[location_id], args):
+            if path not in keep and output.remove(path):
+                deleted += 1
+
+    failed = 0
+    for location_id in render_ids:
+        location = current[location_id]
+        try:
+            write_location(output, location, new_version, args)
+        except Exception as e:
+            failed += 1
+            print(f"  ❌ {location['location_name']} -> Error: {e}")
+            progress.emit('error', item=location_id, error=str(e))
+
+    write_gallery(output, sorted(current.values(), key=sort_key), category_counts(current), args.deterministic,
+                  category_paths=not has_top_level_copies(args), layout=args.layout)
+    if args.deterministic:
+        write_manifest(OUTPUT_DIR)
+
+    elapsed = time.monotonic() - started
+    print(f"🔄 {len(added)} added, {len(changed)} changed, {len(removed)} removed -> "
+          f"{len(render_ids) - failed} rendered, {deleted} files deleted ({elapsed * 1000:.0f} ms)")
+    for location_id in added + changed:
+        progress.say(f"   ✅ {current[location_id]['location_name']}")
+    for location_id in removed:
+        progress.say(f"   ➖ {snapshot[location_id]['location_name']}")
+    progress.emit('sync', added=added, changed=changed, removed=removed, rendered=len(render_ids) - failed,
+                  failed=failed, deleted=deleted, version=new_version, elapsed=round(elapsed, 3))
+    return new_version
+
+def watch_registry(output, snapshot, version, watcher, args, progress):
+    """Re-render changed locations each time tokens.json is saved, until Ctrl+C"""
+    print(f"\n👀 Watching {TOKENS_FILE} for changes ({watcher.backend})")
+    print("⏹️  Press Ctrl+C to stop")
+    progress.stage('watch', backend=watcher.backend)
+    try:
+        # The first pass catches up on edits made while the full run was rendering
+        for _ in chain([TOKENS_FILE], watcher):
+            try:
+                current = read_snapshot(args.payload)
+            except (OSError, ValueError) as e:
+                # Usually a half-saved file; the next save triggers another pass
+                print(f"⚠️  Could not read {TOKENS_FILE} ({e}) - keeping the current codes")
+                continue
+            version = sync_changes(output, snapshot, current, version, args, progress)
+            snapshot = current
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching")
+    finally:
+        watcher.close()
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Generate QR codes for all hotel locations")
+    parser.add_argument('--deterministic', action='store_true',
+                        help="byte-reproducible output: no build time (unless SOURCE_DATE_EPOCH is set), "
+                             "stable PNG encoding, unchanged files left untouched and a manifest.json")
+    parser.add_argument('--archive', metavar='PATH',
+                        help="write every code and the gallery into one .zip/.tar/.tar.gz file "
+                             "(with category folders inside) instead of the all-qr-codes folder")
+    parser.add_argument('--no-escpos', action='store_true',
+                        help="skip the qr-<id>.escpos receipt printer blobs next to the category PNGs")
+    add_layout_arg(parser)
+    add_payload_arg(parser)
+    parser.add_argument('--error-correction', choices=sorted(ERROR_CORRECTION_LEVELS), default=ERROR_CORRECTION,
+                        help=f"QR error correction level (default: {ERROR_CORRECTION}); every code is encoded "
+                             "at the smallest version that fits the longest URL at this level")
+    parser.add_argument('--max-memory', type=int, metavar='MB',
+                        help="memory budget; locations are sorted in runs that fit it and the runs are "
+                             "spilled to temporary files (default: sort everything in memory)")
+    parser.add_argument('--watch', action='store_true',
+                        help="after the full run, keep watching data/tokens.json and re-render only "
+                             "the locations that are added, changed or removed (Ctrl+C to stop)")
+    add_matrix_store_args(parser)
+    add_progress_args(parser)
+    args = parser.parse_args()
+    if args.watch and args.archive:
+        parser.error("--watch updates the all-qr-codes folder in place and cannot be combined with --archive")
+    return args
 
 def main():
+    args = parse_args()
+    progress = Progress(args.quiet, args.events)
+    store = open_matrix_store(args)
+    use_matrix_store(store)
     print("🏨 La Strada Hotel - Complete QR Code Generator")
     print("=" * 60)
     
-    # Load tokens
-    print("📖 Loading location data...")
-    tokens = load_tokens()
-    locations = get_all_locations(tokens)
-    
-    # Display summary
-    total_locations = sum(len(locations[cat]) for cat in locations)
+    # Pass 1: count locations and plan one QR version so every code prints the same size
+    print("📖 Scanning location data...")
+    progress.stage('plan')
+    counts, version, baseline = plan_batch(args.error_correction, args.payload)
+    progress.emit('planned', counts=counts, version=version, error_correction=args.error_correction,
+                  payload=args.payload)
+    total_locations = sum(counts.values())
     print(f"✅ Found {total_locations} total locations:")
-    print(f"   🏨 Hotel Rooms: {len(locations['rooms'])}")
-    print(f"   🍽️  Restaurant Tables: {len(locations['restaurant'])}")
-    print(f"   🌿 Garden Tables: {len(locations['garden'])}")
+    print(f"   🏨 Hotel Rooms: {counts['rooms']}")
+    print(f"   🍽️  Restaurant Tables: {counts['restaurant']}")
+    print(f"   🌿 Garden Tables: {counts['garden']}")
+    modules = version * 4 + 17
+    print(f"📐 QR version {version} for all codes ({modules}x{modules} modules, error correction {args.error_correction})")
+    print_payload_savings(args.payload, version, baseline)
     
-    # Create output directory
+    run_size = run_size_for_budget(args.max_memory, store.memory_limit_mb if store else 0)
+    if run_size:
+        print(f"🧮 Memory budget {args.max_memory} MB: sorting in runs of {run_size:,} locations")
+        if store:
+            print(f"   🗜️  Matrix store spills new codes to disk every {store.pending_limit:,} codes")
+    
+    # Create output directory or archive
     output_dir = OUTPUT_DIR
-    os.makedirs(output_dir, exist_ok=True)
-    print(f"📁 Output directory: {output_dir}")
+    output = open_output(output_dir, args.archive, args.deterministic)
+    print(f"📁 Output: {args.archive or output_dir}")
     
-    # Generate QR codes for all locations
+    # Pass 2: load -> filter -> sort -> encode -> write, one location at a time
     print(f"\n🎨 Generating {total_locations} QR code images...")
+    progress.stage('render', total_locations)
     success_count = 0
     total_count = 0
+    sort_stats = {}
+    locations = external_sort(iter_locations(load_tokens(), args.payload), sort_key, run_size, sort_stats)
     
-    for category, items in locations.items():
-        if items:
-            print(f"\n📍 {category.title()}:")
-            for i, location in enumerate(items, 1):
-                total_count += 1
-                filename = f"qr-{location['location_id']}.png"
-                output_path = os.path.join(output_dir, filename)
-                
-                try:
-                    create_qr_code(location['qr_url'], output_path)
-                    print(f"  ✅ {i:2d}/{len(items)} - {location['location_name']} -> {filename}")
-                    success_count += 1
-                except Exception as e:
-                    print(f"  ❌ {i:2d}/{len(items)} - {location['location_name']} -> Error: {e}")
+    # Watch mode starts from exactly what this run rendered
+    watcher = FileWatcher(TOKENS_FILE) if args.watch else None
+    rendered = {}
     
-    # Create HTML gallery
-    print("\n🌐 Creating HTML gallery...")
-    create_html_gallery(locations, output_dir)
+    def render(location, i, count):
+        nonlocal success_count, total_count
+        if i == 1:
+            progress.say(f"\n📍 {location['category'].title()}:")
+        total_count += 1
+        if watcher:
+            rendered[location['location_id']] = location
+        try:
+            write_location(output, location, version, args)
+            progress.advance(f"  ✅ {i:2d}/{count} - {location['location_name']} -> qr-{location['location_id']}.png")
+            success_count += 1
+        except Exception as e:
+            progress.fail(location['location_id'], e,
+                          f"  ❌ {i:2d}/{count} - {location['location_name']} -> Error: {e}")
     
-    # Create separate directories for each type
-    for category in locations:
-        if locations[category]:
-            category_dir = os.path.join(output_dir, category)
-            os.makedirs(category_dir, exist_ok=True)
-            
-            # Copy QR codes to category-specific folders
-            for location in locations[category]:
-                filename = f"qr-{location['location_id']}.png"
-                src_path = os.path.join(output_dir, filename)
-                dst_path = os.path.join(category_dir, filename)
-                
-                if os.path.exists(src_path):
-                    import shutil
-                    shutil.copy2(src_path, dst_path)
+    with output:
+        write_gallery(output, locations, counts, args.deterministic,
+                      category_paths=not has_top_level_copies(args), on_location=render, layout=args.layout)
     
     # Summary
     print("\n" + "=" * 60)
     print("🎉 QR Code generation complete!")
     print(f"✅ Successfully generated: {success_count}/{total_count} QR codes")
-    print(f"📂 Files saved in: {output_dir}/")
-    print(f"🌐 View gallery: {output_dir}/all-qr-codes-gallery.html")
+    if args.archive:
+        print(f"📦 Archive: {args.archive} ({output.count} files, {os.path.getsize(args.archive):,} bytes)")
+        print(f"🌐 Gallery inside the archive: {GALLERY_FILE}")
+    else:
+        print(f"📂 Files saved in: {output_dir}/")
+        print(f"🌐 View gallery: {output_dir}/{GALLERY_FILE}")
     
+    shards = "<xx>/" if args.layout == 'sharded' else ""
     print(f"\n📁 Organized folders:")
-    print(f"   📂 {output_dir}/rooms/ - Hotel room QR codes")
-    print(f"   📂 {output_dir}/restaurant/ - Restaurant table QR codes") 
-    print(f"   📂 {output_dir}/garden/ - Garden table QR codes")
+    print(f"   📂 {args.archive or output_dir}/rooms/{shards} - Hotel room QR codes")
+    print(f"   📂 {args.archive or output_dir}/restaurant/{shards} - Restaurant table QR codes") 
+    print(f"   📂 {args.archive or output_dir}/garden/{shards} - Garden table QR codes")
+    if not args.no_escpos:
+        print("   🧾 qr-<id>.escpos next to each PNG - receipt printer QR for print-service")
+    print(f"   🖼️  thumbs/1x/, thumbs/2x/ - {THUMBNAIL_SIZE}px gallery thumbnails (full PNGs only behind Download)")
+    if args.layout == 'sharded':
+        print("   🗂️  <xx> = first two hex digits of the SHA-256 of the location ID")
+
+    peak = peak_rss_mb()
+    if peak is not None:
+        spilled = f", {sort_stats['spilled_runs']} sort runs spilled to disk" if sort_stats['spilled_runs'] else ""
+        print(f"📈 Peak memory: {peak:.0f} MB{spilled}")
+
+    if not watcher:
+        close_matrix_store(store)
+
+    if args.deterministic and not args.archive:
+        progress.stage('manifest')
+        print_manifest_summary(output_dir, *write_manifest(output_dir))
     
-    print("\n📋 Next steps:")
-    print("1. Open all-qr-codes-gallery.html in your browser")
-    print("2. Print the page or download individual images")
-    print("3. Distribute QR codes to their respective locations")
-    print("4. Test with your phone camera")
+    if not args.quiet and not args.watch:
+        print("\n📋 Next steps:")
+        print("1. Open all-qr-codes-gallery.html in your browser")
+        print("2. Print the page or download individual images")
+        print("3. Distribute QR codes to their respective locations")
+        print("4. Test with your phone camera")
     
     if success_count < total_count:
         print(f"\n⚠️  Warning: {total_count - success_count} QR codes failed to generate")
-    else:
+    elif not args.quiet:
         print(f"\n🎊 Perfect! All {success_count} QR codes generated successfully!")
         print("\n🏨 Your hotel now has complete QR coverage:")
         print("   ✅ All hotel rooms")
         print("   ✅ All restaurant tables") 
         print("   ✅ All garden tables")
+    
+    if watcher:
+        try:
+            watch_registry(output, rendered, version, watcher, args, progress)
+        finally:
+            # Saved only now so codes encoded for tokens edited while watching are kept too
+            close_matrix_store(store)
+    
+    progress.finish(generated=success_count, failed=total_count - success_count,
+                    output=args.archive or output_dir, peak_rss_mb=peak and round(peak, 1))
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
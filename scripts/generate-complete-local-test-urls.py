@@ -6,11 +6,23 @@ Generates an HTML file with ALL test URLs for local development testing.
 
 import json
 import os
+import re
+
+from qr_templates import STYLESHEET_NAME, Template, page_head, save_stylesheet
 
 # Configuration
 LOCAL_URL = "http://localhost:3000"
 TOKENS_FILE = "data/tokens.json"
 OUTPUT_FILE = "complete-local-test-urls.html"
+SEARCH_PREFIX_LENGTH = 3
+SEARCH_DEBOUNCE_MS = 80
+
+# Location types in the order their sections appear on the page
+SECTION_CONFIGS = [
+    ('room', '🏨 Hotel Rooms', 'rooms'),
+    ('restaurant', '🍽️ Restaurant Tables', 'restaurant'),
+    ('garden', '🌿 Garden Tables', 'garden')
+]
 
 def load_tokens():
     """Load tokens from JSON file"""
@@ -59,174 +71,51 @@ def get_all_locations(tokens):
     
     return locations
 
-def create_complete_test_html(locations):
-    """Create comprehensive HTML with all test URLs"""
-    total_locations = sum(len(locations[cat]) for cat in locations)
-    
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>La Strada Hotel - Complete Local Test URLs</title>
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            margin: 20px;
-            background: #f5f5f5;
-        }}
-        .header {{
-            text-align: center;
-            margin-bottom: 30px;
-            background: white;
-            padding: 30px;
-            border-radius: 15px;
-            box-shadow: 0 4px 10px rgba(0,0,0,0.1);
-        }}
-        .stats {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .stat-card {{
-            background: white;
-            padding: 20px;
-            border-radius: 15px;
-            text-align: center;
-            box-shadow: 0 4px 10px rgba(0,0,0,0.1);
-        }}
-        .stat-number {{
-            font-size: 2em;
-            font-weight: bold;
-            margin-bottom: 10px;
-        }}
-        .rooms .stat-number {{ color: #3498db; }}
-        .restaurant .stat-number {{ color: #27ae60; }}
-        .garden .stat-number {{ color: #9b59b6; }}
-        .total .stat-number {{ color: #e74c3c; }}
-        .alert {{
-            background: #d4edda;
-            border: 1px solid #c3e6cb;
-            color: #155724;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 30px;
-        }}
-        .test-sections {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
-            gap: 30px;
-        }}
-        .test-section {{
-            background: white;
-            padding: 25px;
-            border-radius: 15px;
-            box-shadow: 0 4px 10px rgba(0,0,0,0.1);
-        }}
-        .section-title {{
-            font-size: 24px;
-            font-weight: bold;
-            margin-bottom: 20px;
-            padding: 15px;
-            border-radius: 10px;
-            text-align: center;
-        }}
-        .rooms .section-title {{
-            background: linear-gradient(135deg, #3498db, #2980b9);
-            color: white;
-        }}
-        .restaurant .section-title {{
-            background: linear-gradient(135deg, #27ae60, #229954);
-            color: white;
-        }}
-        .garden .section-title {{
-            background: linear-gradient(135deg, #9b59b6, #8e44ad);
-            color: white;
-        }}
-        .test-links {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
-            gap: 10px;
-        }}
-        .test-link {{
-            display: block;
-            padding: 12px 15px;
-            background: #007bff;
-            color: white;
-            text-decoration: none;
-            border-radius: 8px;
-            transition: background 0.3s;
-            text-align: center;
-            font-weight: 500;
-        }}
-        .test-link:hover {{
-            background: #0056b3;
-            transform: translateY(-2px);
-        }}
-        .token-display {{
-            font-size: 10px;
-            color: rgba(255,255,255,0.8);
-            font-family: monospace;
-            margin-top: 5px;
-        }}
-        .search-box {{
-            background: white;
-            padding: 20px;
-            border-radius: 15px;
-            margin-bottom: 30px;
-            box-shadow: 0 4px 10px rgba(0,0,0,0.1);
-        }}
-        .search-input {{
-            width: 100%;
-            padding: 12px;
-            border: 2px solid #ddd;
-            border-radius: 8px;
-            font-size: 16px;
-        }}
-        .search-input:focus {{
-            border-color: #007bff;
-            outline: none;
-        }}
-        .server-status {{
-            display: inline-block;
-            padding: 8px 16px;
-            border-radius: 20px;
-            font-weight: bold;
-            margin-left: 10px;
-        }}
-        .server-running {{
-            background: #d4edda;
-            color: #155724;
-        }}
-        .server-stopped {{
-            background: #f8d7da;
-            color: #721c24;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
+def normalize_search_words(text):
+    """Lowercase text and split it into the words the search box matches on"""
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+def build_search_index(locations):
+    """Precompute the search lookup embedded in the page
+
+    Links are numbered in page order. 'words' holds each link's normalized
+    id/name words and 'buckets' maps every word prefix up to
+    SEARCH_PREFIX_LENGTH characters to the links that have it, so a
+    keystroke only looks at the links in one bucket instead of the whole DOM.
+    """
+    words = []
+    buckets = {}
+    for section_key, _, _ in SECTION_CONFIGS:
+        for location in locations[section_key]:
+            index = len(words)
+            location_words = sorted(set(normalize_search_words(f"{location['location_id']} {location['location_name']}")))
+            words.append(location_words)
+            prefixes = {word[:length] for word in location_words for length in range(1, min(len(word), SEARCH_PREFIX_LENGTH) + 1)}
+            for prefix in sorted(prefixes):
+                buckets.setdefault(prefix, []).append(index)
+    return {'prefixLength': SEARCH_PREFIX_LENGTH, 'words': words, 'buckets': buckets}
+
+PAGE_BODY = Template("""    <div class="header">
         <h1>🧪 La Strada Hotel - Complete Local Test URLs</h1>
-        <p>All {total_locations} test URLs for your localhost:3000 server</p>
+        <p>All {total} test URLs for your localhost:3000 server</p>
         <p><strong>Server Status:</strong> <span id="server-status" class="server-status">Checking...</span></p>
     </div>
 
     <div class="stats">
         <div class="stat-card rooms">
-            <div class="stat-number">{len(locations['room'])}</div>
+            <div class="stat-number">{rooms}</div>
             <div><strong>Hotel Rooms</strong></div>
         </div>
         <div class="stat-card restaurant">
-            <div class="stat-number">{len(locations['restaurant'])}</div>
+            <div class="stat-number">{restaurant}</div>
             <div><strong>Restaurant Tables</strong></div>
         </div>
         <div class="stat-card garden">
-            <div class="stat-number">{len(locations['garden'])}</div>
+            <div class="stat-number">{garden}</div>
             <div><strong>Garden Tables</strong></div>
         </div>
         <div class="stat-card total">
-            <div class="stat-number">{total_locations}</div>
+            <div class="stat-number">{total}</div>
             <div><strong>Total Test URLs</strong></div>
         </div>
     </div>
@@ -243,57 +132,30 @@ def create_complete_test_html(locations):
     </div>
 
     <div class="search-box">
-        <input type="text" id="search-input" class="search-input" placeholder="🔍 Search for room number or table (e.g., 101, S1, B5)..." onkeyup="filterLinks()">
+        <input type="text" id="search-input" class="search-input" placeholder="🔍 Search for room number or table (e.g., 101, S1, B5)..." autocomplete="off">
     </div>
 
     <div class="test-sections">
-"""
-
-    # Generate sections for each location type
-    section_configs = [
-        ('room', '🏨 Hotel Rooms', 'rooms'),
-        ('restaurant', '🍽️ Restaurant Tables', 'restaurant'), 
-        ('garden', '🌿 Garden Tables', 'garden')
-    ]
-    
-    for section_key, section_title, css_class in section_configs:
-        if locations[section_key]:
-            html_content += f"""
-        <div class="test-section {css_class}">
-            <div class="section-title">{section_title} ({len(locations[section_key])} locations)</div>
-            <div class="test-links">
-"""
-            for location in locations[section_key]:
-                html_content += f"""
-                <a href="{location['qr_url']}" target="_blank" class="test-link" data-search="{location['location_id'].lower()} {location['location_name'].lower()}">
-                    {location['location_name']}
-                    <div class="token-display">{location['location_id']}</div>
-                </a>
-"""
-            html_content += """
-            </div>
-        </div>
-"""
-    
-    html_content += f"""
+{sections}
     </div>
 
     <div style="margin-top: 40px; text-align: center; color: #7f8c8d; background: white; padding: 25px; border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1);">
         <h3>🧪 Complete Local Development Testing</h3>
-        <p>All {total_locations} test URLs for comprehensive testing of your QR access system.</p>
+        <p>All {total} test URLs for comprehensive testing of your QR access system.</p>
         <p><strong>Expected Flow:</strong> Click link → Language selection → Menu → Add items → Cart → Checkout</p>
         <p><strong>Check:</strong> Location should be automatically detected and displayed in cart/checkout</p>
         <div style="margin-top: 20px; font-size: 14px;">
-            <strong>Coverage:</strong> {len(locations['room'])} Rooms | {len(locations['restaurant'])} Restaurant Tables | {len(locations['garden'])} Garden Tables
+            <strong>Coverage:</strong> {rooms} Rooms | {restaurant} Restaurant Tables | {garden} Garden Tables
         </div>
     </div>
 
+    <script id="search-index" type="application/json">{search_index}</script>
     <script>
         // Check if server is running
         async function checkServer() {{
             const statusElement = document.getElementById('server-status');
             try {{
-                const response = await fetch('{LOCAL_URL}', {{ mode: 'no-cors' }});
+                const response = await fetch('{local_url}', {{ mode: 'no-cors' }});
                 statusElement.textContent = '✅ Server is running';
                 statusElement.className = 'server-status server-running';
             }} catch (error) {{
@@ -302,21 +164,61 @@ def create_complete_test_html(locations):
             }}
         }}
 
-        // Filter test links based on search
+        // Precomputed search lookup (see build_search_index in the generator)
+        const searchIndex = JSON.parse(document.getElementById('search-index').textContent);
+        const searchLinks = searchIndex.words.map((_, i) => document.getElementById('loc-' + i));
+        const allLinks = searchLinks.map((_, i) => i);
+        let visibleLinks = null;
+        let filterTimer = null;
+
+        function matchingLinks(searchTerm) {{
+            const words = searchTerm.toLowerCase().match(/[a-z0-9]+/g);
+            if (!words) return null;
+
+            let matches = null;
+            for (const word of words) {{
+                const bucket = searchIndex.buckets[word.slice(0, searchIndex.prefixLength)] || [];
+                const hits = word.length > searchIndex.prefixLength
+                    ? bucket.filter(i => searchIndex.words[i].some(w => w.startsWith(word)))
+                    : bucket;
+                matches = new Set(matches ? hits.filter(i => matches.has(i)) : hits);
+                if (matches.size === 0) break;
+            }}
+            return matches;
+        }}
+
+        function setVisible(indices, visible) {{
+            for (const i of indices) {{
+                searchLinks[i].style.display = visible ? 'block' : 'none';
+            }}
+        }}
+
+        // Filter test links based on search, touching only the links that appear or disappear
+        // (null means no filter: every link is visible)
         function filterLinks() {{
-            const searchTerm = document.getElementById('search-input').value.toLowerCase();
-            const links = document.querySelectorAll('.test-link');
-            
-            links.forEach(link => {{
-                const searchData = link.getAttribute('data-search');
-                if (searchData.includes(searchTerm)) {{
-                    link.style.display = 'block';
-                }} else {{
-                    link.style.display = 'none';
-                }}
-            }});
+            const matches = matchingLinks(document.getElementById('search-input').value);
+            const previous = visibleLinks;
+            visibleLinks = matches;
+
+            if (previous === null && matches === null) return;
+            if (previous === null) {{
+                // Everything was showing: every link outside the matches changes
+                setVisible(allLinks.filter(i => !matches.has(i)), false);
+                return;
+            }}
+            if (matches === null) {{
+                setVisible(allLinks.filter(i => !previous.has(i)), true);
+                return;
+            }}
+            setVisible([...previous].filter(i => !matches.has(i)), false);
+            setVisible([...matches].filter(i => !previous.has(i)), true);
         }}
 
+        document.getElementById('search-input').addEventListener('input', () => {{
+            clearTimeout(filterTimer);
+            filterTimer = setTimeout(filterLinks, {debounce_ms});
+        }});
+
         // Check server status on page load
         checkServer();
         
@@ -324,9 +226,56 @@ def create_complete_test_html(locations):
         setInterval(checkServer, 10000);
     </script>
 </body>
-</html>"""
+</html>""")
+
+SECTION = Template("""
+        <div class="test-section {css_class}">
+            <div class="section-title">{title} ({count} locations)</div>
+            <div class="test-links">
+{links}
+            </div>
+        </div>
+""")
+
+TEST_LINK = Template("""
+                <a href="{qr_url}" target="_blank" class="test-link" id="loc-{index}">
+                    {location_name}
+                    <div class="token-display">{location_id}</div>
+                </a>
+""")
+
+def create_complete_test_html(locations, stylesheet=STYLESHEET_NAME):
+    """Create comprehensive HTML with all test URLs"""
+    total_locations = sum(len(locations[cat]) for cat in locations)
+    
+    # Generate sections for each location type; links are numbered in page order
+    sections = []
+    link_index = 0
+    for section_key, section_title, css_class in SECTION_CONFIGS:
+        if locations[section_key]:
+            links = TEST_LINK.render_all(dict(location, index=link_index + i)
+                                         for i, location in enumerate(locations[section_key]))
+            link_index += len(locations[section_key])
+            sections.append(SECTION.render(
+                css_class=css_class,
+                title=section_title,
+                count=len(locations[section_key]),
+                links=links,
+            ))
     
-    return html_content
+    # Escape '<' so location names can never close the embedding <script> tag
+    search_index = json.dumps(build_search_index(locations), separators=(',', ':')).replace('<', '\\u003c')
+
+    return page_head("La Strada Hotel - Complete Local Test URLs", 'rounded test-urls', stylesheet) + PAGE_BODY.render(
+        total=total_locations,
+        rooms=len(locations['room']),
+        restaurant=len(locations['restaurant']),
+        garden=len(locations['garden']),
+        local_url=LOCAL_URL,
+        debounce_ms=SEARCH_DEBOUNCE_MS,
+        sections=''.join(sections),
+        search_index=search_index,
+    )
 
 def main():
     print("🧪 La Strada Hotel - Complete Local Test URLs Generator")
@@ -351,7 +300,8 @@ def main():
     
     # Generate HTML
     print(f"\n🌐 Generating complete test URLs HTML...")
-    html_content = create_complete_test_html(locations)
+    stylesheet = save_stylesheet(os.path.dirname(OUTPUT_FILE))
+    html_content = create_complete_test_html(locations, stylesheet)
     
     # Save HTML file
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
@@ -361,7 +311,7 @@ def main():
     print("\n" + "=" * 60)
     print("🎉 Complete local test URLs generated!")
     print(f"✅ Generated {total_locations} test URLs")
-    print(f"📂 File saved: {OUTPUT_FILE}")
+    print(f"📂 File saved: {OUTPUT_FILE} (styles in {stylesheet})")
     print(f"🌐 Local server: {LOCAL_URL}")
     
     print("\n📋 What's included:")
@@ -9,7 +9,7 @@ import os
 import sys
 
 try:
-    import qrcode
+    from qr_render import plan_version, render_png
 except ImportError:
     print("❌ Required library not installed!")
     print("📦 Please install it with:")
@@ -18,6 +18,8 @@ except ImportError:
     print("   pip3 install qrcode[pil]")
     sys.exit(1)
 
+from qr_templates import Template, page_head, save_stylesheet
+
 # Configuration for local testing
 LOCAL_URL = "http://localhost:3000"
 OUTPUT_DIR = "local-test-qr"
@@ -82,55 +84,16 @@ def get_test_locations(tokens):
     
     return test_locations
 
-def create_qr_code(url, output_path):
+def create_qr_code(url, output_path, version=None):
     """Create a QR code image"""
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(url)
-    qr.make(fit=True)
-    
-    qr_img = qr.make_image(fill_color="black", back_color="white")
-    qr_img.save(output_path, 'PNG')
+    with open(output_path, 'wb') as f:
+        f.write(render_png(url, version=version))
     return True
 
-def create_test_gallery(test_locations, output_dir):
-    """Create an HTML gallery for local testing"""
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>La Strada Hotel - Local Test QR Codes</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
-        .header {{ text-align: center; margin-bottom: 30px; background: white; padding: 30px; border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }}
-        .header h1 {{ color: #2c3e50; margin-bottom: 10px; }}
-        .alert {{ background: #fff3cd; border: 1px solid #ffeaa7; color: #856404; padding: 15px; border-radius: 10px; margin-bottom: 30px; }}
-        .gallery {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(350px, 1fr)); gap: 25px; }}
-        .qr-item {{ background: white; padding: 25px; border-radius: 15px; text-align: center; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }}
-        .qr-item img {{ max-width: 200px; height: 200px; border: 2px solid #ecf0f1; border-radius: 10px; }}
-        .location-title {{ font-size: 20px; font-weight: bold; margin-bottom: 15px; color: #2c3e50; }}
-        .location-type {{ font-size: 14px; color: #7f8c8d; margin-bottom: 10px; padding: 5px 10px; border-radius: 15px; display: inline-block; }}
-        .room {{ background: #e3f2fd; color: #1976d2; }}
-        .restaurant {{ background: #e8f5e8; color: #388e3c; }}
-        .garden {{ background: #f3e5f5; color: #7b1fa2; }}
-        .token-info {{ font-size: 12px; color: #7f8c8d; margin: 10px 0; font-family: 'Courier New', monospace; background: #f8f9fa; padding: 8px; border-radius: 5px; }}
-        .url-info {{ font-size: 11px; color: #95a5a6; margin: 10px 0; word-break: break-all; background: #f8f9fa; padding: 8px; border-radius: 5px; }}
-        .test-btn {{ display: inline-block; margin: 5px; padding: 10px 20px; background: #28a745; color: white; text-decoration: none; border-radius: 8px; transition: background 0.3s; }}
-        .test-btn:hover {{ background: #218838; }}
-        .instructions {{ background: linear-gradient(135deg, #74b9ff, #0984e3); color: white; padding: 25px; border-radius: 15px; margin-bottom: 30px; }}
-        .instructions h3 {{ margin-top: 0; }}
-    </style>
-</head>
-<body>
-    <div class="header">
+GALLERY_BODY = Template("""    <div class="header">
         <h1>🧪 La Strada Hotel - Local Test QR Codes</h1>
         <p>QR codes for testing on your local development server</p>
-        <p><strong>Server:</strong> {LOCAL_URL} | <strong>Test Locations:</strong> {len(test_locations)}</p>
+        <p><strong>Server:</strong> {local_url} | <strong>Test Locations:</strong> {count}</p>
     </div>
     
     <div class="alert">
@@ -183,25 +146,7 @@ def create_test_gallery(test_locations, output_dir):
     </div>
     
     <div class="gallery">
-"""
-    
-    for location in test_locations:
-        filename = f"local-qr-{location['location_id']}.png"
-        type_class = location['type']
-        
-        html_content += f"""
-        <div class="qr-item">
-            <div class="location-type {type_class}">{location['type'].title()}</div>
-            <div class="location-title">{location['location_name']}</div>
-            <img src="{filename}" alt="QR Code for {location['location_name']}">
-            <div class="token-info">Token: {location['token']}</div>
-            <div class="url-info">{location['qr_url']}</div>
-            <a href="{location['qr_url']}" target="_blank" class="test-btn">🌐 Test in Browser</a>
-            <a href="{filename}" download class="test-btn">📱 Download QR</a>
-        </div>
-"""
-    
-    html_content += """
+{items}
     </div>
     
     <div style="margin-top: 40px; text-align: center; color: #7f8c8d; background: white; padding: 25px; border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1);">
@@ -211,7 +156,29 @@ def create_test_gallery(test_locations, output_dir):
         <p>Once testing is complete, use the production QR codes that point to your live domain.</p>
     </div>
 </body>
-</html>"""
+</html>""")
+
+GALLERY_ITEM = Template("""
+        <div class="qr-item">
+            <div class="location-type {type}">{type_title}</div>
+            <div class="location-title">{location_name}</div>
+            <img src="local-qr-{location_id}.png" alt="QR Code for {location_name}">
+            <div class="token-info">Token: {token}</div>
+            <div class="url-info">{qr_url}</div>
+            <a href="{qr_url}" target="_blank" class="test-btn">🌐 Test in Browser</a>
+            <a href="local-qr-{location_id}.png" download class="test-btn">📱 Download QR</a>
+        </div>
+""")
+
+def create_test_gallery(test_locations, output_dir):
+    """Create an HTML gallery for local testing"""
+    stylesheet = save_stylesheet(output_dir)
+    items = GALLERY_ITEM.render_all(dict(location, type_title=location['type'].title()) for location in test_locations)
+    html_content = page_head("La Strada Hotel - Local Test QR Codes", 'rounded local-test-gallery', stylesheet) + GALLERY_BODY.render(
+        local_url=LOCAL_URL,
+        count=len(test_locations),
+        items=items,
+    )
     
     with open(os.path.join(output_dir, "local-test-gallery.html"), 'w', encoding='utf-8') as f:
         f.write(html_content)
@@ -250,6 +217,9 @@ def main():
     os.makedirs(output_dir, exist_ok=True)
     print(f"\n📁 Output directory: {output_dir}")
     
+    # One QR version for the batch so every code prints the same size
+    version = plan_version(location['qr_url'] for location in test_locations)
+    
     # Generate QR codes
     print(f"\n🎨 Generating {len(test_locations)} test QR codes...")
     success_count = 0
@@ -259,7 +229,7 @@ def main():
         output_path = os.path.join(output_dir, filename)
         
         try:
-            create_qr_code(location['qr_url'], output_path)
+            create_qr_code(location['qr_url'], output_path, version)
             print(f"  ✅ {i:2d}/{len(test_locations)} - {location['location_name']} -> {filename}")
             success_count += 1
         except Exception as e:
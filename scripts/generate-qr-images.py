@@ -4,14 +4,17 @@ QR Code Image Generator for La Strada Hotel
 Generates actual QR code images for all hotel rooms using the free qrcode library.
 """
 
+import argparse
 import json
 import os
 import sys
+from functools import lru_cache
 from pathlib import Path
 
 try:
-    import qrcode
     from PIL import Image, ImageDraw, ImageFont
+    from qr_render import (ERROR_CORRECTION, ERROR_CORRECTION_LEVELS, plan_version, render_raster,
+                           use_matrix_store)
 except ImportError:
     print("❌ Required libraries not installed!")
     print("📦 Please install them with:")
@@ -20,11 +23,31 @@ except ImportError:
     print("   pip3 install qrcode[pil] pillow")
     sys.exit(1)
 
+from qr_output import (add_layout_arg, encode_png, generated_suffix, layout_path, open_output,
+                       print_manifest_summary, thumbnail_file, write_manifest)
+from qr_payload import add_payload_arg, location_payload, print_payload_savings, token_url
+from qr_progress import Progress, add_progress_args
+from qr_store import add_matrix_store_args, close_matrix_store, open_matrix_store
+from qr_templates import Template, page_head, thumbnail_img, write_stylesheet
+from qr_variants import render_thumbnails, thumbnail_height
+
 # Configuration
 BASE_URL = "https://menu.theplazahoteledirne.com"
 OUTPUT_DIR = "qr-codes-images"
 TOKENS_FILE = "data/tokens.json"
 
+# Room label under each code
+LABEL_HEIGHT = 80  # Extra space for text under the code
+LABEL_FONT_SIZE = 24
+LABEL_FONTS = [
+    "arial.ttf",
+    "/System/Library/Fonts/Arial.ttf",  # macOS
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
+]
+
+# Width the gallery shows each labelled code at (a 250px column less the card padding)
+THUMBNAIL_SIZE = 220
+
 def load_tokens():
     """Load tokens from JSON file"""
     try:
@@ -37,7 +60,7 @@ def load_tokens():
         print(f"❌ Error: Invalid JSON in {TOKENS_FILE}")
         sys.exit(1)
 
-def get_room_data(tokens):
+def get_room_data(tokens, payload='url'):
     """Extract room data from tokens"""
     rooms = []
     for key, data in tokens.items():
@@ -46,7 +69,7 @@ def get_room_data(tokens):
                 'room_number': key,
                 'room_name': data['name'],
                 'token': data['token'],
-                'qr_url': f"{BASE_URL}?token={data['token']}"
+                'qr_url': location_payload(data['token'], BASE_URL, payload)
             })
     
     # Sort rooms by number
@@ -60,91 +83,48 @@ def get_room_data(tokens):
     
     return sorted(rooms, key=sort_key)
 
-def create_qr_code(url, room_name, output_path):
-    """Create a QR code image with room label"""
-    # Create QR code
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=qrcode.constants.ERROR_CORRECT_M,
-        box_size=10,
-        border=4,
-    )
-    qr.add_data(url)
-    qr.make(fit=True)
-    
-    # Create QR code image
-    qr_img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Create a larger image with room label
-    img_width = qr_img.width
-    img_height = qr_img.height + 80  # Extra space for text
-    
-    # Create new image with white background
-    final_img = Image.new('RGB', (img_width, img_height), 'white')
+@lru_cache(maxsize=None)
+def load_label_font():
+    """Load the label font once; fall back to PIL's default if none is installed"""
+    for font_path in LABEL_FONTS:
+        try:
+            return ImageFont.truetype(font_path, LABEL_FONT_SIZE)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+@lru_cache(maxsize=8)
+def label_template(width, height):
+    """Blank 1-bit canvas for one code size; copied for every room"""
+    return Image.new('1', (width, height + LABEL_HEIGHT), 1)
+
+def create_qr_code(url, room_name, version=None, error_correction=ERROR_CORRECTION):
+    """Create a QR code image with room label and return it as PNG bytes
+
+    Everything stays 1-bit: the code is pasted straight from the cached
+    raster and the label is drawn without anti-aliasing, so the PNG is as
+    small and as quick to encode as an unlabelled one.
+    """
+    raster = render_raster(url, version=version, error_correction=error_correction)
+    qr_img = Image.frombuffer('L', (raster.width, raster.height), raster.pixels, 'raw', 'L', 0, 1)
     
-    # Paste QR code
+    final_img = label_template(raster.width, raster.height).copy()
     final_img.paste(qr_img, (0, 0))
     
-    # Add room label
+    # Add room label (centered)
     draw = ImageDraw.Draw(final_img)
+    draw.fontmode = "1"  # Crisp 1-bit glyphs, no grey anti-aliasing
+    font = load_label_font()
+    text_width = draw.textlength(room_name, font=font)
+    text_x = (raster.width - int(text_width)) // 2
+    text_y = raster.height + 20
+    draw.text((text_x, text_y), room_name, fill=0, font=font)
     
-    # Try to use a nice font, fall back to default if not available
-    try:
-        font = ImageFont.truetype("arial.ttf", 24)
-    except:
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Arial.ttf", 24)  # macOS
-        except:
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 24)  # Linux
-            except:
-                font = ImageFont.load_default()
-    
-    # Calculate text position (centered)
-    text = room_name
-    try:
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_x = (img_width - text_width) // 2
-    except:
-        # Fallback for older PIL versions
-        text_width = len(text) * 12  # Approximate width
-        text_x = (img_width - text_width) // 2
-    
-    text_y = qr_img.height + 20
-    
-    # Draw text
-    draw.text((text_x, text_y), text, fill="black", font=font)
-    
-    # Save image
-    final_img.save(output_path, 'PNG', quality=95)
-    return True
+    return encode_png(final_img)
 
-def create_html_gallery(rooms, output_dir):
-    """Create an HTML gallery of all QR codes"""
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>La Strada Hotel - QR Codes Gallery</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
-        .header {{ text-align: center; margin-bottom: 30px; background: white; padding: 20px; border-radius: 10px; }}
-        .gallery {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 20px; }}
-        .qr-item {{ background: white; padding: 15px; border-radius: 10px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }}
-        .qr-item img {{ max-width: 100%; height: auto; }}
-        .room-title {{ font-size: 18px; font-weight: bold; margin-bottom: 10px; color: #333; }}
-        .download-btn {{ display: inline-block; margin-top: 10px; padding: 8px 16px; background: #007bff; color: white; text-decoration: none; border-radius: 5px; }}
-        .download-btn:hover {{ background: #0056b3; }}
-        .instructions {{ background: #e7f3ff; padding: 20px; border-radius: 10px; margin-bottom: 30px; }}
-        @media print {{ .qr-item {{ page-break-inside: avoid; }} }}
-    </style>
-</head>
-<body>
-    <div class="header">
+GALLERY_BODY = Template("""    <div class="header">
         <h1>🏨 La Strada Hotel - QR Codes</h1>
-        <p>Total Rooms: {len(rooms)} | Generated: {__import__('datetime').datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        <p>Total Rooms: {total}{generated}</p>
     </div>
     
     <div class="instructions">
@@ -158,76 +138,137 @@ def create_html_gallery(rooms, output_dir):
     </div>
     
     <div class="gallery">
-"""
-    
-    for room in rooms:
-        filename = f"qr-{room['room_number']}.png"
-        html_content += f"""
+{items}
+    </div>
+</body>
+</html>""")
+
+GALLERY_ITEM = Template("""
         <div class="qr-item">
-            <div class="room-title">{room['room_name']}</div>
-            <img src="{filename}" alt="QR Code for {room['room_name']}">
+            <div class="room-title">{room_name}</div>
+            {image}
             <div style="font-size: 12px; color: #666; margin-top: 5px;">
-                Token: {room['token'][:20]}...
+                Token: {token_prefix}...
             </div>
             <a href="{filename}" download class="download-btn">Download PNG</a>
         </div>
-"""
-    
-    html_content += """
-    </div>
-</body>
-</html>"""
+""")
+
+def room_file(room, layout='flat'):
+    """Relative path of a room's PNG; sharded runs nest it under rooms/<xx>/"""
+    folder = 'rooms' if layout == 'sharded' else None
+    return layout_path(f"qr-{room['room_number']}.png", room['room_number'], folder, layout)
+
+def create_html_gallery(rooms, output, deterministic=False, layout='flat'):
+    """Create an HTML gallery of all QR codes"""
+    stylesheet = write_stylesheet(output)
+    height = thumbnail_height(THUMBNAIL_SIZE, label=True)
+    items = GALLERY_ITEM.render_all(dict(room, token_prefix=room['token'][:20], filename=room_file(room, layout),
+                                         image=thumbnail_img(room_file(room, layout), THUMBNAIL_SIZE, height,
+                                                             f"QR Code for {room['room_name']}"))
+                                    for room in rooms)
+    html_content = page_head("La Strada Hotel - QR Codes Gallery", 'labelled-gallery', stylesheet) + GALLERY_BODY.render(
+        total=len(rooms),
+        generated=generated_suffix(deterministic),
+        items=items,
+    )
     
-    with open(os.path.join(output_dir, "qr-codes-gallery.html"), 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    output.write("qr-codes-gallery.html", html_content)
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Generate labelled QR code images for all hotel rooms")
+    parser.add_argument('--deterministic', action='store_true',
+                        help="byte-reproducible output: no build time (unless SOURCE_DATE_EPOCH is set), "
+                             "stable PNG encoding, unchanged files left untouched and a manifest.json")
+    parser.add_argument('--archive', metavar='PATH',
+                        help="write every code and the gallery into one .zip/.tar/.tar.gz file "
+                             "instead of the qr-codes-images folder")
+    parser.add_argument('--error-correction', choices=sorted(ERROR_CORRECTION_LEVELS), default=ERROR_CORRECTION,
+                        help=f"QR error correction level (default: {ERROR_CORRECTION}); every code is encoded "
+                             "at the smallest version that fits the longest URL at this level")
+    add_layout_arg(parser)
+    add_payload_arg(parser)
+    add_matrix_store_args(parser)
+    add_progress_args(parser)
+    return parser.parse_args()
 
 def main():
+    args = parse_args()
+    progress = Progress(args.quiet, args.events)
+    store = open_matrix_store(args)
+    use_matrix_store(store)
     print("🏨 La Strada Hotel - QR Code Image Generator")
     print("=" * 50)
     
     # Load tokens
     print("📖 Loading room data...")
     tokens = load_tokens()
-    rooms = get_room_data(tokens)
+    rooms = get_room_data(tokens, args.payload)
     
     print(f"✅ Found {len(rooms)} rooms")
+
+    # Plan one QR version for the whole batch so every code prints the same size
+    version = plan_version((room['qr_url'] for room in rooms), args.error_correction)
+    modules = version * 4 + 17
+    print(f"📐 QR version {version} for all codes ({modules}x{modules} modules, error correction {args.error_correction})")
+    baseline = plan_version((token_url(room['token'], BASE_URL) for room in rooms), args.error_correction)
+    print_payload_savings(args.payload, version, baseline)
     
-    # Create output directory
+    # Create output directory or archive
     output_dir = OUTPUT_DIR
-    os.makedirs(output_dir, exist_ok=True)
-    print(f"📁 Output directory: {output_dir}")
+    output = open_output(output_dir, args.archive, args.deterministic)
+    print(f"📁 Output: {args.archive or output_dir}")
     
     # Generate QR codes
     print("\n🎨 Generating QR code images...")
+    progress.stage('render', len(rooms), version=version)
     success_count = 0
     
-    for i, room in enumerate(rooms, 1):
-        filename = f"qr-{room['room_number']}.png"
-        output_path = os.path.join(output_dir, filename)
+    with output:
+        for i, room in enumerate(rooms, 1):
+            filename = room_file(room, args.layout)
+            
+            try:
+                output.write(filename, create_qr_code(room['qr_url'], room['room_name'], version, args.error_correction))
+                for density, thumbnail in render_thumbnails(room['qr_url'], THUMBNAIL_SIZE, args.error_correction,
+                                                            version, label=room['room_name']):
+                    output.write(thumbnail_file(filename, density), thumbnail)
+                progress.advance(f"  ✅ {i:2d}/{len(rooms)} - {room['room_name']} -> {filename}")
+                success_count += 1
+            except Exception as e:
+                progress.fail(room['room_number'], e,
+                              f"  ❌ {i:2d}/{len(rooms)} - {room['room_name']} -> Error: {e}")
         
-        try:
-            create_qr_code(room['qr_url'], room['room_name'], output_path)
-            print(f"  ✅ {i:2d}/{len(rooms)} - {room['room_name']} -> {filename}")
-            success_count += 1
-        except Exception as e:
-            print(f"  ❌ {i:2d}/{len(rooms)} - {room['room_name']} -> Error: {e}")
-    
-    # Create HTML gallery
-    print("\n🌐 Creating HTML gallery...")
-    create_html_gallery(rooms, output_dir)
+        # Create HTML gallery
+        print("\n🌐 Creating HTML gallery...")
+        create_html_gallery(rooms, output, args.deterministic, args.layout)
     
     # Summary
     print("\n" + "=" * 50)
     print("🎉 QR Code generation complete!")
     print(f"✅ Successfully generated: {success_count}/{len(rooms)} QR codes")
-    print(f"📂 Files saved in: {output_dir}/")
-    print(f"🌐 View gallery: {output_dir}/qr-codes-gallery.html")
-    
-    print("\n📋 Next steps:")
-    print("1. Open qr-codes-gallery.html in your browser")
-    print("2. Print the page or download individual images")
-    print("3. Cut out QR codes and place in rooms")
-    print("4. Test with your phone camera")
+    if args.archive:
+        print(f"📦 Archive: {args.archive} ({output.count} files, {os.path.getsize(args.archive):,} bytes)")
+        print("🌐 Gallery inside the archive: qr-codes-gallery.html")
+    else:
+        print(f"📂 Files saved in: {output_dir}/")
+        print(f"🌐 View gallery: {output_dir}/qr-codes-gallery.html")
+
+    close_matrix_store(store)
+
+    if args.deterministic and not args.archive:
+        progress.stage('manifest')
+        print_manifest_summary(output_dir, *write_manifest(output_dir))
+    
+    progress.finish(generated=success_count, failed=len(rooms) - success_count, output=args.archive or output_dir)
+    
+    if not args.quiet:
+        print("\n📋 Next steps:")
+        print("1. Open qr-codes-gallery.html in your browser")
+        print("2. Print the page or download individual images")
+        print("3. Cut out QR codes and place in rooms")
+        print("4. Test with your phone camera")
     
     if success_count < len(rooms):
         print(f"\n⚠️  Warning: {len(rooms) - success_count} QR codes failed to generate")
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+"""
+QR Output Tree Generator for La Strada Hotel
+Builds the whole qr-codes-output/ folder from data/tokens.json in one pass:
+numbered SVG and PNG codes per location, one page per location with the code
+inlined as SVG, summary.html and the view-only menu code. Locations are
+rendered in parallel worker processes.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    from qr_render import (ERROR_CORRECTION, ERROR_CORRECTION_LEVELS, drain_new_matrices, fit_version,
+                           plan_version, render_raster, render_svg, use_matrix_store)
+except ImportError:
+    print("❌ Required libraries not installed!")
+    print("📦 Please install them with:")
+    print("   pip install qrcode[pil] pillow")
+    sys.exit(1)
+
+from qr_output import add_layout_arg, encode_png, open_output, print_manifest_summary, shard_of, write_manifest
+from qr_payload import add_payload_arg, location_payload, print_payload_savings, token_url
+from qr_progress import Progress, add_progress_args
+from qr_store import add_matrix_store_args, close_matrix_store, open_matrix_store
+from qr_templates import Template, page_head, write_stylesheet
+
+# Configuration
+BASE_URL = "https://menu.theplazahoteledirne.com"
+VIEW_ONLY_URL = BASE_URL
+OUTPUT_DIR = "qr-codes-output"
+TOKENS_FILE = "data/tokens.json"
+QR_SIZE = 400
+VIEW_ONLY_SIZE = 500
+QR_MARGIN = 2
+NUMBER_FONTS = [
+    "arialbd.ttf",
+    "/System/Library/Fonts/Supplemental/Arial Bold.ttf",  # macOS
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",  # Linux
+]
+
+# Token type -> (folder, file prefix, label), in summary order
+CATEGORIES = {
+    'room': ('rooms', 'room', 'Hotel Room'),
+    'restaurant': ('restaurant', 'restaurant-table', 'Restaurant Table'),
+    'garden': ('garden', 'garden-table', 'Garden Table'),
+}
+SECTION_TITLES = {
+    'room': '🏨 Hotel Rooms',
+    'restaurant': '🍽️ Restaurant Tables',
+    'garden': '🌿 Garden Tables',
+}
+
+LOCATION_PAGE = Template("""    <div class="container">
+        <div class="title">{name}</div>
+        <div class="subtitle">La Strada {label}</div>
+
+        <div class="qr-preview">
+            {svg}
+        </div>
+
+        <div class="recommendation">
+            <h4>🎯 Recommended: SVG with Number</h4>
+            <p>The SVG version includes the <strong>"{number}"</strong> number in the center and is perfect for printing!</p>
+        </div>
+
+        <div class="folder-structure">
+            <h4>📁 File Organization</h4>
+            <div class="folder-tree">├── svg/    📊 SVG files (with numbers in center)
+├── png/    🖼️ PNG files (with numbers in center)
+└── HTML files (this page)</div>
+        </div>
+
+        <div class="download-section">
+            <h3>📥 Download Options</h3>
+            <a href="svg/{stem}.svg" download="{stem}.svg" class="download-btn primary">
+                📊 Download SVG (with number {number})
+            </a>
+            <a href="png/{stem}.png" download="{stem}.png" class="download-btn">
+                🖼️ Download PNG (with number {number})
+            </a>
+            <p><strong>Both versions</strong> include the number "{number}" in the center!</p>
+        </div>
+
+        <div class="instructions">
+            <h3>📋 Instructions:</h3>
+            <ol>
+                <li><strong>Download your preferred format</strong> - both include "{number}" in center</li>
+                <li><strong>SVG:</strong> Best for vector graphics and scaling</li>
+                <li><strong>PNG:</strong> Standard image format, works with all printers</li>
+                <li><strong>Print the file</strong> directly from your browser or image viewer</li>
+                <li><strong>Cut out</strong> the QR code</li>
+                <li><strong>Place</strong> in {name}</li>
+            </ol>
+            <p><strong>Note:</strong> Both SVG and PNG files include the room/table number automatically!</p>
+        </div>
+
+        <div class="url">
+            <strong>URL:</strong> {qr_url}
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+SUMMARY_PAGE = Template("""    <div class="header">
+        <h1>🏨 La Strada - QR Code Generation Complete</h1>
+        <p>All QR codes have been generated as SVG and PNG files</p>
+    </div>
+
+    <div class="stats">
+        <div class="stat-card">
+            <div class="stat-number">{rooms}</div>
+            <div class="stat-label">Hotel Rooms</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-number">{restaurant}</div>
+            <div class="stat-label">Restaurant Tables</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-number">{garden}</div>
+            <div class="stat-label">Garden Tables</div>
+        </div>
+        <div class="stat-card">
+            <div class="stat-number">{total}</div>
+            <div class="stat-label">Total QR Codes</div>
+        </div>
+    </div>
+
+    <div class="folder-info">
+        <h3>📁 Organized File Structure</h3>
+        <div class="folder-tree">qr-codes-output/
+├── rooms/
+│   ├── svg/           📊 SVG files with numbers (recommended for printing)
+│   ├── png/           🖼️ PNG files with numbers
+│   └── *.html         📄 Individual QR code pages
+├── restaurant/
+│   ├── svg/           📊 SVG files with numbers (S1, S2, etc.)
+│   ├── png/           🖼️ PNG files with numbers
+│   └── *.html         📄 Individual QR code pages
+├── garden/
+│   ├── svg/           📊 SVG files with numbers (B1, B2, etc.)
+│   ├── png/           🖼️ PNG files with numbers
+│   └── *.html         📄 Individual QR code pages
+├── view-only-menu-qr.html  🍽️ Printable view-only menu code
+└── summary.html       📋 This overview page</div>
+    </div>
+{sections}
+    <div class="section">
+        <h2>📋 Instructions</h2>
+        <ol>
+            <li>Click on any room/table number above to open its QR code page</li>
+            <li>Each page shows the code and its SVG and PNG downloads, both with the number in the center</li>
+            <li><strong>Recommended:</strong> Download the SVG files for best printing quality</li>
+            <li>Use your browser's print function (Ctrl+P or Cmd+P) to print</li>
+            <li>Cut out the QR codes and place them in the corresponding locations</li>
+            <li>QR codes link to: <code>{base_url}</code></li>
+            <li>Each QR code contains a unique token for access control</li>
+        </ol>
+    </div>
+</body>
+</html>
+""")
+
+SUMMARY_SECTION = Template("""
+    <div class="section">
+        <h2>{title}</h2>
+        <div class="grid">
+{items}
+        </div>
+    </div>
+""")
+
+SUMMARY_ITEM = Template("""
+            <div class="item">
+                <a href="{directory}/{stem}.html" target="_blank">
+                    <div class="item-number">{number}</div>
+                    <div class="item-type">{name}</div>
+                </a>
+            </div>
+""")
+
+VIEW_ONLY_PAGE = Template("""    <div class="qr-container">
+        <div class="title">La Strada Restaurant</div>
+        <div class="subtitle">View-Only Menu</div>
+        <div class="qr-code">
+            {svg}
+        </div>
+        <div class="url">{url}</div>
+    </div>
+
+    <div class="no-print">
+        <p><strong>Usage:</strong> This QR code allows guests to view the menu and prices without being able to place orders.</p>
+        <p><strong>Perfect for:</strong> Reception desk, lobby areas, or anywhere you want to display menu information.</p>
+        <button onclick="window.print()">🖨️ Print QR Code</button>
+    </div>
+</body>
+</html>
+""")
+
+def load_tokens():
+    """Load tokens from JSON file"""
+    try:
+        with open(TOKENS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"❌ Error: {TOKENS_FILE} not found!")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"❌ Error: Invalid JSON in {TOKENS_FILE}")
+        sys.exit(1)
+
+def get_all_locations(tokens, layout='flat', payload='url'):
+    """Location records in summary order: category, then numeric IDs by number
+
+    directory is where the location's page and svg/ png/ folders go: the
+    category folder, or a hash shard inside it in the sharded layout.
+    """
+    order = list(CATEGORIES)
+    locations = []
+    for key, data in tokens.items():
+        if data.get('type') in CATEGORIES:
+            folder, prefix, label = CATEGORIES[data['type']]
+            locations.append({
+                'type': data['type'],
+                'directory': f"{folder}/{shard_of(key)}" if layout == 'sharded' else folder,
+                'label': label,
+                'stem': f"{prefix}-{key}",
+                'number': key,
+                'name': data['name'],
+                'qr_url': location_payload(data['token'], BASE_URL, payload),
+                'token': data['token'],
+            })
+
+    def sort_key(location):
+        number = location['number']
+        if number.isdigit():
+            rank = (0, int(number), number)
+        elif number[1:].isdigit():
+            rank = (1, int(number[1:]), number)
+        else:
+            rank = (2, 0, number)
+        return (order.index(location['type']),) + rank
+
+    return sorted(locations, key=sort_key)
+
+@lru_cache(maxsize=16)
+def load_number_font(size):
+    """Bold font for the number in the middle of the PNG codes"""
+    for font_path in NUMBER_FONTS:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default(size)
+
+def number_font_size(radius, number):
+    """Text size that fits number inside the center circle"""
+    scale = 1 if len(number) <= 2 else 0.75 if len(number) <= 3 else 0.55
+    # Long suite names ("EP1-Suit-31") must still fit across the circle;
+    # a bold sans glyph is roughly 0.62em wide
+    return min(radius * 0.65 * scale, radius * 1.7 / (0.62 * len(number)))
+
+def create_svg(url, number, version, error_correction, size=QR_SIZE):
+    """SVG code, with number in a white circle in the middle when given"""
+    svg = render_svg(url, border=QR_MARGIN, error_correction=error_correction, version=version, width=size).decode('utf-8')
+    if not number:
+        return svg
+    modules = version * 4 + 17 + 2 * QR_MARGIN
+    center = modules / 2
+    radius = max(2.5, modules * 0.12)
+    overlay = (f'<circle cx="{center:g}" cy="{center:g}" r="{radius:.2f}" fill="white" stroke="black" stroke-width="0.3"/>'
+               f'<text x="{center:g}" y="{center:g}" text-anchor="middle" dominant-baseline="central" '
+               f'font-family="Arial, sans-serif" font-weight="bold" font-size="{number_font_size(radius, number):.2f}" '
+               f'fill="black">{number}</text></svg>\n')
+    return svg.replace('</svg>\n', overlay)
+
+def create_png(url, number, version, error_correction, size=QR_SIZE):
+    """PNG code scaled to size pixels, with number in a white circle in the middle when given"""
+    raster = render_raster(url, box_size=1, border=QR_MARGIN, error_correction=error_correction, version=version)
+    image = Image.frombuffer('L', (raster.width, raster.height), raster.pixels, 'raw', 'L', 0, 1)
+    image = image.convert('1').resize((size, size), Image.NEAREST)
+    if number:
+        draw = ImageDraw.Draw(image)
+        draw.fontmode = "1"  # Crisp 1-bit glyphs, no grey anti-aliasing
+        center = size / 2
+        radius = max(15, size * 0.12)
+        draw.ellipse((center - radius, center - radius, center + radius, center + radius), fill=1, outline=0, width=2)
+        font = load_number_font(round(number_font_size(radius, number)))
+        draw.text((center, center), number, fill=0, font=font, anchor='mm')
+    return encode_png(image)
+
+def render_location(job):
+    """Worker: render one location's SVG, PNG and page
+
+    Returns ([(relative path, data)], None, new matrices), or (None, error
+    message, new matrices) so one bad location does not stop the batch. New
+    matrices go back to the parent's matrix store.
+    """
+    location, version, error_correction, stylesheet = job
+    try:
+        svg = create_svg(location['qr_url'], location['number'], version, error_correction)
+        png = create_png(location['qr_url'], location['number'], version, error_correction)
+        root = "../" * (location['directory'].count('/') + 1)
+        page = page_head(f"{location['name']} - QR Code", 'qr-page', root + stylesheet) + LOCATION_PAGE.render(
+            location, svg=svg.rstrip('\n'))
+    except Exception as e:
+        return None, str(e), drain_new_matrices()
+    directory, stem = location['directory'], location['stem']
+    return [
+        (f"{directory}/svg/{stem}.svg", svg),
+        (f"{directory}/png/{stem}.png", png),
+        (f"{directory}/{stem}.html", page),
+    ], None, drain_new_matrices()
+
+def render_in_parallel(jobs, workers):
+    """Yield render_location results in job order, using worker processes when workers > 1"""
+    if workers <= 1 or len(jobs) < 2:
+        yield from map(render_location, jobs)
+        return
+    chunk_size = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(render_location, jobs, chunksize=chunk_size)
+
+def create_summary(locations, stylesheet):
+    """summary.html linking every location page"""
+    counts = {category: 0 for category in CATEGORIES}
+    for location in locations:
+        counts[location['type']] += 1
+    sections = []
+    for category, title in SECTION_TITLES.items():
+        items = [location for location in locations if location['type'] == category]
+        if items:
+            sections.append(SUMMARY_SECTION.render(title=title, items=SUMMARY_ITEM.render_all(items)))
+    return page_head("La Strada - QR Code Summary", 'qr-summary', stylesheet) + SUMMARY_PAGE.render(
+        rooms=counts['room'],
+        restaurant=counts['restaurant'],
+        garden=counts['garden'],
+        total=len(locations),
+        sections=''.join(sections),
+        base_url=BASE_URL,
+    )
+
+def create_view_only(error_correction, stylesheet):
+    """The view-only menu code (no token) as PNG, SVG and a printable page"""
+    version = fit_version(VIEW_ONLY_URL, error_correction)
+    svg = create_svg(VIEW_ONLY_URL, None, version, error_correction, VIEW_ONLY_SIZE)
+    png = create_png(VIEW_ONLY_URL, None, version, error_correction, VIEW_ONLY_SIZE)
+    page = page_head("View-Only Menu QR Code", 'view-only', stylesheet) + VIEW_ONLY_PAGE.render(
+        svg=svg.rstrip('\n'), url=VIEW_ONLY_URL)
+    return [
+        ("view-only-menu-qr.svg", svg),
+        ("view-only-menu-qr.png", png),
+        ("view-only-menu-qr.html", page),
+    ]
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Build the qr-codes-output folder for every location")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes to render with (default: one per CPU; 1 renders in this process)")
+    parser.add_argument('--deterministic', action='store_true',
+                        help="byte-reproducible output: stable PNG encoding, unchanged files left untouched "
+                             "and a manifest.json")
+    parser.add_argument('--archive', metavar='PATH',
+                        help="write the whole tree into one .zip/.tar/.tar.gz file instead of the "
+                             "qr-codes-output folder")
+    parser.add_argument('--error-correction', choices=sorted(ERROR_CORRECTION_LEVELS), default=ERROR_CORRECTION,
+                        help=f"QR error correction level (default: {ERROR_CORRECTION}); every location code is "
+                             "encoded at the smallest version that fits the longest URL at this level")
+    add_layout_arg(parser)
+    add_payload_arg(parser)
+    add_matrix_store_args(parser)
+    add_progress_args(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    progress = Progress(args.quiet, args.events)
+    store = open_matrix_store(args)
+    use_matrix_store(store)
+    print("🏨 La Strada Hotel - QR Output Tree Generator")
+    print("=" * 60)
+
+    # Load tokens
+    print("📖 Loading location data...")
+    locations = get_all_locations(load_tokens(), args.layout, args.payload)
+    print(f"✅ Found {len(locations)} locations")
+
+    # One QR version for every location so all the codes print the same size
+    version = plan_version((location['qr_url'] for location in locations), args.error_correction)
+    modules = version * 4 + 17
+    print(f"📐 QR version {version} for all codes ({modules}x{modules} modules, error correction {args.error_correction})")
+    baseline = plan_version((token_url(location['token'], BASE_URL) for location in locations), args.error_correction)
+    print_payload_savings(args.payload, version, baseline)
+
+    output_dir = OUTPUT_DIR
+    output = open_output(output_dir, args.archive, args.deterministic)
+    print(f"📁 Output: {args.archive or output_dir}")
+
+    workers = max(1, args.jobs)
+    print(f"\n🎨 Rendering {len(locations)} locations with {workers} worker{'s' if workers != 1 else ''}...")
+    progress.stage('render', len(locations), version=version, workers=workers)
+    started = time.monotonic()
+    success_count = 0
+
+    with output:
+        stylesheet = write_stylesheet(output)
+        jobs = [(location, version, args.error_correction, stylesheet) for location in locations]
+        results = render_in_parallel(jobs, workers)
+        for i, (location, (files, error, matrices)) in enumerate(zip(locations, results), 1):
+            if store is not None:
+                store.merge(matrices)
+            if error:
+                progress.fail(location['stem'], error,
+                              f"  ❌ {i:2d}/{len(locations)} - {location['name']} -> Error: {error}")
+                continue
+            for relative_path, data in files:
+                output.write(relative_path, data)
+            progress.advance(f"  ✅ {i:2d}/{len(locations)} - {location['name']} -> {location['directory']}/{location['stem']}.html")
+            success_count += 1
+
+        print("\n🌐 Writing summary and view-only menu code...")
+        output.write("summary.html", create_summary(locations, stylesheet))
+        for relative_path, data in create_view_only(args.error_correction, stylesheet):
+            output.write(relative_path, data)
+    elapsed = time.monotonic() - started
+
+    # Summary
+    print("\n" + "=" * 60)
+    print("🎉 QR output tree complete!")
+    print(f"✅ Successfully generated: {success_count}/{len(locations)} locations in {elapsed * 1000:.0f} ms")
+    if args.archive:
+        print(f"📦 Archive: {args.archive} ({output.count} files, {os.path.getsize(args.archive):,} bytes)")
+    else:
+        print(f"📂 Files saved in: {output_dir}/")
+        print(f"🌐 Overview: {output_dir}/summary.html")
+
+    close_matrix_store(store)
+
+    if args.deterministic and not args.archive:
+        progress.stage('manifest')
+        print_manifest_summary(output_dir, *write_manifest(output_dir))
+
+    progress.finish(generated=success_count, failed=len(locations) - success_count,
+                    output=args.archive or output_dir, render_seconds=round(elapsed, 3))
+
+    if success_count < len(locations):
+        print(f"\n⚠️  Warning: {len(locations) - success_count} locations failed to generate")
+    elif not args.quiet:
+        print("\n📋 Next steps:")
+        print(f"1. Open {output_dir}/summary.html to see all generated QR codes")
+        print("2. Click on each room/table to open its QR code page")
+        print("3. Print each QR code page from your browser")
+        print("4. Place QR codes in their respective locations")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+QR Code Variant Generator for La Strada Hotel
+Encodes every location's URL once and draws all the image variants from a
+variant spec (gallery and print sizes, labelled and unlabelled, colours per
+category) from that one matrix in the same pass.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+try:
+    from qr_render import (ERROR_CORRECTION, ERROR_CORRECTION_LEVELS, module_matrix, plan_version,
+                           use_matrix_store)
+    from qr_variants import load_variants, render_variants
+except ImportError:
+    print("❌ Required libraries not installed!")
+    print("📦 Please install them with:")
+    print("   pip install qrcode[pil] pillow")
+    sys.exit(1)
+
+from qr_output import add_layout_arg, layout_path, open_output, print_manifest_summary, write_manifest
+from qr_payload import add_payload_arg, location_payload, print_payload_savings, token_url
+from qr_progress import Progress, add_progress_args
+from qr_store import add_matrix_store_args, close_matrix_store, open_matrix_store
+
+# Configuration
+BASE_URL = "https://menu.theplazahoteledirne.com"
+OUTPUT_DIR = "qr-variants"
+TOKENS_FILE = "data/tokens.json"
+
+# Token type -> output folder, in output order
+CATEGORIES = {
+    'room': 'rooms',
+    'restaurant': 'restaurant',
+    'garden': 'garden',
+}
+
+def load_tokens():
+    """Load tokens from JSON file"""
+    try:
+        with open(TOKENS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"❌ Error: {TOKENS_FILE} not found!")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"❌ Error: Invalid JSON in {TOKENS_FILE}")
+        sys.exit(1)
+
+def get_all_locations(tokens, payload='url'):
+    """Location records ordered by category, then numeric IDs by number"""
+    order = list(CATEGORIES)
+    locations = []
+    for key, data in tokens.items():
+        if data.get('type') in CATEGORIES:
+            locations.append({
+                'location_id': key,
+                'location_name': data['name'],
+                'qr_url': location_payload(data['token'], BASE_URL, payload),
+                'token': data['token'],
+                'type': data['type'],
+                'category': CATEGORIES[data['type']],
+            })
+
+    def sort_key(location):
+        location_id = location['location_id']
+        if location_id.isdigit():
+            rank = (0, int(location_id), location_id)
+        elif location_id[1:].isdigit():
+            rank = (1, int(location_id[1:]), location_id)
+        else:
+            rank = (2, 0, location_id)
+        return (order.index(location['type']),) + rank
+
+    return sorted(locations, key=sort_key)
+
+def variant_file(location, variant, layout='flat'):
+    """<variant>/<category>/[<xx>/]qr-<id>.png"""
+    return layout_path(f"qr-{location['location_id']}.png", location['location_id'],
+                       f"{variant.name}/{location['category']}", layout)
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Render every image variant of every location's QR code in one pass")
+    parser.add_argument('--spec', metavar='PATH',
+                        help="JSON variant spec (default: gallery 200px, print 600px, labelled and "
+                             "category-coloured 450px)")
+    parser.add_argument('--deterministic', action='store_true',
+                        help="byte-reproducible output: stable PNG encoding, unchanged files left untouched "
+                             "and a manifest.json")
+    parser.add_argument('--archive', metavar='PATH',
+                        help="write every variant into one .zip/.tar/.tar.gz file instead of the qr-variants folder")
+    parser.add_argument('--error-correction', choices=sorted(ERROR_CORRECTION_LEVELS), default=ERROR_CORRECTION,
+                        help=f"QR error correction level (default: {ERROR_CORRECTION}); every code is encoded "
+                             "at the smallest version that fits the longest URL at this level")
+    add_layout_arg(parser)
+    add_payload_arg(parser)
+    add_matrix_store_args(parser)
+    add_progress_args(parser)
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    progress = Progress(args.quiet, args.events)
+    store = open_matrix_store(args)
+    use_matrix_store(store)
+    print("🏨 La Strada Hotel - QR Code Variant Generator")
+    print("=" * 60)
+
+    try:
+        variants = load_variants(args.spec)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: could not load variant spec {args.spec}: {e}")
+        sys.exit(1)
+    print(f"🎛️  {len(variants)} variants:")
+    for variant in variants:
+        label = ", labelled" if variant.label else ""
+        colours = ", colours per category" if isinstance(variant.dark, dict) or isinstance(variant.light, dict) else ""
+        print(f"   🖼️  {variant.name}: {variant.size}px, border {variant.border}{label}{colours}")
+
+    # Load tokens
+    print("\n📖 Loading location data...")
+    locations = get_all_locations(load_tokens(), args.payload)
+    print(f"✅ Found {len(locations)} locations")
+
+    # One QR version for the batch so every code has the same module count
+    version = plan_version((location['qr_url'] for location in locations), args.error_correction)
+    modules = version * 4 + 17
+    print(f"📐 QR version {version} for all codes ({modules}x{modules} modules, error correction {args.error_correction})")
+    baseline = plan_version((token_url(location['token'], BASE_URL) for location in locations), args.error_correction)
+    print_payload_savings(args.payload, version, baseline)
+
+    output_dir = OUTPUT_DIR
+    output = open_output(output_dir, args.archive, args.deterministic)
+    print(f"📁 Output: {args.archive or output_dir}")
+
+    print(f"\n🎨 Rendering {len(locations)} locations x {len(variants)} variants...")
+    progress.stage('render', len(locations), version=version, variants=len(variants))
+    success_count = 0
+    encode_seconds = 0.0
+    raster_seconds = 0.0
+
+    with output:
+        for i, location in enumerate(locations, 1):
+            try:
+                # The only encode for this location (or a matrix store read); every variant reuses it
+                started = time.perf_counter()
+                matrix = module_matrix(location['qr_url'], args.error_correction, version)
+                encoded = time.perf_counter()
+                encode_seconds += encoded - started
+                for variant, png in render_variants(matrix, variants, location['type'], location['location_name']):
+                    output.write(variant_file(location, variant, args.layout), png)
+                raster_seconds += time.perf_counter() - encoded
+                progress.advance(f"  ✅ {i:2d}/{len(locations)} - {location['location_name']} -> "
+                                 f"{len(variants)} variants")
+                success_count += 1
+            except Exception as e:
+                progress.fail(location['location_id'], e,
+                              f"  ❌ {i:2d}/{len(locations)} - {location['location_name']} -> Error: {e}")
+
+    # Summary
+    print("\n" + "=" * 60)
+    print("🎉 QR variant generation complete!")
+    print(f"✅ Successfully generated: {success_count}/{len(locations)} locations, "
+          f"{success_count * len(variants)} images")
+    print(f"⏱️  Matrices: {encode_seconds * 1000:.0f} ms ({len(locations)} codes) | "
+          f"Rendering: {raster_seconds * 1000:.0f} ms ({len(locations) * len(variants)} images)")
+    if args.archive:
+        print(f"📦 Archive: {args.archive} ({output.count} files, {os.path.getsize(args.archive):,} bytes)")
+    else:
+        print(f"📂 Files saved in: {output_dir}/")
+    for variant in variants:
+        print(f"   📂 {args.archive or output_dir}/{variant.name}/ - {variant.size}px")
+
+    close_matrix_store(store)
+
+    if args.deterministic and not args.archive:
+        progress.stage('manifest')
+        print_manifest_summary(output_dir, *write_manifest(output_dir))
+
+    progress.finish(generated=success_count, failed=len(locations) - success_count, variants=len(variants),
+                    output=args.archive or output_dir, encode_seconds=round(encode_seconds, 3),
+                    raster_seconds=round(raster_seconds, 3))
+
+    if success_count < len(locations):
+        print(f"\n⚠️  Warning: {len(locations) - success_count} locations failed to generate")
+
+if __name__ == "__main__":
+    main()
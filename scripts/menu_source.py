@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Menu Source Reader for La Strada Hotel
+Reads the exported MenuItem arrays straight out of data/menu-items.ts so the
+Python build steps can work with the same menu the app ships.
+"""
+
+import json
+import re
+
+MENU_ITEMS_FILE = "data/menu-items.ts"
+
+EXPORT_PATTERN = re.compile(r"export const (\w+)\s*:\s*MenuItem\[\]\s*=\s*\[")
+IDENTIFIER_CHARS = re.compile(r"[A-Za-z0-9_$]")
+
+def _find_array_end(source, start):
+    """Return the index just past the ']' matching the '[' at start"""
+    depth = 0
+    i = start
+    while i < len(source):
+        char = source[i]
+        if char in "\"'":
+            i = _skip_string(source, i)
+            continue
+        if source.startswith("//", i):
+            i = source.find("\n", i)
+            if i == -1:
+                break
+            continue
+        if char == "[":
+            depth += 1
+        elif char == "]":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError("Unterminated array literal in menu source")
+
+def _skip_string(source, start):
+    """Return the index just past the string literal starting at start"""
+    quote = source[start]
+    i = start + 1
+    while i < len(source):
+        if source[i] == "\\":
+            i += 2
+            continue
+        if source[i] == quote:
+            return i + 1
+        i += 1
+    raise ValueError("Unterminated string literal in menu source")
+
+def _strip_comments(literal):
+    """Remove // line comments that are not inside string literals"""
+    out = []
+    i = 0
+    while i < len(literal):
+        if literal[i] in "\"'":
+            end = _skip_string(literal, i)
+            out.append(literal[i:end])
+            i = end
+        elif literal.startswith("//", i):
+            newline = literal.find("\n", i)
+            i = len(literal) if newline == -1 else newline
+        else:
+            out.append(literal[i])
+            i += 1
+    return "".join(out)
+
+def _string_to_json(literal):
+    """Re-quote a single or double quoted TypeScript string as JSON"""
+    body = literal[1:-1]
+    if literal[0] == "'":
+        body = body.replace("\\'", "'").replace('"', '\\"')
+    return '"' + body + '"'
+
+def ts_literal_to_json(literal):
+    """Convert a TypeScript object/array literal into JSON text
+
+    Handles the subset used by data/menu-items.ts: line comments, bare
+    property names, single or double quoted strings and trailing commas.
+    """
+    literal = _strip_comments(literal)
+    out = []
+    i = 0
+    while i < len(literal):
+        char = literal[i]
+        if char in "\"'":
+            end = _skip_string(literal, i)
+            out.append(_string_to_json(literal[i:end]))
+            i = end
+            continue
+        if char == ",":
+            # Drop trailing commas before a closing bracket
+            j = i + 1
+            while j < len(literal) and literal[j].isspace():
+                j += 1
+            if j < len(literal) and literal[j] in "]}":
+                i += 1
+                continue
+        if IDENTIFIER_CHARS.match(char):
+            j = i
+            while j < len(literal) and IDENTIFIER_CHARS.match(literal[j]):
+                j += 1
+            word = literal[i:j]
+            k = j
+            while k < len(literal) and literal[k].isspace():
+                k += 1
+            if k < len(literal) and literal[k] == ":" and not word[0].isdigit():
+                out.append('"' + word + '"')
+            else:
+                out.append(word)
+            i = j
+            continue
+        out.append(char)
+        i += 1
+    return "".join(out)
+
+def load_menu_exports(path=MENU_ITEMS_FILE):
+    """Return an ordered dict of export name -> list of menu item dicts"""
+    with open(path, 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    exports = {}
+    for match in EXPORT_PATTERN.finditer(source):
+        start = match.end() - 1
+        end = _find_array_end(source, start)
+        exports[match.group(1)] = json.loads(ts_literal_to_json(source[start:end]))
+    return exports
+
+def load_menu_items(path=MENU_ITEMS_FILE):
+    """Return every menu item in source order"""
+    items = []
+    for export_items in load_menu_exports(path).values():
+        items.extend(export_items)
+    return items
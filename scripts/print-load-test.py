@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Print Service Load Driver for La Strada Hotel
+Sends realistic orders to the print service's POST /print at rising rates
+(or all at once) and reports how many orders per minute it keeps up with.
+Run it against print-service/server.js pointed at fake printers:
+
+    python scripts/fake-escpos-printer.py --ports 9100,9101,9102
+    PRINTER_HOSTS=127.0.0.1:9100,127.0.0.1:9101,127.0.0.1:9102 SEND_ORDER_EMAILS=false node print-service/server.js
+    python scripts/print-load-test.py --rates 5,10,20,40 --step-seconds 60
+
+The service answers once it has handed the tickets to the printers, so its
+response time does not show tickets queueing there. Each step therefore
+also reads the fake printers' stats (--printer-stats): a step keeps up when
+every order is answered, the printers' queues do not build up and ticket
+waits do not keep growing while the step runs. Without printer stats only
+the response times are judged, and the report says so.
+"""
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+from menu_source import MENU_ITEMS_FILE, load_menu_items
+
+# Configuration
+PRINT_URL = "http://localhost:3001/print"
+AUTH_TOKEN = "LA_STRADA_PRINT_SUPER_SECRET_TOKEN_123!"
+TOKENS_FILE = "data/tokens.json"
+RATES = "5,10,20,40"
+STEP_SECONDS = 60
+MAX_IN_FLIGHT = 50
+REQUEST_TIMEOUT = 120
+PRINTER_STATS_URL = "http://127.0.0.1:9199/stats"
+STATS_TIMEOUT = 5
+PRINTER_POLL_SECONDS = 0.5
+# Tickets waiting per printer at the end of a step before it counts as backing up
+MAX_QUEUED_PER_PRINTER = 2
+NOTES = ["", "", "", "Az pişmiş", "Buzsuz", "Acısız lütfen", "Extra napkins"]
+
+def load_tokens():
+    """Load tokens from JSON file"""
+    try:
+        with open(TOKENS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"❌ Error: {TOKENS_FILE} not found!")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"❌ Error: Invalid JSON in {TOKENS_FILE}")
+        sys.exit(1)
+
+def make_order(number, locations, items, rng):
+    """An order shaped like the one app/checkout/page.tsx posts"""
+    lines = []
+    for item in rng.sample(items, rng.randint(1, 5)):
+        lines.append({
+            'id': item['id'],
+            'nameKey': item['nameKey'],
+            'quantity': rng.randint(1, 3),
+            'price': item['price'],
+            'notes': rng.choice(NOTES),
+        })
+    total = sum(line['price'] * line['quantity'] for line in lines)
+    location = rng.choice(locations)
+    return {
+        'orderNumber': f"LT{number:06d}",
+        'orderTime': datetime.now(timezone.utc).isoformat(),
+        'locationInfo': location,
+        'roomOrTableNumber': location,
+        'customerEmail': None,
+        'customerLanguage': rng.choice(['tr', 'en', 'el', 'bg']),
+        'items': lines,
+        'subtotal': total,
+        'tax': 0,
+        'total': total,
+    }
+
+def send_order(url, token, order):
+    """POST one order; returns (status or error text, seconds)"""
+    request = urllib.request.Request(url, data=json.dumps(order).encode('utf-8'), method='POST', headers={
+        'Content-Type': 'application/json',
+        'Authorization': f"Bearer {token}",
+    })
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    except (urllib.error.URLError, OSError) as e:
+        status = type(getattr(e, 'reason', e)).__name__
+    return status, time.perf_counter() - started
+
+def read_printer_stats(url):
+    """The fake printers' stats (see fake-escpos-printer.py), or None if they cannot be read"""
+    if not url:
+        return None
+    try:
+        with urllib.request.urlopen(url, timeout=STATS_TIMEOUT) as response:
+            return json.load(response)['printers']
+    except (urllib.error.URLError, OSError, ValueError, KeyError):
+        return None
+
+def wait_for_printers(url, timeout):
+    """Poll the printer stats until nothing is queued; returns (stats, seconds waited)"""
+    started = time.perf_counter()
+    while True:
+        printers = read_printer_stats(url)
+        waited = time.perf_counter() - started
+        if printers is None or not sum(printer['queued'] for printer in printers) or waited > timeout:
+            return printers, waited
+        time.sleep(PRINTER_POLL_SECONDS)
+
+def growing(values):
+    """True if the last third of values is clearly above the first third"""
+    third = max(1, len(values) // 3)
+    early = statistics.median(values[:third])
+    late = statistics.median(values[-third:])
+    return late > early * 1.5 + 0.5, early, late
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+class OrderSource:
+    """Thread-safe numbered orders from the real menu and locations"""
+
+    def __init__(self, seed):
+        self.rng = random.Random(seed)
+        self.locations = [data['name'] for data in load_tokens().values()]
+        self.items = [item for item in load_menu_items() if item.get('nameKey') and 'price' in item]
+        self.number = 0
+        self.lock = threading.Lock()
+
+    def next(self):
+        with self.lock:
+            self.number += 1
+            return make_order(self.number, self.locations, self.items, self.rng)
+
+def run_step(pool, url, token, source, rate, seconds, max_in_flight):
+    """Send rate orders per minute for seconds; returns [(sent at, status, latency)]"""
+    results = []
+    in_flight = threading.Semaphore(max_in_flight)
+    futures = []
+    interval = 60 / rate
+    started = time.perf_counter()
+    count = max(1, int(rate * seconds / 60))
+    skipped = 0
+
+    def task(order, sent_at):
+        try:
+            status, latency = send_order(url, token, order)
+            results.append((sent_at, status, latency))
+        finally:
+            in_flight.release()
+
+    for i in range(count):
+        time.sleep(max(0.0, started + i * interval - time.perf_counter()))
+        if not in_flight.acquire(blocking=False):
+            # The service is already holding max_in_flight orders
+            skipped += 1
+            continue
+        futures.append(pool.submit(task, source.next(), time.perf_counter() - started))
+    for future in futures:
+        future.result()
+    return results, skipped, time.perf_counter() - started
+
+def run_burst(pool, url, token, source, orders):
+    """Send orders all at once; returns the same as run_step"""
+    started = time.perf_counter()
+    results = []
+
+    def task(order):
+        status, latency = send_order(url, token, order)
+        results.append((0.0, status, latency))
+
+    for future in [pool.submit(task, source.next()) for _ in range(orders)]:
+        future.result()
+    return results, 0, time.perf_counter() - started
+
+def report(label, results, skipped, elapsed, offered=None, printers=None, since=None):
+    """Print one step's numbers; returns True if it kept up
+
+    printers is the fake printers' stats read after the step and since the
+    wall-clock time the step started; without them only the service's
+    response times are judged.
+    """
+    latencies = [latency for _, status, latency in results if status in (200, 207)]
+    statuses = {}
+    for _, status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    done_rate = len(latencies) * 60 / elapsed if elapsed else 0
+
+    print(f"\n📊 {label}: {len(results)} sent, {len(latencies)} answered in {elapsed:.1f}s "
+          f"({done_rate:.1f} orders/min)")
+    print("   📬 Responses: " + ", ".join(f"{status}: {count}" for status, count in sorted(statuses.items(), key=str)))
+    if skipped:
+        print(f"   ⏭️  {skipped} orders not sent: too many already waiting on the service (--max-in-flight)")
+    if not latencies:
+        print("   ❌ No order was answered")
+        return False
+    print(f"   ⏱️  Response p50 {statistics.median(latencies):.2f}s, p95 {percentile(latencies, 0.95):.2f}s, "
+          f"max {max(latencies):.2f}s")
+
+    answered = not skipped and len(latencies) == len(results)
+    if printers is not None:
+        tickets = sorted((finished, wait) for printer in printers for finished, wait in printer['recent']
+                         if finished >= since)
+        queued = sum(printer['queued'] for printer in printers)
+        waits = [wait for _, wait in tickets]
+        if waits:
+            print(f"   🖨️  Tickets: {len(waits)} printed, wait p50 {statistics.median(waits):.2f}s, "
+                  f"p95 {percentile(waits, 0.95):.2f}s; {queued} still queued at the printers")
+        else:
+            print(f"   🖨️  Tickets: none printed yet; {queued} queued at the printers")
+    if offered is None:
+        return True
+
+    if printers is None:
+        # Response times only: late orders answered clearly slower than early ones, or some never went out
+        ordered = [latency for _, status, latency in sorted(results, key=lambda result: result[0])
+                   if status in (200, 207)]
+        slowing, early, late = growing(ordered)
+        kept_up = answered and not slowing
+        what = "orders answered"
+    else:
+        # Tickets: the printers' queues build up or each ticket waits longer than the last
+        backlog = queued > MAX_QUEUED_PER_PRINTER * len(printers)
+        slowing, early, late = growing(waits) if waits else (True, 0, 0)
+        kept_up = answered and not backlog and not slowing
+        what = "tickets printed"
+    if kept_up:
+        print(f"   ✅ Kept up with {offered:g} orders/min")
+    else:
+        print(f"   ⚠️  Backing up at {offered:g} orders/min (early {what} {early:.2f}s, late {late:.2f}s"
+              f"{f', {queued} tickets queued' if printers is not None else ''})")
+    return kept_up
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Load-test the print service's POST /print")
+    parser.add_argument('--url', default=PRINT_URL, help=f"print endpoint (default: {PRINT_URL})")
+    parser.add_argument('--token', default=AUTH_TOKEN, help="bearer token the service expects")
+    parser.add_argument('--rates', default=RATES, metavar='LIST',
+                        help=f"comma-separated orders per minute, one step each (default: {RATES})")
+    parser.add_argument('--step-seconds', type=float, default=STEP_SECONDS,
+                        help=f"length of each rate step (default: {STEP_SECONDS})")
+    parser.add_argument('--burst', type=int, metavar='N', help="instead of steps, send N orders at the same time")
+    parser.add_argument('--max-in-flight', type=int, default=MAX_IN_FLIGHT,
+                        help=f"orders waiting on the service before new ones are dropped (default: {MAX_IN_FLIGHT})")
+    parser.add_argument('--printer-stats', default=PRINTER_STATS_URL, metavar='URL',
+                        help=f"fake printers' stats endpoint, '' to judge by response times only "
+                             f"(default: {PRINTER_STATS_URL})")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for the generated orders (default: 0)")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    print("🏨 La Strada Hotel - Print Service Load Test")
+    print("=" * 60)
+
+    try:
+        source = OrderSource(args.seed)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ Error: Could not read {MENU_ITEMS_FILE}: {e}")
+        sys.exit(1)
+    print(f"📖 {len(source.items)} menu items, {len(source.locations)} locations")
+    print(f"🎯 Target: {args.url}")
+    printers = read_printer_stats(args.printer_stats)
+    if printers is None:
+        print("⚠️  No printer stats: judging by the service's response times only, which do not show "
+              "tickets queueing at the printers")
+        print("   Run scripts/fake-escpos-printer.py (its stats port) and pass --printer-stats to measure tickets")
+    else:
+        print(f"🖨️  Reading {len(printers)} printers' queues from {args.printer_stats}")
+
+    workers = args.burst or args.max_in_flight
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        if args.burst:
+            print(f"\n💥 Sending {args.burst} orders at once...")
+            since = time.time()
+            results = run_burst(pool, args.url, args.token, source, args.burst)
+            burst_printers = None
+            if printers is not None:
+                print("🖨️  Waiting for the printers to clear the burst...")
+                burst_printers, waited = wait_for_printers(args.printer_stats, REQUEST_TIMEOUT)
+                print(f"   Printers {'cleared' if burst_printers is not None else 'stopped answering after'} "
+                      f"{waited:.1f}s after the last response")
+            report(f"Burst of {args.burst}", *results, printers=burst_printers, since=since)
+            return
+
+        sustained = None
+        for rate in [float(rate) for rate in args.rates.split(',')]:
+            print(f"\n🚦 {rate:g} orders/min for {args.step_seconds:g}s...")
+            since = time.time()
+            results, skipped, elapsed = run_step(pool, args.url, args.token, source, rate, args.step_seconds,
+                                                 args.max_in_flight)
+            step_printers = printers and read_printer_stats(args.printer_stats)
+            if printers and step_printers is None:
+                print("   ⚠️  Printer stats stopped answering; judging this step by response times only")
+            if report(f"{rate:g} orders/min", results, skipped, elapsed, offered=rate, printers=step_printers,
+                      since=since):
+                sustained = rate
+            else:
+                break
+
+    print("\n" + "=" * 60)
+    if sustained is None:
+        print("⚠️  The print path did not keep up with the first rate")
+    elif printers is None:
+        print(f"🎉 The service answered {sustained:g} orders/min without slowing down")
+        print("   ⚠️  Printer queues were not measured, so tickets may still have been backing up")
+    else:
+        print(f"🎉 Sustained {sustained:g} orders/min before tickets started backing up")
+
+if __name__ == "__main__":
+    main()
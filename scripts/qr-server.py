@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+"""
+On-Demand QR Code Server for La Strada Hotel
+Serves /qr/<token>.png and /qr/<token>.svg straight from data/tokens.json,
+so a re-issued code is available the moment the token changes.
+
+    python scripts/qr-server.py --port 8700
+    curl -O http://localhost:8700/qr/qr_101_t9u2v5w8x1y4.png?size=8
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+try:
+    from qr_render import BORDER, BOX_SIZE, plan_version, render_png, render_svg
+except ImportError:
+    print("❌ Required libraries not installed!")
+    print("📦 Please install them with:")
+    print("   pip install qrcode[pil] pillow")
+    sys.exit(1)
+
+# Configuration
+BASE_URL = "https://menu.theplazahoteledirne.com"
+TOKENS_FILE = "data/tokens.json"
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8700
+DEFAULT_CACHE_ENTRIES = 256
+MAX_BOX_SIZE = 40
+MAX_BORDER = 16
+CACHE_CONTROL = "public, max-age=3600"
+
+QR_PATH = re.compile(r"^/qr/([A-Za-z0-9_-]{1,64})\.(png|svg)$")
+RENDERERS = {
+    'png': ('image/png', render_png),
+    'svg': ('image/svg+xml', render_svg),
+}
+
+class TokenRegistry:
+    """token -> location lookup that reloads tokens.json whenever it changes
+
+    On every reload it also plans the one QR version all locations fit into,
+    so codes served here match the printed batch in size.
+    """
+
+    def __init__(self, path, base_url):
+        self.path = path
+        self.base_url = base_url
+        self.lock = threading.Lock()
+        self.mtime = None
+        self.by_token = {}
+        self.version = None
+
+    def payload(self, token):
+        return f"{self.base_url}?token={token}"
+
+    def get(self, token):
+        """Return (location, version), or (None, None) for an unknown token"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return None, None
+        with self.lock:
+            if mtime != self.mtime:
+                self.mtime = mtime
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        tokens = json.load(f)
+                    by_token = {data['token']: data for data in tokens.values()}
+                except (OSError, json.JSONDecodeError, KeyError, TypeError, AttributeError) as e:
+                    # Half-saved or broken edit: keep serving the last good registry
+                    print(f"⚠️  Could not reload {self.path} ({e!r}); still serving the previous tokens")
+                else:
+                    self.by_token = by_token
+                    self.version = plan_version(self.payload(known) for known in self.by_token)
+            return self.by_token.get(token), self.version
+
+class ResponseCache:
+    """Bounded LRU of rendered bodies and their ETags"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, render):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        # Render outside the lock; two threads racing on one key is harmless
+        body = render()
+        entry = (f'"{hashlib.sha256(body).hexdigest()[:32]}"', body)
+        with self.lock:
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return entry
+
+def int_option(query, name, default, low, high):
+    """Read a bounded integer query parameter; None if it is invalid"""
+    values = query.get(name)
+    if not values:
+        return default
+    try:
+        value = int(values[-1])
+    except ValueError:
+        return None
+    return value if low <= value <= high else None
+
+def etag_matches(header, etag):
+    """True if an If-None-Match header covers this ETag"""
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(',')]
+    return '*' in candidates or etag in candidates or f"W/{etag}" in candidates
+
+class QRRequestHandler(BaseHTTPRequestHandler):
+    server_version = "LaStradaQR/1.0"
+
+    def do_GET(self):
+        self.handle_qr(send_body=True)
+
+    def do_HEAD(self):
+        self.handle_qr(send_body=False)
+
+    def handle_qr(self, send_body):
+        url = urlsplit(self.path)
+        match = QR_PATH.match(url.path)
+        if not match:
+            return self.send_error(HTTPStatus.NOT_FOUND, "Use /qr/<token>.png or /qr/<token>.svg")
+        token, extension = match.groups()
+
+        location, version = self.server.registry.get(token)
+        if location is None:
+            return self.send_error(HTTPStatus.NOT_FOUND, "Unknown token")
+
+        query = parse_qs(url.query)
+        box_size = int_option(query, 'size', BOX_SIZE, 1, MAX_BOX_SIZE)
+        border = int_option(query, 'border', BORDER, 0, MAX_BORDER)
+        if box_size is None or border is None:
+            return self.send_error(HTTPStatus.BAD_REQUEST,
+                                   f"size must be 1-{MAX_BOX_SIZE} and border 0-{MAX_BORDER}")
+
+        content_type, render = RENDERERS[extension]
+        payload = self.server.registry.payload(location['token'])
+        etag, body = self.server.cache.get(
+            (payload, extension, box_size, border, version),
+            lambda: render(payload, box_size=box_size, border=border, version=version),
+        )
+
+        if etag_matches(self.headers.get('If-None-Match'), etag):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', CACHE_CONTROL)
+            self.end_headers()
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.send_header('Cache-Control', CACHE_CONTROL)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Serve location QR codes on demand")
+    parser.add_argument('--host', default=DEFAULT_HOST, help=f"address to bind (default: {DEFAULT_HOST})")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help=f"port to listen on (default: {DEFAULT_PORT})")
+    parser.add_argument('--base-url', default=BASE_URL,
+                        help="menu URL the codes point to (use http://localhost:3000 for local testing)")
+    parser.add_argument('--cache-entries', type=int, default=DEFAULT_CACHE_ENTRIES,
+                        help=f"rendered codes kept in memory (default: {DEFAULT_CACHE_ENTRIES})")
+    parser.add_argument('--quiet', action='store_true', help="do not log each request")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    print("🏨 La Strada Hotel - On-Demand QR Server")
+    print("=" * 50)
+
+    if not os.path.exists(TOKENS_FILE):
+        print(f"❌ Error: {TOKENS_FILE} not found!")
+        sys.exit(1)
+
+    server = ThreadingHTTPServer((args.host, args.port), QRRequestHandler)
+    server.registry = TokenRegistry(TOKENS_FILE, args.base_url.rstrip('/'))
+    server.cache = ResponseCache(args.cache_entries)
+    server.quiet = args.quiet
+
+    print(f"🔗 Codes point to: {server.registry.base_url}")
+    print(f"🌐 Serving on http://{args.host}:{args.port}/qr/<token>.png (or .svg)")
+    print("   Options: ?size=<pixels per module>&border=<modules>")
+    print("⏹️  Press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n👋 Stopped ({server.cache.hits} cache hits, {server.cache.misses} renders)")
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
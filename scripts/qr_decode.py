@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+QR Code Reader for La Strada Hotel
+Decodes the clean, axis-aligned QR code images our generators produce by
+sampling the module grid with NumPy. It is not a camera scanner: it expects
+a straight, unrotated code on a white background (label text below is fine).
+"""
+
+import numpy as np
+from qrcode import base, util
+
+class QRDecodeError(Exception):
+    """Raised when an image does not hold a readable QR code"""
+
+def load_dark_pixels(image_path):
+    """Return a boolean array that is True for dark pixels"""
+    from PIL import Image
+
+    with Image.open(image_path) as img:
+        pixels = np.asarray(img.convert('L'))
+    return pixels < 128
+
+def sample_modules(dark):
+    """Locate the symbol and sample the centre of every module
+
+    The top-left finder pattern gives the symbol origin and module size (it
+    is 7 modules wide); the right edge of the top-right finder on the same
+    row gives the symbol width.
+    """
+    rows = np.flatnonzero(dark.any(axis=1))
+    if rows.size == 0:
+        raise QRDecodeError("image has no dark pixels")
+    top = rows[0]
+    top_row = dark[top]
+    left = np.flatnonzero(top_row)[0]
+
+    finder_end = left
+    while finder_end < top_row.size and top_row[finder_end]:
+        finder_end += 1
+    box = (finder_end - left) / 7.0
+    right = np.flatnonzero(top_row)[-1]
+
+    modules_count = int(round((right - left + 1) / box))
+    if modules_count < 21 or (modules_count - 17) % 4:
+        raise QRDecodeError(f"symbol width of {modules_count} modules is not a valid QR size")
+
+    centers = (np.arange(modules_count) + 0.5) * box
+    ys = np.minimum((top + centers).astype(int), dark.shape[0] - 1)
+    xs = np.minimum((left + centers).astype(int), dark.shape[1] - 1)
+    return dark[np.ix_(ys, xs)]
+
+def function_pattern_mask(version):
+    """Return a boolean grid that is True on non-data (function) modules"""
+    count = version * 4 + 17
+    reserved = np.zeros((count, count), dtype=bool)
+
+    # Finder patterns with separators, plus the format information strips
+    reserved[:9, :9] = True
+    reserved[:9, count - 8:] = True
+    reserved[count - 8:, :9] = True
+
+    positions = util.pattern_position(version)
+    for row in positions:
+        for col in positions:
+            if reserved[row, col]:
+                continue
+            reserved[row - 2:row + 3, col - 2:col + 3] = True
+
+    # Timing patterns (after the alignment patterns, which may sit on them)
+    reserved[6, :] = True
+    reserved[:, 6] = True
+
+    # Version information blocks
+    if version >= 7:
+        reserved[:6, count - 11:count - 8] = True
+        reserved[count - 11:count - 8, :6] = True
+
+    return reserved
+
+def read_format(modules):
+    """Return (error_correction, mask_pattern) from the format bits"""
+    count = len(modules)
+    vertical = 0
+    horizontal = 0
+    for i in range(15):
+        if i < 6:
+            v = modules[i][8]
+        elif i < 8:
+            v = modules[i + 1][8]
+        else:
+            v = modules[count - 15 + i][8]
+        vertical |= int(v) << i
+
+        if i < 8:
+            h = modules[8][count - i - 1]
+        elif i < 9:
+            h = modules[8][15 - i]
+        else:
+            h = modules[8][15 - i - 1]
+        horizontal |= int(h) << i
+
+    best = None
+    for data in range(32):
+        expected = util.BCH_type_info(data)
+        distance = min(bin(expected ^ vertical).count('1'), bin(expected ^ horizontal).count('1'))
+        if best is None or distance < best[0]:
+            best = (distance, data)
+    if best[0] > 3:
+        raise QRDecodeError("format information is unreadable")
+    return best[1] >> 3, best[1] & 7
+
+def read_codewords(modules, version, mask_pattern):
+    """Read the raw codewords in placement order, undoing the mask"""
+    count = len(modules)
+    reserved = function_pattern_mask(version)
+    mask = util.mask_func(mask_pattern)
+
+    bits = []
+    row = count - 1
+    inc = -1
+    for col in range(count - 1, 0, -2):
+        if col <= 6:
+            col -= 1
+        while True:
+            for c in (col, col - 1):
+                if not reserved[row][c]:
+                    bits.append(bool(modules[row][c]) != mask(row, c))
+            row += inc
+            if row < 0 or row >= count:
+                row -= inc
+                inc = -inc
+                break
+
+    codewords = []
+    for i in range(0, len(bits) - 7, 8):
+        value = 0
+        for bit in bits[i:i + 8]:
+            value = (value << 1) | bit
+        codewords.append(value)
+    return codewords
+
+def deinterleave(codewords, blocks):
+    """Split interleaved codewords back into (data, ecc) per RS block"""
+    data_blocks = [[] for _ in blocks]
+    ecc_blocks = [[] for _ in blocks]
+    position = 0
+    for i in range(max(block.data_count for block in blocks)):
+        for j, block in enumerate(blocks):
+            if i < block.data_count:
+                data_blocks[j].append(codewords[position])
+                position += 1
+    for i in range(max(block.total_count - block.data_count for block in blocks)):
+        for j, block in enumerate(blocks):
+            if i < block.total_count - block.data_count:
+                ecc_blocks[j].append(codewords[position])
+                position += 1
+    return data_blocks, ecc_blocks
+
+def has_clean_syndromes(block):
+    """True if a data+ecc block has all-zero Reed-Solomon syndromes"""
+    ecc_count = len(block[1])
+    codeword = block[0] + block[1]
+    for j in range(ecc_count):
+        syndrome = 0
+        for value in codeword:
+            # Horner evaluation at alpha^j
+            syndrome = (base.gexp(base.glog(syndrome) + j) if syndrome else 0) ^ value
+        if syndrome:
+            return False
+    return True
+
+def parse_segments(data, version):
+    """Decode the mode segments in the data codewords into bytes"""
+    bits = ''.join(f'{value:08b}' for value in data)
+    position = 0
+    payload = bytearray()
+
+    def take(length):
+        nonlocal position
+        if position + length > len(bits):
+            raise QRDecodeError("data segment runs past the end of the symbol")
+        value = int(bits[position:position + length], 2)
+        position += length
+        return value
+
+    while position + 4 <= len(bits):
+        mode = take(4)
+        if mode == 0:
+            break
+        if mode not in (util.MODE_NUMBER, util.MODE_ALPHA_NUM, util.MODE_8BIT_BYTE):
+            raise QRDecodeError(f"unsupported segment mode {mode}")
+        length = take(util.length_in_bits(mode, version))
+        if mode == util.MODE_NUMBER:
+            digits = ''
+            while len(digits) < length:
+                width = min(3, length - len(digits))
+                digits += str(take(util.NUMBER_LENGTH[width])).zfill(width)
+            payload += digits.encode('ascii')
+        elif mode == util.MODE_ALPHA_NUM:
+            for _ in range(length // 2):
+                value = take(11)
+                payload += bytes((util.ALPHA_NUM[value // 45], util.ALPHA_NUM[value % 45]))
+            if length % 2:
+                payload += bytes((util.ALPHA_NUM[take(6)],))
+        else:
+            payload += bytes(take(8) for _ in range(length))
+    return bytes(payload)
+
+def decode_modules(modules):
+    """Decode a sampled module grid into its payload bytes"""
+    count = len(modules)
+    version = (count - 17) // 4
+    error_correction, mask_pattern = read_format(modules)
+    codewords = read_codewords(modules, version, mask_pattern)
+
+    blocks = base.rs_blocks(version, error_correction)
+    data_blocks, ecc_blocks = deinterleave(codewords, blocks)
+    for block in zip(data_blocks, ecc_blocks):
+        if not has_clean_syndromes(block):
+            raise QRDecodeError("Reed-Solomon check failed (damaged or mis-sampled code)")
+
+    data = [value for block in data_blocks for value in block]
+    return parse_segments(data, version)
+
+def decode_image(image_path):
+    """Decode the QR code in an image file and return its text"""
+    modules = sample_modules(load_dark_pixels(image_path))
+    return decode_modules(modules.tolist()).decode('utf-8')
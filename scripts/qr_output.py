@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Shared Output Helpers for the La Strada Hotel QR generators
+Deterministic timestamps, stable PNG encoding, canonical JSON,
+write-if-changed, the content-hash manifest used to sync only what really
+changed, the flat or sharded file layout (and where gallery thumbnails go),
+and the folder/archive writers the generators stream their files into.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+import zipfile
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+MANIFEST_FILE = "manifest.json"
+PNG_COMPRESS_LEVEL = 9
+
+def generated_suffix(deterministic=False):
+    """Return the ' | Generated: ...' text shown in gallery headers
+
+    In deterministic mode the time comes from SOURCE_DATE_EPOCH when it is
+    set and is left out otherwise, so reruns produce identical pages.
+    """
+    if not deterministic:
+        return f" | Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    epoch = os.environ.get('SOURCE_DATE_EPOCH')
+    if epoch:
+        stamp = datetime.fromtimestamp(int(epoch), timezone.utc)
+        return f" | Generated: {stamp.strftime('%Y-%m-%d %H:%M:%S')}"
+    return ""
+
+def encode_png(image):
+    """Encode an image to PNG bytes with fixed settings and no metadata chunks"""
+    if hasattr(image, 'get_image'):
+        # qrcode's PilImage wrapper
+        image = image.get_image()
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', optimize=False, compress_level=PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+def canonical_json(data):
+    """Serialize data the same way on every run so content hashes and unchanged files stay stable"""
+    return json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+
+def write_if_changed(path, data):
+    """Write bytes to path unless it already holds exactly those bytes
+
+    Unchanged files keep their mtime, so rsync and CDN uploads skip them.
+    Returns True when the file was written.
+    """
+    if isinstance(data, str):
+        data = data.encode('utf-8')
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+def save_png(image, output_path, deterministic=False):
+    """Save a QR image, byte-reproducibly when deterministic is set"""
+    if deterministic:
+        return write_if_changed(output_path, encode_png(image))
+    image.save(output_path, 'PNG')
+    return True
+
+def write_text(output_path, text, deterministic=False):
+    """Write an HTML/text file, skipping identical rewrites when deterministic"""
+    if deterministic:
+        return write_if_changed(output_path, text)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return True
+
+def file_sha256(path):
+    """Return the hex SHA-256 of a file"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def build_manifest(output_dir):
+    """Hash every file under output_dir (except the manifest itself)"""
+    files = {}
+    for root, dirs, names in os.walk(output_dir):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            relative = os.path.relpath(path, output_dir).replace(os.sep, '/')
+            if relative == MANIFEST_FILE:
+                continue
+            files[relative] = {'sha256': file_sha256(path), 'size': os.path.getsize(path)}
+
+    by_hash = {}
+    for relative, entry in files.items():
+        by_hash.setdefault(entry['sha256'], []).append(relative)
+    duplicates = sorted(sorted(paths) for paths in by_hash.values() if len(paths) > 1)
+
+    return {'files': files, 'duplicates': duplicates}
+
+def load_manifest(output_dir):
+    """Return the previously written manifest, or an empty one"""
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {'files': {}, 'duplicates': []}
+
+def write_manifest(output_dir):
+    """Write manifest.json and report what changed since the last one
+
+    Returns (manifest, added, changed, removed) where the last three are
+    sorted lists of relative paths. Only those need to be uploaded/deleted.
+    """
+    previous = load_manifest(output_dir)['files']
+    manifest = build_manifest(output_dir)
+    current = manifest['files']
+
+    added = sorted(set(current) - set(previous))
+    removed = sorted(set(previous) - set(current))
+    changed = sorted(path for path in set(current) & set(previous)
+                     if current[path]['sha256'] != previous[path]['sha256'])
+
+    text = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+    write_if_changed(os.path.join(output_dir, MANIFEST_FILE), text)
+    return manifest, added, changed, removed
+
+def print_manifest_summary(output_dir, manifest, added, changed, removed):
+    """Print the manifest diff in the generators' console style"""
+    duplicate_copies = sum(len(paths) - 1 for paths in manifest['duplicates'])
+    print(f"\n🧾 Manifest: {output_dir}/{MANIFEST_FILE} ({len(manifest['files'])} files)")
+    print(f"   ➕ Added: {len(added)} | ✏️  Changed: {len(changed)} | ➖ Removed: {len(removed)}")
+    if duplicate_copies:
+        print(f"   🔁 {duplicate_copies} files are byte-identical copies of another file")
+    if not (added or changed or removed):
+        print("   ✅ Nothing changed since the last run - no upload needed")
+
+# File layouts: 'flat' keeps each location's files side by side as always;
+# 'sharded' nests them as <category>/<xx>/<file>, where xx is the first hex
+# digits of a hash of the location ID, so no folder grows past a few
+# hundred entries however many locations there are
+LAYOUTS = ('flat', 'sharded')
+SHARD_DIGITS = 2  # 256 shards per category
+
+def shard_of(key):
+    """Shard folder name for a location ID; stable across token re-issues"""
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:SHARD_DIGITS]
+
+def layout_path(filename, key, category=None, layout='flat'):
+    """Relative path of one location's file in the given layout"""
+    if layout == 'sharded':
+        return f"{category}/{shard_of(key)}/{filename}" if category else f"{shard_of(key)}/{filename}"
+    return f"{category}/{filename}" if category else filename
+
+def find_layout_file(directory, filename, key, category=None):
+    """Path of a generated file in directory whichever layout wrote it, or None"""
+    candidates = [layout_path(filename, key, category, 'sharded'), filename]
+    if category:
+        candidates.insert(1, layout_path(filename, key, category))
+    for relative_path in candidates:
+        path = os.path.join(directory, *relative_path.split('/'))
+        if os.path.exists(path):
+            return path
+    return None
+
+# Gallery thumbnails sit under thumbs/<density>x/ mirroring the full-size file's path
+THUMBNAIL_FOLDER = "thumbs"
+THUMBNAIL_DENSITIES = (1, 2)
+
+def thumbnail_file(path, density):
+    """Relative path of the density-x thumbnail of the full-size file at path"""
+    return f"{THUMBNAIL_FOLDER}/{density}x/{path}"
+
+def add_layout_arg(parser):
+    """Add the shared --layout option to a generator's parser"""
+    parser.add_argument('--layout', choices=LAYOUTS, default='flat',
+                        help="flat: every file in one folder (default); sharded: <category>/<xx>/ "
+                             "subfolders keyed by a hash of the location ID, for very large batches")
+
+# Fixed entry time for deterministic archives (the earliest date ZIP can store)
+ARCHIVE_EPOCH = 315532800
+
+def archive_timestamp(deterministic=False):
+    """Return the mtime stamped on archive entries"""
+    if not deterministic:
+        return int(time.time())
+    return max(int(os.environ.get('SOURCE_DATE_EPOCH', ARCHIVE_EPOCH)), ARCHIVE_EPOCH)
+
+class OutputWriter(ABC):
+    """Base for the places a generator run writes its files to"""
+
+    count = 0
+
+    @abstractmethod
+    def write(self, relative_path, data):
+        """Write one file (bytes or text) at relative_path"""
+
+    @abstractmethod
+    def open_text(self, relative_path):
+        """Context manager yielding a text file for writing a large file piece by piece"""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class DirectoryWriter(OutputWriter):
+    """Writes generated files into an output folder"""
+
+    def __init__(self, output_dir, deterministic=False):
+        self.output_dir = output_dir
+        self.deterministic = deterministic
+        os.makedirs(output_dir, exist_ok=True)
+
+    def path(self, relative_path):
+        path = os.path.join(self.output_dir, *relative_path.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        return path
+
+    def write(self, relative_path, data):
+        path = self.path(relative_path)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        if self.deterministic:
+            write_if_changed(path, data)
+        else:
+            with open(path, 'wb') as f:
+                f.write(data)
+        self.count += 1
+
+    def remove(self, relative_path):
+        """Delete a previously written file; returns True if it existed"""
+        try:
+            os.remove(os.path.join(self.output_dir, *relative_path.split('/')))
+        except FileNotFoundError:
+            return False
+        return True
+
+    @contextmanager
+    def open_text(self, relative_path):
+        path = self.path(relative_path)
+        temp_path = path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8', newline='') as f:
+                yield f
+            if self.deterministic and os.path.exists(path) and file_sha256(path) == file_sha256(temp_path):
+                os.remove(temp_path)
+            else:
+                os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        self.count += 1
+
+class ArchiveWriter(OutputWriter):
+    """Streams generated files into one .zip, .tar, .tar.gz or .tgz archive
+
+    Nothing is written to the filesystem per file; PNGs are stored as-is in
+    ZIPs (they are already compressed) and text files are deflated.
+    """
+
+    def __init__(self, archive_path, deterministic=False):
+        self.archive_path = archive_path
+        self.mtime = archive_timestamp(deterministic)
+        directory = os.path.dirname(archive_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        lower = archive_path.lower()
+        if lower.endswith('.zip'):
+            self.zip = zipfile.ZipFile(archive_path, 'w')
+            self.tar = None
+            self.gzip = None
+        elif lower.endswith(('.tar.gz', '.tgz')):
+            self.zip = None
+            # Open the gzip layer ourselves so its header carries a fixed mtime
+            # and no file name
+            self.raw = open(archive_path, 'wb')
+            self.gzip = gzip.GzipFile(filename='', mode='wb', fileobj=self.raw, mtime=self.mtime)
+            self.tar = tarfile.open(fileobj=self.gzip, mode='w')
+        elif lower.endswith('.tar'):
+            self.zip = None
+            self.gzip = None
+            self.tar = tarfile.open(archive_path, 'w')
+        else:
+            raise ValueError(f"unsupported archive type: {archive_path} (use .zip, .tar, .tar.gz or .tgz)")
+
+    def add(self, relative_path, fileobj, size):
+        """Add one entry, copying size bytes from fileobj"""
+        if self.zip is not None:
+            info = zipfile.ZipInfo(relative_path, time.gmtime(self.mtime)[:6])
+            info.external_attr = 0o644 << 16
+            info.compress_type = zipfile.ZIP_STORED if relative_path.endswith('.png') else zipfile.ZIP_DEFLATED
+            info.file_size = size
+            with self.zip.open(info, 'w') as entry:
+                shutil.copyfileobj(fileobj, entry)
+        else:
+            info = tarfile.TarInfo(relative_path)
+            info.size = size
+            info.mtime = self.mtime
+            info.mode = 0o644
+            self.tar.addfile(info, fileobj)
+        self.count += 1
+
+    def write(self, relative_path, data):
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        self.add(relative_path, io.BytesIO(data), len(data))
+
+    @contextmanager
+    def open_text(self, relative_path):
+        # Entries cannot interleave inside an archive, so spool to a temp file
+        with tempfile.TemporaryFile() as spool:
+            text = io.TextIOWrapper(spool, encoding='utf-8', newline='')
+            yield text
+            text.flush()
+            text.detach()
+            size = spool.tell()
+            spool.seek(0)
+            self.add(relative_path, spool, size)
+
+    def close(self):
+        if self.zip is not None:
+            self.zip.close()
+        else:
+            self.tar.close()
+            if self.gzip is not None:
+                self.gzip.close()
+                self.raw.close()
+
+def open_output(output_dir, archive_path=None, deterministic=False):
+    """Return the writer for this run: an archive when a path is given, else a folder"""
+    if archive_path:
+        return ArchiveWriter(archive_path, deterministic)
+    return DirectoryWriter(output_dir, deterministic)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Payload Optimizer for the La Strada Hotel QR generators
+Rewrites a location's URL so more of it fits QR alphanumeric mode (11 bits
+per 2 characters instead of 8 bits per character in byte mode), which can
+bring the whole batch down a QR version:
+
+    url       https://menu.theplazahoteledirne.com?token=qr_101_t9u2v5w8x1y4
+    segments  HTTPS://MENU.THEPLAZAHOTELEDIRNE.COM?token=qr_101_t9u2v5w8x1y4
+    short     HTTPS://MENU.THEPLAZAHOTELEDIRNE.COM/T/QR-101-T9U2V5W8X1Y4
+
+'segments' upper-cases only the scheme and host, which are case-insensitive,
+so the link works unchanged; qrcode then encodes that part in alphanumeric
+mode and the token in byte mode. 'short' is all alphanumeric and is served
+by the app's /T/<code> route (app/T/[code]/route.ts), which turns the code
+back into the token.
+"""
+
+import re
+from urllib.parse import urlsplit
+
+import qrcode
+
+PAYLOAD_FORMS = ('url', 'segments', 'short')
+SHORT_LINK_PATH = "/T/"
+# Characters QR alphanumeric mode can encode
+ALPHANUMERIC = re.compile(r'^[0-9A-Z $%*+\-./:]*$')
+MODE_NAMES = {
+    qrcode.util.MODE_NUMBER: 'numeric',
+    qrcode.util.MODE_ALPHA_NUM: 'alphanumeric',
+    qrcode.util.MODE_8BIT_BYTE: 'byte',
+}
+
+def token_url(token, base_url):
+    """The classic ?token= link the generators have always encoded"""
+    return f"{base_url}?token={token}"
+
+def uppercase_origin(url):
+    """Upper-case the scheme and host of url, leaving path and query untouched"""
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    return origin.upper() + url[len(origin):]
+
+def short_code(token):
+    """Alphanumeric-mode form of a token: qr_101_t9u2 -> QR-101-T9U2"""
+    code = token.upper().replace('_', '-')
+    if not ALPHANUMERIC.match(code) or code.lower().replace('-', '_') != token:
+        raise ValueError(f"token {token!r} has no alphanumeric short form")
+    return code
+
+def token_from_short_code(code):
+    """Inverse of short_code (what app/T/[code]/route.ts does)"""
+    return code.lower().replace('-', '_')
+
+def short_link(token, base_url):
+    """All-alphanumeric link for a token, resolved by the app's /T/ route"""
+    return uppercase_origin(base_url.rstrip('/')) + SHORT_LINK_PATH + short_code(token)
+
+def location_payload(token, base_url, form='url'):
+    """The text to encode for a location's token in the given payload form"""
+    if form == 'segments':
+        return uppercase_origin(token_url(token, base_url))
+    if form == 'short':
+        return short_link(token, base_url)
+    return token_url(token, base_url)
+
+def accepted_payloads(token, base_url):
+    """Every payload a code for this token may hold, one per form"""
+    payloads = []
+    for form in PAYLOAD_FORMS:
+        try:
+            payload = location_payload(token, base_url, form)
+        except ValueError:
+            continue
+        if payload not in payloads:
+            payloads.append(payload)
+    return payloads
+
+def segment_modes(payload):
+    """[(mode name, length)] of the segments qrcode encodes payload as"""
+    qr = qrcode.QRCode()
+    qr.add_data(payload)
+    return [(MODE_NAMES.get(chunk.mode, str(chunk.mode)), len(chunk.data)) for chunk in qr.data_list]
+
+def add_payload_arg(parser):
+    """Add the shared --payload option to a generator's parser"""
+    parser.add_argument('--payload', choices=PAYLOAD_FORMS, default='url',
+                        help="url: the ?token= link (default); segments: upper-case host so it encodes in "
+                             "alphanumeric mode; short: all-alphanumeric /T/<code> link (smallest codes)")
+
+def print_payload_savings(form, version, baseline_version):
+    """Print what the payload form saved against the plain URL, in the generators' console style"""
+    if form == 'url':
+        return
+    modules = version * 4 + 17
+    baseline = baseline_version * 4 + 17
+    if version < baseline_version:
+        saved = 1 - (modules * modules) / (baseline * baseline)
+        print(f"🗜️  Payload '{form}': version {version} instead of {baseline_version} "
+              f"({modules}x{modules} instead of {baseline}x{baseline} modules, {saved:.0%} fewer per code)")
+    else:
+        print(f"🗜️  Payload '{form}': no smaller than the plain URL at this error correction (version {version})")
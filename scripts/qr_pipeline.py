@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Streaming Pipeline Helpers for the La Strada Hotel QR generators
+Reads the token registry one entry at a time and sorts locations within a
+memory budget (spilling sorted runs to temporary files), so even a huge
+registry can be rendered on a small machine.
+"""
+
+import heapq
+import json
+import sys
+import tempfile
+from itertools import islice
+
+READ_CHUNK = 1 << 16
+# Rough in-memory size of one location record (dict plus its strings)
+LOCATION_RECORD_BYTES = 1024
+# Interpreter, Pillow, qrcode and the render caches before any locations
+BASELINE_MEMORY_MB = 48
+MIN_RUN_SIZE = 1000
+NUMBER_CHARS = frozenset('0123456789+-.eE')
+
+class _JSONStream:
+    """Incremental reader for a top-level JSON object of small values"""
+
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.position = 0
+        self.eof = False
+
+    def fill(self):
+        """Append the next chunk to the unread part of the buffer"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character ('' at end of file)"""
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in ' \t\r\n':
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                return ''
+
+    def expect(self, allowed):
+        char = self.peek()
+        if not char or char not in allowed:
+            raise ValueError(f"invalid registry JSON: expected one of {allowed!r}, found {char or 'end of file'!r}")
+        self.position += 1
+        return char
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                result, end = self.decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                # Most likely the value continues in the next chunk
+                if not self.fill():
+                    raise
+                continue
+            if (isinstance(result, (int, float)) and not isinstance(result, bool)
+                    and all(char in NUMBER_CHARS for char in self.buffer[end:]) and self.fill()):
+                # Nothing but number characters up to the end of the chunk, so
+                # '-1.' or '2e' may be the start of a longer number; decode again
+                continue
+            self.position = end
+            return result
+
+def iter_registry(path, chunk_size=READ_CHUNK):
+    """Yield (key, entry) pairs from a tokens.json-style file without loading it whole"""
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _JSONStream(f, chunk_size)
+        stream.expect('{')
+        if stream.peek() == '}':
+            return
+        while True:
+            key = stream.value()
+            stream.expect(':')
+            yield key, stream.value()
+            if stream.expect(',}') == '}':
+                return
+
+def run_size_for_budget(max_memory_mb, reserved_mb=0):
+    """Return how many location records to sort in memory, or None for no limit
+
+    reserved_mb is memory other parts of the run (e.g. the matrix store)
+    need out of the same budget.
+    """
+    if not max_memory_mb:
+        return None
+    usable = int(max(max_memory_mb - BASELINE_MEMORY_MB - reserved_mb, 1) * 1024 * 1024)
+    return max(usable // LOCATION_RECORD_BYTES, MIN_RUN_SIZE)
+
+def chunked(items, size):
+    """Yield lists of up to size items"""
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+def external_sort(records, key, run_size=None, stats=None):
+    """Lazily yield JSON-serialisable records sorted by key
+
+    At most run_size records are held at once: each sorted run is written to
+    a temporary file and the runs are merged back as they are consumed. If
+    stats (a dict) is given, 'spilled_runs' is set to the number of runs.
+    """
+    if stats is not None:
+        stats['spilled_runs'] = 0
+    if run_size is None:
+        yield from sorted(records, key=key)
+        return
+
+    runs = []
+    try:
+        for chunk in chunked(records, run_size):
+            chunk.sort(key=key)
+            if not runs and len(chunk) < run_size:
+                # Everything fitted into the first run
+                yield from chunk
+                return
+            run = tempfile.TemporaryFile(mode='w+', encoding='utf-8')
+            run.writelines(json.dumps(record, separators=(',', ':')) + '\n' for record in chunk)
+            run.seek(0)
+            runs.append(run)
+            del chunk
+        if stats is not None:
+            stats['spilled_runs'] = len(runs)
+        yield from heapq.merge(*(map(json.loads, run) for run in runs), key=key)
+    finally:
+        for run in runs:
+            run.close()
+
+def peak_rss_mb():
+    """Return this process's peak resident memory in MB (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
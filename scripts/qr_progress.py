@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Progress Reporting for the La Strada Hotel QR generators
+Prints the usual per-location lines, or only periodic totals in quiet mode,
+and can also write a JSON-lines event stream (stage, counts, rate, ETA,
+errors) for a job runner to follow.
+"""
+
+import json
+import sys
+import time
+
+# Quiet mode prints one aggregate line at most this often
+QUIET_INTERVAL = 5.0
+# Progress events are written at most this often
+EVENT_INTERVAL = 1.0
+
+class Progress:
+    """Tracks one batch run and reports it to the console and/or an event file"""
+
+    def __init__(self, quiet=False, events_path=None):
+        self.quiet = quiet
+        self.events = open(events_path, 'a', encoding='utf-8', buffering=1) if events_path else None
+        self.stage_name = None
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self.stage_started = self.started
+        self.last_event = 0.0
+        self.last_line = 0.0
+
+    def emit(self, event, **fields):
+        """Write one JSON event line (no-op without an event file)"""
+        if self.events is None:
+            return
+        record = {'event': event, 'time': round(time.time(), 3), 'stage': self.stage_name}
+        record.update(fields)
+        self.events.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def say(self, text):
+        """Print a detail line, suppressed in quiet mode"""
+        if not self.quiet:
+            print(text)
+
+    def stage(self, name, total=0, **fields):
+        """Start a new stage (plan, render, gallery, ...) of total items"""
+        self.stage_name = name
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.stage_started = time.monotonic()
+        self.last_event = 0.0
+        self.emit('stage', total=total, **fields)
+
+    def counts(self):
+        """Current counters plus rate (items/s) and ETA (seconds)"""
+        elapsed = time.monotonic() - self.stage_started
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = max(self.total - self.done, 0)
+        eta = remaining / rate if rate > 0 else None
+        return {
+            'done': self.done,
+            'failed': self.failed,
+            'total': self.total,
+            'elapsed': round(elapsed, 3),
+            'rate': round(rate, 1),
+            'eta': round(eta, 1) if eta is not None else None,
+        }
+
+    def advance(self, line=None):
+        """Record one finished item; line is the per-item console text"""
+        self.done += 1
+        if line is not None:
+            self.say(line)
+        self.tick()
+
+    def fail(self, item, error, line=None):
+        """Record one failed item; failures are always shown"""
+        self.done += 1
+        self.failed += 1
+        if line is not None:
+            print(line, file=sys.stderr if self.quiet else sys.stdout)
+        self.emit('error', item=item, error=str(error))
+        self.tick()
+
+    def tick(self):
+        now = time.monotonic()
+        finished = self.done >= self.total
+        if self.events is not None and (finished or now - self.last_event >= EVENT_INTERVAL):
+            self.last_event = now
+            self.emit('progress', **self.counts())
+        if self.quiet and (finished or now - self.last_line >= QUIET_INTERVAL):
+            self.last_line = now
+            counts = self.counts()
+            eta = f", ETA {counts['eta']:.0f}s" if counts['eta'] else ""
+            print(f"  ⏳ {counts['done']}/{counts['total']} ({counts['failed']} failed, "
+                  f"{counts['rate']:.0f}/s{eta})")
+
+    def finish(self, **fields):
+        """Emit the final summary event and close the event file"""
+        self.emit('done', elapsed=round(time.monotonic() - self.started, 3), **fields)
+        if self.events is not None:
+            self.events.close()
+            self.events = None
+
+def add_progress_args(parser):
+    """Add the shared --quiet and --events options to a generator's parser"""
+    parser.add_argument('--quiet', action='store_true',
+                        help="no line per location; only periodic totals and errors")
+    parser.add_argument('--events', metavar='PATH',
+                        help="append JSON-lines progress events (stage, counts, rate, ETA, errors) to PATH")
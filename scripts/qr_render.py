@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+QR Code Rendering Library for La Strada Hotel
+Renders a location or URL straight to PNG/SVG bytes, ESC/POS raster
+commands, or a read-only memoryview over the raw raster, without touching
+the filesystem. Results are kept in an LRU cache keyed by payload and
+render options, and encoded matrices can also be kept between runs in a
+packed-bit MatrixStore (see use_matrix_store).
+
+    from qr_render import render_png
+    png = render_png(tokens['101'])        # a tokens.json entry
+    png = render_png("http://localhost:3000?token=...", box_size=8)
+"""
+
+import struct
+from collections import namedtuple
+from functools import lru_cache
+
+import qrcode
+from PIL import Image
+
+from qr_output import encode_png
+
+# Defaults shared by all the generators
+BASE_URL = "https://menu.theplazahoteledirne.com"
+BOX_SIZE = 10
+BORDER = 4
+ERROR_CORRECTION = 'M'
+CACHE_SIZE = 512
+# Full-size rasters are ~200 KB each, so only a few are kept
+RASTER_CACHE_SIZE = 32
+
+# Receipt printers (POS-80) print 8 dots per mm: 6-dot modules give a ~28 mm code
+ESCPOS_BOX_SIZE = 6
+
+ERROR_CORRECTION_LEVELS = {
+    'L': qrcode.constants.ERROR_CORRECT_L,
+    'M': qrcode.constants.ERROR_CORRECT_M,
+    'Q': qrcode.constants.ERROR_CORRECT_Q,
+    'H': qrcode.constants.ERROR_CORRECT_H,
+}
+
+# 8-bit greyscale pixels: 0 is a dark module, 255 is background
+Raster = namedtuple('Raster', ['width', 'height', 'pixels'])
+
+# Optional qr_store.MatrixStore consulted before encoding
+_matrix_store = None
+
+def use_matrix_store(store):
+    """Read and record module matrices through a MatrixStore (None turns it off)"""
+    global _matrix_store
+    _matrix_store = store
+    module_matrix.cache_clear()
+
+def drain_new_matrices():
+    """New matrices and counts from this process's store, for a worker to send back to its parent"""
+    return _matrix_store.drain() if _matrix_store is not None else ([], [], 0, 0)
+
+def location_url(location, base_url=BASE_URL):
+    """Return the menu URL for a tokens.json entry ({'token': ...})"""
+    return f"{base_url}?token={location['token']}"
+
+def resolve_payload(target, base_url=BASE_URL):
+    """Accept a tokens.json entry or a ready-made URL/text and return the payload"""
+    if isinstance(target, dict):
+        return location_url(target, base_url)
+    return target
+
+@lru_cache(maxsize=CACHE_SIZE)
+def fit_version(payload, error_correction=ERROR_CORRECTION):
+    """Return the smallest QR version that holds payload at this error correction"""
+    qr = qrcode.QRCode(error_correction=ERROR_CORRECTION_LEVELS[error_correction])
+    qr.add_data(payload)
+    return qr.best_fit()
+
+def plan_version(targets, error_correction=ERROR_CORRECTION):
+    """Return the smallest version that every payload in a batch fits into
+
+    Encoding the whole batch at this one version gives every code the same
+    module count, so they all print at the same size.
+    """
+    return max((fit_version(resolve_payload(target), error_correction) for target in targets), default=1)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def module_matrix(payload, error_correction=ERROR_CORRECTION, version=None):
+    """Return the module grid (without quiet zone) as a tuple of bool tuples
+
+    With a planned version the code is encoded at exactly that size (the
+    finder/timing/alignment template for each version is built once by
+    qrcode and reused); without one the smallest fitting version is used.
+    With a matrix store in use, a matrix encoded by an earlier run is read
+    back instead of encoding again.
+    """
+    if _matrix_store is not None:
+        matrix = _matrix_store.get(payload, error_correction, version)
+        if matrix is not None:
+            return matrix
+    qr = qrcode.QRCode(
+        version=version,
+        error_correction=ERROR_CORRECTION_LEVELS[error_correction],
+        border=0,
+    )
+    qr.add_data(payload)
+    qr.make(fit=version is None)
+    matrix = tuple(tuple(row) for row in qr.get_matrix())
+    if _matrix_store is not None:
+        _matrix_store.put(payload, error_correction, version, matrix)
+    return matrix
+
+@lru_cache(maxsize=RASTER_CACHE_SIZE)
+def _raster(payload, box_size, border, error_correction, version):
+    matrix = module_matrix(payload, error_correction, version)
+    width = (len(matrix) + 2 * border) * box_size
+    dark = b'\x00' * box_size
+    light = b'\xff' * box_size
+    quiet = light * border
+
+    blank_rows = (b'\xff' * width) * (border * box_size)
+    rows = [blank_rows]
+    for row in matrix:
+        line = quiet + b''.join(dark if module else light for module in row) + quiet
+        rows.append(line * box_size)
+    rows.append(blank_rows)
+    return width, b''.join(rows)
+
+def render_raster(target, box_size=BOX_SIZE, border=BORDER, error_correction=ERROR_CORRECTION, version=None):
+    """Return a Raster whose pixels are a read-only memoryview of 8-bit greyscale rows"""
+    width, pixels = _raster(resolve_payload(target), box_size, border, error_correction, version)
+    return Raster(width, width, memoryview(pixels))
+
+def render_image(target, box_size=BOX_SIZE, border=BORDER, error_correction=ERROR_CORRECTION, version=None):
+    """Return a new 1-bit PIL image of the code (safe for the caller to draw on)"""
+    raster = render_raster(target, box_size, border, error_correction, version)
+    return Image.frombytes('L', (raster.width, raster.height), raster.pixels.tobytes()).convert('1')
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _png(payload, box_size, border, error_correction, version):
+    return encode_png(render_image(payload, box_size, border, error_correction, version))
+
+def render_png(target, box_size=BOX_SIZE, border=BORDER, error_correction=ERROR_CORRECTION, version=None):
+    """Return the code as PNG bytes"""
+    return _png(resolve_payload(target), box_size, border, error_correction, version)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _svg(payload, box_size, border, error_correction, version, width):
+    matrix = module_matrix(payload, error_correction, version)
+    size = len(matrix) + 2 * border
+
+    # One horizontal stroke per run of dark modules, like the Node generator
+    commands = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < len(row):
+            if not row[x]:
+                x += 1
+                continue
+            start = x
+            while x < len(row) and row[x]:
+                x += 1
+            commands.append(f"M{start + border} {y + border + 0.5}h{x - start}")
+
+    pixels = width or size * box_size
+    svg = (f'<svg xmlns="http://www.w3.org/2000/svg" width="{pixels}" height="{pixels}" '
+           f'viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+           f'<path fill="#FFFFFF" d="M0 0h{size}v{size}H0z"/>'
+           f'<path stroke="#000000" d="{"".join(commands)}"/></svg>\n')
+    return svg.encode('utf-8')
+
+def render_svg(target, box_size=BOX_SIZE, border=BORDER, error_correction=ERROR_CORRECTION, version=None, width=None):
+    """Return the code as SVG bytes (box_size, or width if given, sets the nominal pixel size)"""
+    return _svg(resolve_payload(target), box_size, border, error_correction, version, width)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _escpos(payload, box_size, border, error_correction, version):
+    raster = render_raster(payload, box_size, border, error_correction, version)
+    image = Image.frombytes('L', (raster.width, raster.height), raster.pixels.tobytes())
+    # GS v 0 wants 1 = printed dot, MSB first, each row padded to whole bytes
+    bits = image.point(lambda value: 255 - value, '1').tobytes()
+    width_bytes = (raster.width + 7) // 8
+    return b'\x1dv0\x00' + struct.pack('<HH', width_bytes, raster.height) + bits
+
+def render_escpos(target, box_size=ESCPOS_BOX_SIZE, border=BORDER, error_correction=ERROR_CORRECTION, version=None):
+    """Return a ready-to-send ESC/POS 'GS v 0' raster command printing the code"""
+    return _escpos(resolve_payload(target), box_size, border, error_correction, version)
+
+def cache_info():
+    """Return hit/miss statistics for each cache layer"""
+    return {
+        'fit': fit_version.cache_info(),
+        'matrix': module_matrix.cache_info(),
+        'raster': _raster.cache_info(),
+        'png': _png.cache_info(),
+        'svg': _svg.cache_info(),
+        'escpos': _escpos.cache_info(),
+    }
+
+def clear_cache():
+    """Drop every cached render"""
+    for cached in (fit_version, module_matrix, _raster, _png, _svg, _escpos):
+        cached.cache_clear()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Packed-Bit Matrix Store for the La Strada Hotel QR generators
+Keeps encoded module matrices in one compact file, one bit per module,
+looked up by a hash of payload, error correction and version. Later runs
+that only change size, colour or format read the matrices back instead of
+encoding again.
+
+File layout (little-endian):
+    header  'QRMS', format (u16), entry count (u32)
+    index   one (key: 16 bytes, modules: u16, offset: u32, last used: u32 days
+            since 1970) per entry, sorted by key
+    data    each matrix row-major, MSB first, padded to a whole byte
+
+The file is never read whole: lookups go through a small sample of the
+index, new matrices are spilled to sorted temporary segments in bounded
+batches, and save() streams the file and the segments into a new file.
+
+Every generator shares the file, so a matrix is only dropped once no run
+has used it for max_age_days, not because the current run did not need it.
+"""
+
+import bisect
+import hashlib
+import heapq
+import os
+import shutil
+import struct
+import tempfile
+import time
+
+MATRIX_STORE_FILE = ".qr-matrices.bin"
+MAGIC = b'QRMS'
+FORMAT_VERSION = 2
+HEADER = struct.Struct('<4sHI')
+ENTRY = struct.Struct('<16sHII')
+KEY_SIZE = 16
+# Offset of the last-used day inside an index entry
+DAY_OFFSET = 22
+# Matrices no generator has looked up for this many days are dropped on save
+MAX_AGE_DAYS = 90
+
+# One index key in memory per block; a lookup then reads one block and one matrix
+INDEX_BLOCK = 256
+# New matrices held in memory before they are spilled to a sorted segment
+PENDING_ENTRIES = 16384
+MIN_PENDING_ENTRIES = 256
+# Rough in-memory size of one pending matrix (key, packed bytes, dict slot)
+PENDING_ENTRY_BYTES = 400
+# Share of a --max-memory budget the store may use for pending matrices
+MEMORY_SHARE = 0.1
+# Segments merged into one once there are more than this many
+MAX_SEGMENTS = 8
+
+def matrix_key(payload, error_correction, version=None):
+    """16-byte index key; version None (smallest fit) is stored as 0"""
+    text = f"{error_correction}\0{version or 0}\0{payload}"
+    return hashlib.sha256(text.encode('utf-8')).digest()[:16]
+
+def pack_matrix(matrix):
+    """Module grid -> bytes, one bit per module"""
+    bits = ''.join('1' if module else '0' for row in matrix for module in row)
+    size = (len(bits) + 7) // 8
+    # Pad on the right so the first module is the MSB of the first byte
+    return int(bits.ljust(size * 8, '0'), 2).to_bytes(size, 'big') if bits else b''
+
+def unpack_matrix(data, modules):
+    """Inverse of pack_matrix: a tuple of bool tuples"""
+    count = modules * modules
+    bits = format(int.from_bytes(data, 'big'), f'0{len(data) * 8}b')[:count]
+    return tuple(tuple(bit == '1' for bit in bits[start:start + modules])
+                 for start in range(0, count, modules))
+
+def packed_size(modules):
+    return (modules * modules + 7) // 8
+
+def today():
+    """Days since 1970-01-01 (UTC), the unit of the last-used field"""
+    return int(time.time() // 86400)
+
+def _read_at(f, offset, size):
+    """Read size bytes at offset without moving a shared file position (workers share it)"""
+    if hasattr(os, 'pread'):
+        return os.pread(f.fileno(), size, offset)
+    f.seek(offset)
+    return f.read(size)
+
+def _write_matrix_file(f, records):
+    """Write sorted, unique (key, modules, packed, day) records to f; returns the entry count
+
+    The index has to come before the data, so both are streamed to
+    temporary files first and then copied behind the header.
+    """
+    count = 0
+    offset = 0
+    with tempfile.TemporaryFile() as index, tempfile.TemporaryFile() as data:
+        for key, modules, packed, day in records:
+            index.write(ENTRY.pack(key, modules, offset, day))
+            data.write(packed)
+            offset += len(packed)
+            count += 1
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, count))
+        for part in (index, data):
+            part.seek(0)
+            shutil.copyfileobj(part, f)
+    return count
+
+def _unique(records):
+    """Drop records whose key repeats the one before (the first source wins)"""
+    last = None
+    for record in records:
+        if record[0] != last:
+            last = record[0]
+            yield record
+
+class _MatrixFile:
+    """Read-only view of one store file or segment, holding only every INDEX_BLOCK-th key"""
+
+    def __init__(self, f=None):
+        self.f = f
+        self.count = 0
+        self.fences = []
+        if f is None:
+            return
+        header = _read_at(f, 0, HEADER.size)
+        if len(header) < HEADER.size:
+            return
+        magic, file_format, count = HEADER.unpack(header)
+        self.data_start = HEADER.size + count * ENTRY.size
+        size = os.fstat(f.fileno()).st_size
+        if magic != MAGIC or file_format != FORMAT_VERSION or size < self.data_start:
+            return
+        if count:
+            last = _read_at(f, self.data_start - ENTRY.size, ENTRY.size)
+            _, modules, offset, _ = ENTRY.unpack(last)
+            if self.data_start + offset + packed_size(modules) > size:
+                return
+        self.fences = [_read_at(f, HEADER.size + start * ENTRY.size, KEY_SIZE)
+                       for start in range(0, count, INDEX_BLOCK)]
+        self.count = count
+
+    def _block(self, number):
+        """(first position, [(key, modules, offset, day)]) for one index block"""
+        start = number * INDEX_BLOCK
+        length = min(INDEX_BLOCK, self.count - start)
+        raw = _read_at(self.f, HEADER.size + start * ENTRY.size, length * ENTRY.size)
+        return start, list(ENTRY.iter_unpack(raw))
+
+    def find(self, key):
+        """(position, modules, offset) of key, or None"""
+        number = bisect.bisect_right(self.fences, key) - 1
+        if number < 0:
+            return None
+        start, entries = self._block(number)
+        i = bisect.bisect_left([entry[0] for entry in entries], key)
+        if i < len(entries) and entries[i][0] == key:
+            return start + i, entries[i][1], entries[i][2]
+        return None
+
+    def read(self, modules, offset):
+        return _read_at(self.f, self.data_start + offset, packed_size(modules))
+
+    def blocks(self):
+        """(first position, entries) for every index block, without reading any matrices"""
+        for number in range(len(self.fences)):
+            yield self._block(number)
+
+    def __iter__(self):
+        """(position, key, modules, packed, day) in key order, one block at a time"""
+        for start, entries in self.blocks():
+            first = entries[0][2]
+            end = entries[-1][2] + packed_size(entries[-1][1])
+            data = _read_at(self.f, self.data_start + first, end - first)
+            for i, (key, modules, offset, day) in enumerate(entries):
+                yield start + i, key, modules, data[offset - first:offset - first + packed_size(modules)], day
+
+class MatrixStore:
+    """Read-through store of encoded matrices backed by one file
+
+    New matrices are kept in memory up to pending_limit, then spilled to a
+    sorted temporary segment. save() merges the file, the segments and the
+    pending matrices into a new file, dating the matrices this run looked up
+    or added today and dropping those unused for more than max_age_days, so
+    re-issued tokens and old versions do not pile up. A missing, foreign or
+    truncated file (including one in an older format) is treated as empty
+    and replaced on the next save.
+    """
+
+    def __init__(self, path=MATRIX_STORE_FILE, pending_limit=PENDING_ENTRIES, max_age_days=MAX_AGE_DAYS):
+        self.path = path
+        self.pending_limit = max(pending_limit, MIN_PENDING_ENTRIES)
+        self.max_age_days = max_age_days
+        self.pending = {}
+        self.segments = []
+        self.hits = 0
+        self.misses = 0
+        self.base_file = None
+        self._open_base()
+
+    @property
+    def memory_limit_mb(self):
+        """Most memory the pending matrices take before they are spilled"""
+        return self.pending_limit * PENDING_ENTRY_BYTES / (1024 * 1024)
+
+    def _open_base(self):
+        try:
+            self.base_file = open(self.path, 'rb')
+        except FileNotFoundError:
+            self.base_file = None
+        self.base = _MatrixFile(self.base_file)
+        # One bit per stored matrix, set once this run has used it
+        self.used = bytearray((self.base.count + 7) // 8)
+        # Positions a worker process used since its last drain(), for the parent to mark
+        self.pid = os.getpid()
+        self.touched = []
+
+    def _mark_used(self, position):
+        self.used[position >> 3] |= 0x80 >> (position & 7)
+        if os.getpid() != self.pid:
+            self.touched.append(position)
+
+    def _is_used(self, position):
+        return self.used[position >> 3] & (0x80 >> (position & 7))
+
+    def __len__(self):
+        return self.base.count + sum(segment.count for segment in self.segments) + len(self.pending)
+
+    def _stored(self, key):
+        """True if key is already in the file or a segment"""
+        if self.base.find(key) is not None:
+            return True
+        return any(segment.find(key) is not None for segment in self.segments)
+
+    def get(self, payload, error_correction, version=None):
+        """Return the stored matrix, or None if it has not been encoded yet"""
+        key = matrix_key(payload, error_correction, version)
+        entry = self.base.find(key)
+        if entry is not None:
+            position, modules, offset = entry
+            self._mark_used(position)
+            self.hits += 1
+            return unpack_matrix(self.base.read(modules, offset), modules)
+        for segment in self.segments:
+            entry = segment.find(key)
+            if entry is not None:
+                _, modules, offset = entry
+                self.hits += 1
+                return unpack_matrix(segment.read(modules, offset), modules)
+        if key in self.pending:
+            self.hits += 1
+            modules, packed = self.pending[key]
+            return unpack_matrix(packed, modules)
+        self.misses += 1
+        return None
+
+    def put(self, payload, error_correction, version, matrix):
+        """Remember a freshly encoded matrix until the next save()"""
+        self._add(matrix_key(payload, error_correction, version), len(matrix), pack_matrix(matrix))
+
+    def _add(self, key, modules, packed):
+        if key in self.pending or self._stored(key):
+            return
+        self.pending[key] = (modules, packed)
+        if len(self.pending) >= self.pending_limit:
+            self._spill()
+
+    def _spill(self):
+        """Write the pending matrices to a sorted temporary segment"""
+        f = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(self.path)))
+        now = today()
+        _write_matrix_file(f, ((key, *self.pending[key], now) for key in sorted(self.pending)))
+        f.flush()
+        self.pending.clear()
+        self.segments.append(_MatrixFile(f))
+        if len(self.segments) > MAX_SEGMENTS:
+            merged = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(self.path)))
+            now = today()
+            records = heapq.merge(*(self._records(segment, now) for segment in self.segments))
+            _write_matrix_file(merged, _unique(records))
+            merged.flush()
+            for segment in self.segments:
+                segment.f.close()
+            self.segments = [_MatrixFile(merged)]
+
+    def _expired(self, day, now):
+        return now - day > self.max_age_days
+
+    def _records(self, matrix_file, now, base=False):
+        """(key, modules, packed, day) records to keep; used base entries are dated now"""
+        for position, key, modules, packed, day in matrix_file:
+            if not base or self._is_used(position):
+                yield key, modules, packed, now
+            elif not self._expired(day, now):
+                yield key, modules, packed, day
+
+    def drain(self):
+        """Hand over the unsaved matrices, used positions and hit/miss counts, e.g. from a worker process
+
+        Returns (entries, used, hits, misses) with entries as (key, modules,
+        packed) tuples, and resets them here so nothing is counted twice.
+        """
+        entries = [(key, modules, packed) for key, (modules, packed) in self.pending.items()]
+        drained = (entries, self.touched, self.hits, self.misses)
+        self.pending = {}
+        self.touched = []
+        self.hits = self.misses = 0
+        return drained
+
+    def merge(self, drained):
+        """Take what drain() returned on another store (a worker's copy of this one)"""
+        entries, used, hits, misses = drained
+        for position in used:
+            self._mark_used(position)
+        for key, modules, packed in entries:
+            self._add(key, modules, packed)
+        self.hits += hits
+        self.misses += misses
+
+    def _scan(self, now):
+        """(expired, outdated) counts: unused matrices past max_age_days, used ones not yet dated now"""
+        expired = outdated = 0
+        for start, entries in self.base.blocks():
+            for i, entry in enumerate(entries):
+                if self._is_used(start + i):
+                    outdated += entry[3] != now
+                elif self._expired(entry[3], now):
+                    expired += 1
+        return expired, outdated
+
+    def _refresh_dates(self, now):
+        """Date the used matrices now by patching the index in place"""
+        with open(self.path, 'r+b') as f:
+            for start, entries in self.base.blocks():
+                if not any(self._is_used(start + i) and entry[3] != now for i, entry in enumerate(entries)):
+                    continue
+                block = b''.join(ENTRY.pack(key, modules, offset, now if self._is_used(start + i) else day)
+                                 for i, (key, modules, offset, day) in enumerate(entries))
+                f.seek(HEADER.size + start * ENTRY.size)
+                f.write(block)
+
+    def save(self):
+        """Write the file with the new matrices merged in and expired ones dropped; returns True if it changed
+
+        When nothing was added or expired, only the last-used dates of the
+        matrices this run used are updated, without rewriting the file.
+        """
+        now = today()
+        expired, outdated = self._scan(now)
+        if not self.pending and not self.segments and not expired:
+            if not outdated:
+                return False
+            self._refresh_dates(now)
+        else:
+            pending = ((key, *self.pending[key], now) for key in sorted(self.pending))
+            sources = [self._records(self.base, now, base=True)]
+            sources += [self._records(segment, now) for segment in self.segments]
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                _write_matrix_file(f, _unique(heapq.merge(*sources, pending)))
+            self.close()
+            os.replace(temp_path, self.path)
+
+        # Every matrix this run used is dated now, so start counting afresh
+        self.close()
+        self._open_base()
+        return True
+
+    def close(self):
+        """Close the file and drop unsaved segments"""
+        if self.base_file is not None:
+            self.base_file.close()
+            self.base_file = None
+        for segment in self.segments:
+            segment.f.close()
+        self.segments = []
+        self.pending = {}
+
+def add_matrix_store_args(parser):
+    """Add the shared --matrix-store / --no-matrix-store options to a generator's parser"""
+    parser.add_argument('--matrix-store', metavar='PATH', default=MATRIX_STORE_FILE,
+                        help=f"file that keeps encoded QR matrices between runs, so re-sizing or re-theming "
+                             f"skips encoding (default: {MATRIX_STORE_FILE})")
+    parser.add_argument('--no-matrix-store', action='store_true',
+                        help="encode every code from scratch and leave the matrix store alone")
+    parser.add_argument('--matrix-store-max-age', type=int, default=MAX_AGE_DAYS, metavar='DAYS',
+                        help=f"drop stored matrices no generator has used for this many days "
+                             f"(default: {MAX_AGE_DAYS})")
+
+def open_matrix_store(args):
+    """The MatrixStore chosen on the command line, or None
+
+    With a --max-memory budget the pending matrices are held to
+    MEMORY_SHARE of it; the generator leaves that share out of its sort runs.
+    """
+    if args.no_matrix_store:
+        return None
+    pending_limit = PENDING_ENTRIES
+    max_memory = getattr(args, 'max_memory', None)
+    if max_memory:
+        pending_limit = min(int(max_memory * 1024 * 1024 * MEMORY_SHARE) // PENDING_ENTRY_BYTES, PENDING_ENTRIES)
+    return MatrixStore(args.matrix_store, pending_limit, args.matrix_store_max_age)
+
+def close_matrix_store(store):
+    """Save new matrices and print how many encodes the store saved"""
+    if store is None:
+        return
+    saved = store.save()
+    count = len(store)
+    store.close()
+    size = os.path.getsize(store.path) if os.path.exists(store.path) else 0
+    print(f"🗜️  Matrix store: {store.hits} reused, {store.misses} encoded "
+          f"({store.path}, {count} codes, {size:,} bytes{', updated' if saved else ''})")
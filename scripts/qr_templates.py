@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Shared Page Templates for the La Strada Hotel QR galleries
+Every generated page links one external stylesheet, written next to it
+under a content-hashed name (gallery.<hash>.css) so browsers can cache it
+for good, and builds its HTML from templates parsed once at import.
+
+    from qr_templates import Template, page_head, write_stylesheet
+    CARD = Template('<div class="qr-item">{location_name}</div>')
+    html = page_head("Title", 'complete-gallery', write_stylesheet(output)) + CARD.render_all(locations)
+"""
+
+import hashlib
+import os
+import re
+from string import Formatter
+
+from qr_output import THUMBNAIL_DENSITIES, DirectoryWriter, thumbnail_file, write_text
+
+# Base look first, then one block per page (selected by the <body> class).
+# Pages with the 15px rounded cards also carry the 'rounded' class.
+STYLESHEET = """body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
+.header { text-align: center; margin-bottom: 30px; background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
+.stats { display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 20px; margin-bottom: 30px; }
+.stat-card { background: white; padding: 20px; border-radius: 10px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
+.stat-number { font-size: 2em; font-weight: bold; margin-bottom: 10px; }
+.rooms .stat-number { color: #007bff; }
+.restaurant .stat-number { color: #28a745; }
+.garden .stat-number { color: #6f42c1; }
+.total .stat-number { color: #e74c3c; }
+.section { margin-bottom: 40px; }
+.section-title { font-size: 24px; font-weight: bold; margin-bottom: 20px; padding: 15px; background: white; border-radius: 10px; text-align: center; }
+.rooms .section-title { background: #e3f2fd; color: #1976d2; }
+.restaurant .section-title { background: #e8f5e8; color: #388e3c; }
+.garden .section-title { background: #f3e5f5; color: #7b1fa2; }
+.gallery { display: grid; grid-template-columns: repeat(auto-fit, minmax(280px, 1fr)); gap: 20px; }
+.qr-item { background: white; padding: 20px; border-radius: 10px; text-align: center; box-shadow: 0 2px 5px rgba(0,0,0,0.1); }
+.qr-item img { max-width: 200px; height: 200px; border: 1px solid #ddd; }
+.location-title, .room-title { font-size: 18px; font-weight: bold; margin-bottom: 15px; color: #333; }
+.token-info { font-size: 12px; color: #666; margin: 10px 0; font-family: monospace; }
+.url-info { font-size: 11px; color: #888; margin: 10px 0; word-break: break-all; }
+.download-btn { display: inline-block; margin-top: 15px; padding: 10px 20px; background: #007bff; color: white; text-decoration: none; border-radius: 5px; }
+.download-btn:hover { background: #0056b3; }
+.instructions { background: #e7f3ff; padding: 20px; border-radius: 10px; margin-bottom: 30px; }
+.alert { background: #fff3cd; border: 1px solid #ffeaa7; color: #856404; padding: 15px; border-radius: 10px; margin-bottom: 30px; }
+.footer { margin-top: 50px; text-align: center; color: #7f8c8d; background: white; padding: 25px; border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }
+@media print {
+    .qr-item { page-break-inside: avoid; margin-bottom: 20px; }
+    .download-btn { display: none; }
+}
+
+/* Unlabelled and labelled room galleries (qr-codes-images/) */
+.simple-gallery .header, .labelled-gallery .header { box-shadow: none; }
+.simple-gallery .room-title { font-size: 20px; }
+.labelled-gallery .gallery { grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); }
+.labelled-gallery .qr-item { padding: 15px; }
+.labelled-gallery .qr-item img { max-width: 100%; height: auto; border: none; }
+.labelled-gallery .room-title { margin-bottom: 10px; }
+.labelled-gallery .download-btn { margin-top: 10px; padding: 8px 16px; }
+
+/* Rounded cards: master gallery and the local test pages */
+.rounded .header { padding: 30px; border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }
+.rounded .header h1 { color: #2c3e50; margin-bottom: 10px; }
+.rounded .stat-card { border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }
+.rounded .rooms .stat-number { color: #3498db; }
+.rounded .restaurant .stat-number { color: #27ae60; }
+.rounded .garden .stat-number { color: #9b59b6; }
+.rounded .rooms .section-title { background: linear-gradient(135deg, #3498db, #2980b9); color: white; }
+.rounded .restaurant .section-title { background: linear-gradient(135deg, #27ae60, #229954); color: white; }
+.rounded .garden .section-title { background: linear-gradient(135deg, #9b59b6, #8e44ad); color: white; }
+.rounded .qr-item { padding: 25px; border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }
+.rounded .qr-item img { border: 2px solid #ecf0f1; border-radius: 10px; }
+.rounded .location-title { font-size: 20px; color: #2c3e50; }
+.rounded .token-info { color: #7f8c8d; font-family: 'Courier New', monospace; background: #f8f9fa; padding: 5px; border-radius: 5px; }
+.rounded .url-info { color: #95a5a6; }
+.rounded .instructions { background: linear-gradient(135deg, #74b9ff, #0984e3); color: white; padding: 25px; border-radius: 15px; }
+.rounded .instructions h3 { margin-top: 0; }
+
+/* Master gallery (master-qr-gallery/) */
+.master-gallery .header p { color: #7f8c8d; margin: 5px 0; }
+.master-gallery .stats { grid-template-columns: repeat(auto-fit, minmax(250px, 1fr)); gap: 25px; margin-bottom: 40px; }
+.master-gallery .stat-card { padding: 25px; transition: transform 0.3s; }
+.master-gallery .stat-card:hover, .master-gallery .qr-item:hover { transform: translateY(-5px); }
+.master-gallery .stat-number { font-size: 2.5em; }
+.master-gallery .section { margin-bottom: 50px; }
+.master-gallery .section-title { font-size: 28px; margin-bottom: 25px; padding: 20px; border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }
+.master-gallery .gallery { grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 25px; }
+.master-gallery .qr-item { transition: transform 0.3s; }
+.master-gallery .qr-item img { max-width: 220px; height: auto; }
+.master-gallery .url-info { font-size: 10px; }
+.master-gallery .download-btn { padding: 12px 24px; background: #3498db; border-radius: 8px; transition: background 0.3s; }
+.master-gallery .download-btn:hover { background: #2980b9; }
+.master-gallery .instructions { margin-bottom: 40px; }
+@media print {
+    .master-gallery .instructions { display: none; }
+}
+
+/* Local test QR gallery (local-test-qr/) */
+.local-test-gallery .gallery { grid-template-columns: repeat(auto-fit, minmax(350px, 1fr)); gap: 25px; }
+.local-test-gallery .token-info { padding: 8px; }
+.local-test-gallery .url-info { background: #f8f9fa; padding: 8px; border-radius: 5px; }
+.location-type { font-size: 14px; color: #7f8c8d; margin-bottom: 10px; padding: 5px 10px; border-radius: 15px; display: inline-block; }
+.location-type.room { background: #e3f2fd; color: #1976d2; }
+.location-type.restaurant { background: #e8f5e8; color: #388e3c; }
+.location-type.garden { background: #f3e5f5; color: #7b1fa2; }
+.test-btn { display: inline-block; margin: 5px; padding: 10px 20px; background: #28a745; color: white; text-decoration: none; border-radius: 8px; transition: background 0.3s; }
+.test-btn:hover { background: #218838; }
+
+/* Complete local test URLs page */
+.test-urls .alert { background: #d4edda; border-color: #c3e6cb; color: #155724; padding: 20px; }
+.test-sections { display: grid; grid-template-columns: repeat(auto-fit, minmax(400px, 1fr)); gap: 30px; }
+.test-section { background: white; padding: 25px; border-radius: 15px; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }
+.test-links { display: grid; grid-template-columns: repeat(auto-fit, minmax(180px, 1fr)); gap: 10px; }
+.test-link { display: block; padding: 12px 15px; background: #007bff; color: white; text-decoration: none; border-radius: 8px; transition: background 0.3s; text-align: center; font-weight: 500; }
+.test-link:hover { background: #0056b3; transform: translateY(-2px); }
+.token-display { font-size: 10px; color: rgba(255,255,255,0.8); font-family: monospace; margin-top: 5px; }
+.search-box { background: white; padding: 20px; border-radius: 15px; margin-bottom: 30px; box-shadow: 0 4px 10px rgba(0,0,0,0.1); }
+.search-input { width: 100%; padding: 12px; border: 2px solid #ddd; border-radius: 8px; font-size: 16px; }
+.search-input:focus { border-color: #007bff; outline: none; }
+.server-status { display: inline-block; padding: 8px 16px; border-radius: 20px; font-weight: bold; margin-left: 10px; }
+.server-running { background: #d4edda; color: #155724; }
+.server-stopped { background: #f8d7da; color: #721c24; }
+
+/* qr-codes-output/: one page per location */
+.qr-page { padding: 20px; background: white; }
+.qr-page .container { max-width: 600px; margin: 0 auto; text-align: center; }
+.qr-page .title { font-size: 24px; font-weight: bold; margin-bottom: 10px; color: #1f2937; }
+.qr-page .subtitle { font-size: 16px; color: #666; margin-bottom: 30px; }
+.qr-page .qr-preview { margin: 20px 0; border: 2px solid #ddd; border-radius: 8px; padding: 20px; background: white; display: inline-block; }
+.qr-page .qr-preview svg { display: block; width: 400px; height: 400px; max-width: 100%; margin: 0 auto; }
+.qr-page .download-section { margin: 30px 0; padding: 20px; background: #f8f9fa; border-radius: 8px; }
+.qr-page .download-btn { background: #2563eb; padding: 12px 24px; border-radius: 6px; font-weight: bold; margin: 10px; }
+.qr-page .download-btn:hover { background: #1d4ed8; }
+.qr-page .download-btn.primary { background: #059669; }
+.qr-page .download-btn.primary:hover { background: #047857; }
+.qr-page .instructions { margin: 30px 0; padding: 20px; background: #f1f5f9; border-radius: 8px; text-align: left; }
+.qr-page .url { word-break: break-all; font-family: monospace; background: #f1f3f4; padding: 8px; border-radius: 4px; margin: 10px 0; font-size: 12px; }
+.qr-page .recommendation { background: #ecfdf5; border: 1px solid #10b981; padding: 15px; border-radius: 8px; margin: 20px 0; }
+.qr-page .recommendation h4 { color: #047857; margin-top: 0; }
+.qr-page .folder-structure { background: #f8fafc; border: 1px solid #e2e8f0; padding: 15px; border-radius: 8px; margin: 20px 0; text-align: left; }
+.qr-page .folder-structure h4 { color: #1e293b; margin-top: 0; }
+.folder-tree { font-family: monospace; font-size: 14px; line-height: 1.4; white-space: pre; }
+
+/* qr-codes-output/summary.html */
+.qr-summary { background: white; }
+.qr-summary .header { background: none; padding: 0; border-radius: 0; box-shadow: none; }
+.qr-summary .stat-card { background: #f5f5f5; border-radius: 8px; box-shadow: none; }
+.qr-summary .stat-number { color: #2563eb; margin-bottom: 0; }
+.qr-summary .stat-label { font-size: 1.1em; color: #666; }
+.qr-summary .section h2 { color: #1f2937; border-bottom: 2px solid #e5e7eb; padding-bottom: 10px; }
+.qr-summary .grid { display: grid; grid-template-columns: repeat(auto-fill, minmax(150px, 1fr)); gap: 15px; }
+.qr-summary .item { background: white; border: 1px solid #ddd; padding: 10px; border-radius: 6px; text-align: center; }
+.qr-summary .item:hover { background: #f8f9fa; }
+.qr-summary .item a { text-decoration: none; color: inherit; }
+.qr-summary .item-number { font-weight: bold; font-size: 1.2em; color: #1f2937; }
+.qr-summary .item-type { font-size: 0.9em; color: #666; }
+.qr-summary .folder-info { background: #f1f5f9; padding: 20px; border-radius: 8px; margin: 20px 0; }
+.qr-summary .folder-tree { line-height: 1.6; background: white; padding: 15px; border-radius: 6px; margin: 10px 0; }
+
+/* qr-codes-output/view-only-menu-qr.html */
+.view-only { text-align: center; padding: 20px; background: white; }
+.view-only .qr-container { border: 2px solid #333; padding: 20px; margin: 20px auto; max-width: 400px; background: white; }
+.view-only .qr-code { width: 300px; height: 300px; margin: 0 auto 20px; }
+.view-only .qr-code svg { width: 100%; height: 100%; }
+.view-only .title { font-size: 24px; font-weight: bold; margin-bottom: 10px; color: #333; }
+.view-only .subtitle { font-size: 16px; color: #666; margin-bottom: 20px; }
+.view-only .url { font-size: 12px; color: #888; font-family: monospace; word-break: break-all; }
+@media print {
+    .view-only { margin: 0; padding: 20px; }
+    .no-print { display: none; }
+}
+"""
+
+STYLESHEET_NAME = f"gallery.{hashlib.sha256(STYLESHEET.encode('utf-8')).hexdigest()[:10]}.css"
+STALE_STYLESHEET = re.compile(r"^gallery\.[0-9a-f]{10}\.css$")
+
+class Template:
+    """A str.format-style template ({name} fields, {{ }} for braces) parsed once
+
+    Rendering just joins the pre-split literal pieces with the field values,
+    so a template rendered for hundreds of cards is never re-parsed.
+    """
+
+    def __init__(self, source):
+        self.pieces = []
+        for literal, field, spec, conversion in Formatter().parse(source):
+            if spec or conversion:
+                raise ValueError(f"template field {field!r} cannot use a format spec or conversion")
+            self.pieces.append((literal, field))
+        self.fields = {field for _, field in self.pieces if field is not None}
+
+    def render(self, values=None, **fields):
+        """Fill the template from a mapping and/or keywords (keywords win)"""
+        if values is not None:
+            fields = {**values, **fields}
+        parts = []
+        for literal, field in self.pieces:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(fields[field]))
+        return ''.join(parts)
+
+    def render_all(self, items):
+        """Render once per mapping in items and concatenate the results"""
+        return ''.join([self.render(item) for item in items])
+
+PAGE_HEAD = Template("""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <link rel="stylesheet" href="{stylesheet}">
+</head>
+<body class="{page}">
+""")
+
+THUMBNAIL_IMG = Template('<img src="{src}" srcset="{srcset}" sizes="{width}px" width="{width}" height="{height}" '
+                         'alt="{alt}" loading="lazy" decoding="async"{attributes}>')
+
+def thumbnail_img(path, width, height, alt, attributes=""):
+    """<img> for the thumbnails of the full-size file at path, shown width x height CSS pixels"""
+    srcset = ", ".join(f"{thumbnail_file(path, density)} {width * density}w" for density in THUMBNAIL_DENSITIES)
+    return THUMBNAIL_IMG.render(src=thumbnail_file(path, 1), srcset=srcset, width=width, height=height, alt=alt,
+                                attributes=f" {attributes}" if attributes else "")
+
+def page_head(title, page, stylesheet=STYLESHEET_NAME):
+    """Everything up to and including <body>; page is the body class"""
+    return PAGE_HEAD.render(title=title, page=page, stylesheet=stylesheet)
+
+def remove_stale_stylesheets(directory):
+    """Delete stylesheets left by older versions of STYLESHEET"""
+    for name in os.listdir(directory):
+        if STALE_STYLESHEET.match(name) and name != STYLESHEET_NAME:
+            os.remove(os.path.join(directory, name))
+
+def write_stylesheet(output):
+    """Write the shared stylesheet through an output writer; returns its href"""
+    output.write(STYLESHEET_NAME, STYLESHEET)
+    if isinstance(output, DirectoryWriter):
+        remove_stale_stylesheets(output.output_dir)
+    return STYLESHEET_NAME
+
+def save_stylesheet(directory, deterministic=False):
+    """Write the shared stylesheet into a folder; returns its href"""
+    write_text(os.path.join(directory or '.', STYLESHEET_NAME), STYLESHEET, deterministic)
+    remove_stale_stylesheets(directory or '.')
+    return STYLESHEET_NAME
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+QR Code Variants for La Strada Hotel
+A variant spec lists the images wanted per location (pixel size, quiet
+zone, colours per category, with or without the location label). Every
+variant is drawn from the same module matrix, so adding a variant adds
+raster work only, never another encode.
+
+    {"variants": [
+        {"name": "gallery", "size": 200},
+        {"name": "print", "size": 600, "border": 6},
+        {"name": "labelled", "size": 450, "label": true},
+        {"name": "themed", "size": 450, "dark": {"room": "#1976d2", "garden": "#7b1fa2"}}
+    ]}
+"""
+
+import json
+from collections import namedtuple
+from functools import lru_cache
+
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from qr_output import THUMBNAIL_DENSITIES, encode_png
+from qr_render import ERROR_CORRECTION, module_matrix
+
+DEFAULT_BORDER = 4
+DEFAULT_DARK = "#000000"
+DEFAULT_LIGHT = "#FFFFFF"
+
+# Label band under the code, as a fraction of the variant size
+# (80 px and a 24 px font under a 450 px code, like generate-qr-images.py)
+LABEL_BAND = 0.18
+LABEL_FONT = 0.053
+LABEL_FONTS = [
+    "arial.ttf",
+    "/System/Library/Fonts/Arial.ttf",  # macOS
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",  # Linux
+]
+
+# dark and light are a colour, or a {location type: colour} map
+Variant = namedtuple('Variant', ['name', 'size', 'border', 'dark', 'light', 'label'])
+
+DEFAULT_VARIANTS = [
+    Variant('gallery', 200, DEFAULT_BORDER, DEFAULT_DARK, DEFAULT_LIGHT, False),
+    Variant('print', 600, DEFAULT_BORDER, DEFAULT_DARK, DEFAULT_LIGHT, False),
+    Variant('labelled', 450, DEFAULT_BORDER, DEFAULT_DARK, DEFAULT_LIGHT, True),
+    Variant('themed', 450, DEFAULT_BORDER,
+            {'room': "#1976d2", 'restaurant': "#388e3c", 'garden': "#7b1fa2"}, DEFAULT_LIGHT, True),
+]
+
+def _check_colour(value, where):
+    colours = value.values() if isinstance(value, dict) else [value]
+    for colour in colours:
+        try:
+            ImageColor.getrgb(colour)
+        except (ValueError, AttributeError):
+            raise ValueError(f"{where}: not a colour: {colour!r}")
+
+def parse_variants(spec):
+    """Turn a spec dict ({"variants": [...]}) into a list of Variants, or raise ValueError"""
+    entries = spec.get('variants') if isinstance(spec, dict) else None
+    if not entries:
+        raise ValueError("the spec needs a non-empty \"variants\" list")
+    variants = []
+    for i, entry in enumerate(entries, 1):
+        name = entry.get('name')
+        if not name or '/' in name:
+            raise ValueError(f"variant {i}: needs a \"name\" without slashes")
+        size = entry.get('size')
+        border = entry.get('border', DEFAULT_BORDER)
+        if not isinstance(size, int) or size <= 0 or not isinstance(border, int) or border < 0:
+            raise ValueError(f"variant {name}: size must be a positive and border a non-negative whole number")
+        dark = entry.get('dark', DEFAULT_DARK)
+        light = entry.get('light', DEFAULT_LIGHT)
+        _check_colour(dark, f"variant {name}")
+        _check_colour(light, f"variant {name}")
+        variants.append(Variant(name, size, border, dark, light, bool(entry.get('label', False))))
+    if len({variant.name for variant in variants}) != len(variants):
+        raise ValueError("variant names must be unique")
+    return variants
+
+def load_variants(path=None):
+    """Variants from a JSON spec file, or the built-in set when path is None"""
+    if path is None:
+        return list(DEFAULT_VARIANTS)
+    with open(path, 'r', encoding='utf-8') as f:
+        return parse_variants(json.load(f))
+
+def colour_for(colour, location_type, default):
+    """Resolve a colour or a per-type colour map for one location type"""
+    if isinstance(colour, dict):
+        return colour.get(location_type, default)
+    return colour
+
+@lru_cache(maxsize=16)
+def load_label_font(size):
+    """Load the label font once per size; fall back to PIL's default if none is installed"""
+    for font_path in LABEL_FONTS:
+        try:
+            return ImageFont.truetype(font_path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+def matrix_image(matrix):
+    """One pixel per module as a 2-colour palette image: index 0 dark, 1 light"""
+    modules = len(matrix)
+    data = bytes(0 if module else 1 for row in matrix for module in row)
+    return Image.frombytes('P', (modules, modules), data)
+
+def render_variant(code, variant, location_type, label=None):
+    """Draw one variant from matrix_image(matrix) and return it as PNG bytes
+
+    Modules are scaled by a whole number of pixels so edges stay crisp; the
+    leftover pixels widen the quiet zone so the image is exactly size wide.
+    """
+    modules = code.width
+    box = variant.size // (modules + 2 * variant.border)
+    if box < 1:
+        raise ValueError(f"variant {variant.name}: {variant.size}px is too small for "
+                         f"{modules + 2 * variant.border} modules")
+    band = round(variant.size * LABEL_BAND) if variant.label and label else 0
+
+    image = Image.new('P', (variant.size, variant.size + band), 1)
+    dark = ImageColor.getrgb(colour_for(variant.dark, location_type, DEFAULT_DARK))[:3]
+    light = ImageColor.getrgb(colour_for(variant.light, location_type, DEFAULT_LIGHT))[:3]
+    image.putpalette(dark + light)
+    offset = (variant.size - modules * box) // 2
+    image.paste(code.resize((modules * box, modules * box), Image.NEAREST), (offset, offset))
+
+    if band:
+        draw = ImageDraw.Draw(image)
+        draw.fontmode = "1"  # Crisp 2-colour glyphs, no anti-aliasing
+        font = load_label_font(max(8, round(variant.size * LABEL_FONT)))
+        draw.text((variant.size / 2, variant.size + band / 2), label, fill=0, font=font, anchor='mm')
+    return encode_png(image)
+
+def render_variants(matrix, variants, location_type, label=None):
+    """Yield (variant, PNG bytes) for every variant from one module matrix"""
+    code = matrix_image(matrix)
+    for variant in variants:
+        yield variant, render_variant(code, variant, location_type, label)
+
+def thumbnail_variants(size, label=False):
+    """Exact-size gallery thumbnails for a code shown at size CSS pixels, one per pixel density"""
+    return [Variant(f"{density}x", size * density, DEFAULT_BORDER, DEFAULT_DARK, DEFAULT_LIGHT, label)
+            for density in THUMBNAIL_DENSITIES]
+
+def thumbnail_height(size, label=False):
+    """Height in CSS pixels of a thumbnail shown size pixels wide"""
+    return size + (round(size * LABEL_BAND) if label else 0)
+
+def render_thumbnails(payload, size, error_correction=ERROR_CORRECTION, version=None, label=None):
+    """Yield (density, PNG bytes) for every thumbnail of one code, from its one matrix"""
+    matrix = module_matrix(payload, error_correction, version)
+    variants = thumbnail_variants(size, label is not None)
+    for density, (_, png) in zip(THUMBNAIL_DENSITIES, render_variants(matrix, variants, None, label)):
+        yield density, png
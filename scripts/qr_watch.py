@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+File Watching for the La Strada Hotel QR generators
+Waits for a file to change using Linux inotify (through ctypes, no extra
+packages) and falls back to polling its mtime elsewhere. Bursts of writes
+are debounced into a single change.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+DEBOUNCE_SECONDS = 0.3
+POLL_INTERVAL = 0.5
+
+# inotify(7) event masks
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+EVENT_HEADER = struct.Struct('iIII')
+
+def _open_inotify(directory):
+    """Return an inotify fd watching directory, or None if inotify is unavailable"""
+    library = ctypes.util.find_library('c')
+    if not library:
+        return None
+    try:
+        libc = ctypes.CDLL(library, use_errno=True)
+        init = libc.inotify_init1
+        add_watch = libc.inotify_add_watch
+    except (OSError, AttributeError):
+        return None
+    fd = init(os.O_CLOEXEC)
+    if fd < 0:
+        return None
+    mask = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    if add_watch(fd, os.fsencode(directory), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+class FileWatcher:
+    """Iterate to block until the watched file changes (one item per debounced burst)
+
+    The parent directory is watched rather than the file itself, so editors
+    that save by writing a new file and renaming it over the old one are
+    still noticed.
+    """
+
+    def __init__(self, path, debounce=DEBOUNCE_SECONDS, poll_interval=POLL_INTERVAL):
+        self.path = os.path.abspath(path)
+        self.name = os.fsencode(os.path.basename(self.path))
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.fd = _open_inotify(os.path.dirname(self.path))
+        self.backend = 'inotify' if self.fd is not None else 'polling'
+
+    def __iter__(self):
+        if self.fd is not None:
+            return self._inotify_changes()
+        return self._polled_changes()
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+    def _read_matching(self, timeout):
+        """Wait up to timeout for events; True if any touched the watched file"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return False
+        data = os.read(self.fd, 64 * 1024)
+        matched = False
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            matched = matched or name == self.name
+        return matched
+
+    def _inotify_changes(self):
+        while True:
+            if not self._read_matching(None):
+                continue
+            # Swallow the rest of the burst until the file has been quiet
+            while self._read_matching(self.debounce):
+                pass
+            yield self.path
+
+    def _signature(self):
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+    def _polled_changes(self):
+        last = self._signature()
+        while True:
+            time.sleep(self.poll_interval)
+            current = self._signature()
+            if current == last:
+                continue
+            # Wait until the file stops changing
+            while True:
+                time.sleep(self.debounce)
+                settled = self._signature()
+                if settled == current:
+                    break
+                current = settled
+            last = current
+            yield self.path
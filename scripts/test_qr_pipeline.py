@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Tests for the streaming registry reader in qr_pipeline
+Run from the repository root with: python -m pytest scripts
+"""
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from qr_pipeline import iter_registry
+
+REGISTRY = {
+    "room-101": {"token": "a1b2c3", "table": 12, "lat": -41.286, "lng": 174.776, "weight": 1.5e-3},
+    "room-102": {"token": "d4e5f6", "table": -7, "scale": -2.25E+10, "ratio": 6.02e23, "active": True},
+    "bar": {"token": "g7h8i9", "offset": -0.0, "tiny": -1e-300, "tags": ["terrace", 3, -4.5e2], "note": None},
+    "pool": -123456789,
+    "spa": 9.87654321e-12,
+    "garden": {"count": 0, "depth": [1, [2.5, -3e3]], "name": "Bahçe"},
+}
+
+class IterRegistryTest(unittest.TestCase):
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(handle, 'w', encoding='utf-8') as f:
+            json.dump(REGISTRY, f, indent=2, ensure_ascii=False)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_numbers_split_across_chunks(self):
+        # Small chunks cut numbers after the sign, the point and the exponent
+        for chunk_size in range(1, 8):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(list(iter_registry(self.path, chunk_size)), list(REGISTRY.items()))
+
+    def test_compact_registry(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump(REGISTRY, f, separators=(',', ':'))
+        for chunk_size in range(1, 8):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(dict(iter_registry(self.path, chunk_size)), REGISTRY)
+
+    def test_empty_registry(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write("{ }")
+        self.assertEqual(list(iter_registry(self.path, 1)), [])
+
+    def test_truncated_registry(self):
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('{"pool": -12.5e')
+        with self.assertRaises(ValueError):
+            list(iter_registry(self.path, 3))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Translation Source Reader for La Strada Hotel
+Loads the same translations the app uses: Turkish from locales/tr.json and the
+other languages from contexts/language-context.tsx (like lib/translations.js).
+"""
+
+import json
+import re
+
+CONTEXT_FILE = "contexts/language-context.tsx"
+TR_LOCALE_FILE = "locales/tr.json"
+LANGUAGES = ["en", "tr", "el", "bg"]
+
+# Same patterns lib/translations.js uses to pull sections out of the context file
+SECTION_PATTERNS = {
+    'en': re.compile(r"\ben:\s*{([\s\S]*?)},\s*tr:"),
+    'el': re.compile(r"\bel:\s*{([\s\S]*?)},\s*bg:"),
+    'bg': re.compile(r"\bbg:\s*{([\s\S]*?)}\s*}"),
+}
+PAIR_PATTERN = re.compile(r'"([^"]+)":\s*"((?:[^"\\]|\\.)*)"')
+
+def extract_pairs(content):
+    """Extract quoted key/value pairs from a translations object body"""
+    return {key: json.loads(f'"{value}"') for key, value in PAIR_PATTERN.findall(content)}
+
+def load_translations(context_file=CONTEXT_FILE, tr_file=TR_LOCALE_FILE):
+    """Return {language: {key: text}} for every supported language"""
+    with open(tr_file, 'r', encoding='utf-8') as f:
+        translations = {'tr': json.load(f)}
+
+    with open(context_file, 'r', encoding='utf-8') as f:
+        context = f.read()
+
+    start = context.find("const translations")
+    context = context[start:] if start != -1 else context
+    for language, pattern in SECTION_PATTERNS.items():
+        match = pattern.search(context)
+        translations[language] = extract_pairs(match.group(1)) if match else {}
+
+    return {language: translations[language] for language in LANGUAGES}
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+QR Code Verifier for La Strada Hotel
+Decodes every generated QR code image and checks it points at the right
+location token from data/tokens.json (in any of the --payload forms).
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from qr_decode import QRDecodeError, decode_image
+    from qr_payload import accepted_payloads
+except ImportError:
+    print("❌ Required libraries not installed!")
+    print("📦 Please install them with:")
+    print("   pip install qrcode[pil] pillow numpy")
+    sys.exit(1)
+
+# Configuration
+BASE_URL = "https://menu.theplazahoteledirne.com"
+LOCAL_URL = "http://localhost:3000"
+TOKENS_FILE = "data/tokens.json"
+DEFAULT_DIRS = ["all-qr-codes", "qr-codes-images"]
+
+# File name prefix -> base URL the generator used for that file
+FILENAME_PATTERN = re.compile(r"^(local-qr|qr)-(.+)\.png$")
+PREFIX_BASE_URLS = {
+    'qr': BASE_URL,
+    'local-qr': LOCAL_URL,
+}
+
+def load_tokens():
+    """Load tokens from JSON file"""
+    try:
+        with open(TOKENS_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        print(f"❌ Error: {TOKENS_FILE} not found!")
+        sys.exit(1)
+    except json.JSONDecodeError:
+        print(f"❌ Error: Invalid JSON in {TOKENS_FILE}")
+        sys.exit(1)
+
+def find_qr_images(directories):
+    """Yield every QR code PNG under the given directories, in sorted order"""
+    for directory in directories:
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for filename in sorted(files):
+                if FILENAME_PATTERN.match(filename):
+                    yield os.path.join(root, filename)
+
+def expected_urls(path, tokens):
+    """Return the payloads a QR code file may encode, or None if unknown"""
+    match = FILENAME_PATTERN.match(os.path.basename(path))
+    location = tokens.get(match.group(2))
+    if not location:
+        return None
+    return accepted_payloads(location['token'], PREFIX_BASE_URLS[match.group(1)])
+
+def verify_file(task):
+    """Decode one image and compare it to the expected URL (runs in a worker)"""
+    path, expected = task
+    try:
+        actual = decode_image(path)
+    except (QRDecodeError, OSError, ValueError) as e:
+        return path, expected, None, str(e)
+    if expected is None:
+        return path, expected, actual, "file name does not match any location in tokens.json"
+    if actual not in expected:
+        return path, expected, actual, "payload does not match tokens.json"
+    return path, expected, actual, None
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode generated QR codes and check them against tokens.json")
+    parser.add_argument('directories', nargs='*', default=DEFAULT_DIRS,
+                        help=f"directories to scan (default: {' '.join(DEFAULT_DIRS)})")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="number of worker processes (default: CPU count)")
+    args = parser.parse_args()
+
+    print("🔎 La Strada Hotel - QR Code Verifier")
+    print("=" * 50)
+
+    tokens = load_tokens()
+    directories = [d for d in args.directories if os.path.isdir(d)]
+    for missing in sorted(set(args.directories) - set(directories)):
+        print(f"⚠️  Skipping {missing}/ (not found)")
+
+    tasks = [(path, expected_urls(path, tokens)) for path in find_qr_images(directories)]
+    if not tasks:
+        print("❌ No QR code images found. Run the generators first.")
+        sys.exit(1)
+
+    print(f"📖 Checking {len(tasks)} QR code images with {args.jobs} workers...")
+    start = time.perf_counter()
+    chunksize = max(1, len(tasks) // (args.jobs * 4))
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        results = list(pool.map(verify_file, tasks, chunksize=chunksize))
+    elapsed = time.perf_counter() - start
+
+    failures = [result for result in results if result[3]]
+    for path, expected, actual, error in failures:
+        print(f"  ❌ {path}: {error}")
+        print(f"       expected: {' or '.join(expected) if expected else '-'}")
+        print(f"       decoded:  {actual or '-'}")
+
+    print("\n" + "=" * 50)
+    print(f"⏱️  Verified {len(results)} images in {elapsed:.2f}s")
+    if failures:
+        print(f"🚨 {len(failures)} QR code(s) FAILED verification - do not print these!")
+        sys.exit(1)
+    print(f"🎊 All {len(results)} QR codes decode to the correct URL!")
+
+if __name__ == "__main__":
+    main()